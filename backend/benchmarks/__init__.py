@@ -0,0 +1,3 @@
+"""
+Microbenchmarks for the security and schema primitives on the auth hot path.
+"""
@@ -0,0 +1,78 @@
+import argparse
+import sys
+from pathlib import Path
+
+from .cases import all_benchmarks
+from .harness import (
+    find_regressions,
+    format_ns,
+    load_results,
+    run_benchmark,
+    write_results,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Run microbenchmarks and compare them against a baseline.",
+    )
+    parser.add_argument("-k", "--filter", help="only run benchmarks containing this")
+    parser.add_argument("-o", "--output", type=Path, help="write results as JSON")
+    parser.add_argument("-b", "--baseline", type=Path, help="baseline JSON results")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown flagged as a regression (default: 0.10)",
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="minimum seconds per repeat (default: 0.2)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    benchmarks = [
+        benchmark
+        for benchmark in all_benchmarks()
+        if not args.filter or args.filter in benchmark.name
+    ]
+
+    results = []
+    for benchmark in benchmarks:
+        result = run_benchmark(benchmark, repeats=args.repeats, min_time=args.min_time)
+        results.append(result)
+        sys.stdout.write(
+            f"{result.name:<40} {format_ns(result.best_ns):>12} "
+            f"(median {format_ns(result.median_ns)}, {result.loops} loops)\n"
+        )
+
+    if args.output:
+        write_results(args.output, results)
+
+    if not args.baseline:
+        return 0
+
+    regressions = find_regressions(
+        baseline=load_results(args.baseline),
+        current={result.name: result.best_ns for result in results},
+        threshold=args.threshold,
+    )
+    for regression in regressions:
+        sys.stdout.write(
+            f"REGRESSION {regression.name}: {format_ns(regression.baseline_ns)} -> "
+            f"{format_ns(regression.current_ns)} ({regression.ratio:.2f}x)\n"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+from surr.app.api.v1.auth.schema import Token, UserCreate
+from surr.app.core.security import (
+    TokenType,
+    create_token,
+    get_password_hash,
+    verify_password,
+    verify_token,
+)
+
+from .harness import Benchmark
+
+# Extra claims padding the JWT payload to roughly the given size in bytes.
+TOKEN_SIZES = {"small": 0, "medium": 256, "large": 2048}
+
+PASSWORD = "correct-horse-battery-staple"  # noqa: S105
+
+
+def token_claims(size: int) -> dict[str, str]:
+    claims = {"sub": "benchmark_user"}
+    if size:
+        claims["pad"] = "x" * size
+    return claims
+
+
+def security_benchmarks() -> list[Benchmark]:
+    benchmarks = []
+
+    for label, size in TOKEN_SIZES.items():
+        claims = token_claims(size)
+        token = create_token(data=claims, token_type=TokenType.ACCESS)
+        benchmarks.extend(
+            [
+                Benchmark(
+                    f"create_token[{label}]",
+                    lambda claims=claims: create_token(
+                        data=claims, token_type=TokenType.ACCESS
+                    ),
+                ),
+                Benchmark(
+                    f"verify_token[{label}]",
+                    lambda token=token: verify_token(token, TokenType.ACCESS),
+                ),
+            ]
+        )
+
+    hashed = get_password_hash(PASSWORD)
+    benchmarks.extend(
+        [
+            Benchmark("get_password_hash", lambda: get_password_hash(PASSWORD)),
+            Benchmark("verify_password", lambda: verify_password(PASSWORD, hashed)),
+        ]
+    )
+    return benchmarks
+
+
+def schema_benchmarks() -> list[Benchmark]:
+    payload = {"username": "benchmark_user", "password": PASSWORD}
+    token = Token(
+        access_token=create_token(data=token_claims(0), token_type=TokenType.ACCESS),
+        token_type=TokenType.BEARER,
+    )
+    raw = UserCreate.model_validate(payload).model_dump_json()
+
+    return [
+        Benchmark(
+            "UserCreate.model_validate", lambda: UserCreate.model_validate(payload)
+        ),
+        Benchmark(
+            "UserCreate.model_validate_json",
+            lambda: UserCreate.model_validate_json(raw),
+        ),
+        Benchmark("Token.model_dump", token.model_dump),
+        Benchmark("Token.model_dump_json", token.model_dump_json),
+    ]
+
+
+def all_benchmarks() -> list[Benchmark]:
+    return security_benchmarks() + schema_benchmarks()
@@ -0,0 +1,145 @@
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from importlib import metadata
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+
+# Packages whose upgrades most often move the numbers.
+TRACKED_PACKAGES = ("pyjwt", "pwdlib", "argon2-cffi", "pydantic", "pydantic-core")
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    name: str
+    func: Callable[[], object]
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    name: str
+    loops: int
+    repeats: int
+    # Per-call timings in nanoseconds, one entry per repeat.
+    timings_ns: list[float]
+
+    @property
+    def best_ns(self) -> float:
+        return min(self.timings_ns)
+
+    @property
+    def median_ns(self) -> float:
+        return statistics.median(self.timings_ns)
+
+    def to_json(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["best_ns"] = self.best_ns
+        data["median_ns"] = self.median_ns
+        data["stdev_ns"] = (
+            statistics.stdev(self.timings_ns) if len(self.timings_ns) > 1 else 0.0
+        )
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class Regression:
+    name: str
+    baseline_ns: float
+    current_ns: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ns / self.baseline_ns
+
+
+def calibrate(func: Callable[[], object], min_time: float) -> int:
+    # Smallest loop count whose total runtime is at least ``min_time`` seconds.
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - started >= min_time:
+            return loops
+        loops *= 10 if loops < 1000 else 2  # noqa: PLR2004
+
+
+def run_benchmark(
+    benchmark: Benchmark, repeats: int = 5, min_time: float = 0.2
+) -> BenchmarkResult:
+    func = benchmark.func
+    loops = calibrate(func, min_time)
+
+    timings_ns = []
+    for _ in range(repeats):
+        started = time.perf_counter_ns()
+        for _ in range(loops):
+            func()
+        timings_ns.append((time.perf_counter_ns() - started) / loops)
+
+    return BenchmarkResult(
+        name=benchmark.name, loops=loops, repeats=repeats, timings_ns=timings_ns
+    )
+
+
+def machine_metadata() -> dict[str, Any]:
+    packages = {}
+    for package in TRACKED_PACKAGES:
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
+
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "packages": packages,
+    }
+
+
+def write_results(path: Path, results: Iterable[BenchmarkResult]) -> None:
+    document = {
+        "metadata": machine_metadata(),
+        "benchmarks": {result.name: result.to_json() for result in results},
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def load_results(path: Path) -> dict[str, float]:
+    # Best per-call time in nanoseconds for each benchmark.
+    document = json.loads(path.read_text(encoding="utf-8"))
+    return {
+        name: float(result["best_ns"])
+        for name, result in document["benchmarks"].items()
+    }
+
+
+def find_regressions(
+    baseline: dict[str, float], current: dict[str, float], threshold: float
+) -> list[Regression]:
+    # Benchmarks slower than baseline by more than ``threshold`` (0.1 = 10%).
+    return [
+        Regression(name=name, baseline_ns=baseline[name], current_ns=current_ns)
+        for name, current_ns in current.items()
+        if name in baseline and current_ns > baseline[name] * (1 + threshold)
+    ]
+
+
+def format_ns(value: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if value >= scale:
+            return f"{value / scale:.2f} {unit}"
+    return f"{value:.0f} ns"
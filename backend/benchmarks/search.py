@@ -0,0 +1,255 @@
+"""
+Message search latency on a synthetic corpus in a scratch Postgres database.
+
+Seeds ``--messages`` messages on first run (generated server-side with a
+skewed vocabulary so some terms are common and others rare), then times
+``Message.search`` for first pages and for pages reached through cursors.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from itertools import product
+from pathlib import Path
+
+from sqlalchemy import Integer, bindparam, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, TEXT
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from surr.app.core.permissions import DEFAULT_PERMISSIONS
+from surr.app.models import Base, Channel, Guild, GuildMember, Message, Role, User
+
+from .harness import (
+    BenchmarkResult,
+    find_regressions,
+    format_ns,
+    load_results,
+    write_results,
+)
+
+SYLLABLES = ("ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "qu")
+
+# Words picked as index floor(len * random() ^ SKEW), so low indexes dominate
+# roughly like natural-language word frequencies.
+SKEW = 3
+
+SEED_USERNAME = "search_benchmark"
+
+INSERT_MESSAGES = text(
+    """
+    INSERT INTO messages (channel_id, author_id, content)
+    SELECT
+        channel_ids[1 + g % cardinality(channel_ids)],
+        :author_id,
+        (
+            SELECT string_agg(
+                words[1 + floor(cardinality(words) * random() ^ :skew)::int], ' '
+            )
+            FROM generate_series(1, 6 + g % 12)
+        )
+    FROM generate_series(:start, :stop) AS g,
+        (SELECT CAST(:words AS text[]) AS words) AS vocabulary,
+        (SELECT CAST(:channel_ids AS int[]) AS channel_ids) AS channels
+    """
+).bindparams(
+    bindparam("words", type_=ARRAY(TEXT)),
+    bindparam("channel_ids", type_=ARRAY(Integer)),
+)
+
+
+def vocabulary() -> list[str]:
+    # 10_000 distinct pseudo-words of four syllables, in a fixed order.
+    return ["".join(parts) for parts in product(SYLLABLES, repeat=4)]
+
+
+def search_cases(words: list[str]) -> dict[str, str]:
+    return {
+        "common": words[0],
+        "medium": words[100],
+        "rare": words[5000],
+        "two_terms": f"{words[0]} {words[50]}",
+        "phrase": f'"{words[1]} {words[2]}"',
+        "or": f"{words[3000]} or {words[4000]}",
+    }
+
+
+async def seed(engine: AsyncEngine, messages: int, channels: int, batch: int) -> int:
+    # Creates the corpus unless it exists; returns the benchmark user's id.
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_factory() as db:
+        user = await db.scalar(select(User).where(User.username == SEED_USERNAME))
+        if user is None:
+            user = User(username=SEED_USERNAME, hashed_password="!")  # noqa: S106
+            db.add(user)
+            await db.flush()
+            guild = await Guild.create(db, name=SEED_USERNAME, owner_id=user.id)
+            await Role.create(
+                db,
+                guild_id=guild.id,
+                name="@everyone",
+                permissions=DEFAULT_PERMISSIONS,
+                is_default=True,
+            )
+            await GuildMember.add(db, guild.id, user.id)
+            db.add_all(
+                Channel(guild_id=guild.id, name=f"bench-{index}")
+                for index in range(channels)
+            )
+            await db.commit()
+
+        existing = await db.scalar(select(func.count()).select_from(Message)) or 0
+        channel_ids = list(await db.scalars(select(Channel.id)))
+
+    words = vocabulary()
+    started = time.perf_counter()
+    for start in range(existing, messages, batch):
+        stop = min(start + batch, messages) - 1
+        async with engine.begin() as conn:
+            await conn.execute(
+                INSERT_MESSAGES,
+                {
+                    "author_id": user.id,
+                    "skew": SKEW,
+                    "start": start,
+                    "stop": stop,
+                    "words": words,
+                    "channel_ids": channel_ids,
+                },
+            )
+        sys.stdout.write(f"seeded {stop + 1}/{messages} messages\r")
+        sys.stdout.flush()
+
+    if existing < messages:
+        elapsed = time.perf_counter() - started
+        inserted = messages - existing
+        sys.stdout.write(
+            f"\nseeded {inserted} messages in {elapsed:.1f} s "
+            f"({inserted / elapsed:.0f}/s, index maintained incrementally)\n"
+        )
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM ANALYZE messages"))
+
+    return user.id
+
+
+async def time_search(  # noqa: PLR0913
+    session_factory: async_sessionmaker,
+    user_id: int,
+    query: str,
+    *,
+    page: int,
+    limit: int,
+    repeats: int,
+) -> list[float]:
+    # Per-call nanoseconds for fetching page ``page`` (1-based) of ``query``.
+    async with session_factory() as db:
+        after = None
+        for _ in range(page - 1):
+            rows = await Message.search(
+                db, user_id=user_id, query=query, after=after, limit=limit
+            )
+            if not rows:
+                break
+            message, rank = rows[-1]
+            after = (rank, message.id)
+
+        timings_ns = []
+        for _ in range(repeats):
+            started = time.perf_counter_ns()
+            await Message.search(
+                db, user_id=user_id, query=query, after=after, limit=limit
+            )
+            timings_ns.append(time.perf_counter_ns() - started)
+        return timings_ns
+
+
+async def run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    engine = create_async_engine(args.dsn)
+    try:
+        user_id = await seed(engine, args.messages, args.channels, args.seed_batch)
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+        results = []
+        for label, query in search_cases(vocabulary()).items():
+            for page in (1, args.deep_page):
+                timings_ns = await time_search(
+                    session_factory,
+                    user_id,
+                    query,
+                    page=page,
+                    limit=args.limit,
+                    repeats=args.repeats,
+                )
+                results.append(
+                    BenchmarkResult(
+                        name=f"search[{label}, page {page}]",
+                        loops=1,
+                        repeats=args.repeats,
+                        timings_ns=timings_ns,
+                    )
+                )
+        return results
+    finally:
+        await engine.dispose()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.search",
+        description="Time message search against a synthetic corpus.",
+    )
+    parser.add_argument(
+        "--dsn",
+        required=True,
+        help="scratch database URL (postgresql+asyncpg://...); it is seeded",
+    )
+    parser.add_argument("--messages", type=int, default=2_000_000)
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--seed-batch", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=25)
+    parser.add_argument("--deep-page", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("-o", "--output", type=Path, help="write results as JSON")
+    parser.add_argument("-b", "--baseline", type=Path, help="baseline JSON results")
+    parser.add_argument("-t", "--threshold", type=float, default=0.10)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    results = asyncio.run(run(args))
+
+    for result in results:
+        p95 = statistics.quantiles(result.timings_ns, n=20)[-1]
+        sys.stdout.write(
+            f"{result.name:<32} {format_ns(result.best_ns):>10} "
+            f"(median {format_ns(result.median_ns)}, p95 {format_ns(p95)})\n"
+        )
+
+    if args.output:
+        write_results(args.output, results)
+
+    if not args.baseline:
+        return 0
+
+    regressions = find_regressions(
+        baseline=load_results(args.baseline),
+        current={result.name: result.best_ns for result in results},
+        threshold=args.threshold,
+    )
+    for regression in regressions:
+        sys.stdout.write(
+            f"REGRESSION {regression.name}: {format_ns(regression.baseline_ns)} -> "
+            f"{format_ns(regression.current_ns)} ({regression.ratio:.2f}x)\n"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
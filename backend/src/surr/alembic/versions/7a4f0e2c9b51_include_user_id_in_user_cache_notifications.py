@@ -0,0 +1,49 @@
+"""Include user id in user cache notifications
+
+Revision ID: 7a4f0e2c9b51
+Revises: 2b7e5c9a1d34
+Create Date: 2026-10-19 18:20:13.402715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4f0e2c9b51'
+down_revision: Union[str, Sequence[str], None] = '2b7e5c9a1d34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The id comes last since usernames may contain colons.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_user_cache() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'surr_user_cache', 'user:' || OLD.username || ':' || OLD.id
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_user_cache() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('surr_user_cache', 'user:' || OLD.username);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
@@ -0,0 +1,87 @@
+"""Add message search
+
+Revision ID: c41e7b9d2a05
+Revises: 8d2f4a6c1e90
+Create Date: 2026-10-19 14:02:19.671530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7b9d2a05'
+down_revision: Union[str, Sequence[str], None] = '8d2f4a6c1e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows backfilled per transaction, so no single statement holds row locks
+# on the whole table.
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable columns without defaults are added without rewriting the table.
+    op.add_column('messages', sa.Column('edited_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('messages', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Keep in sync with the DDL attached to the Message model.
+    op.execute(
+        "CREATE OR REPLACE FUNCTION messages_search_vector_update() "
+        "RETURNS trigger AS $$ BEGIN "
+        "NEW.search_vector := to_tsvector('english', NEW.content); "
+        "RETURN NEW; END $$ LANGUAGE plpgsql"
+    )
+    op.execute(
+        "CREATE TRIGGER messages_search_vector_update "
+        "BEFORE INSERT OR UPDATE OF content ON messages "
+        "FOR EACH ROW EXECUTE FUNCTION messages_search_vector_update()"
+    )
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        # Walks the primary key, so each batch starts where the last ended
+        # instead of rescanning rows already filled. Rows written since the
+        # trigger was created are filled by it.
+        last_id = 0
+        while True:
+            last_id = connection.execute(
+                sa.text(
+                    "WITH batch AS (SELECT id FROM messages WHERE id > :last_id "
+                    "ORDER BY id LIMIT :batch_size), "
+                    "filled AS (UPDATE messages "
+                    "SET search_vector = to_tsvector('english', content) "
+                    "WHERE id IN (SELECT id FROM batch) AND search_vector IS NULL) "
+                    "SELECT max(id) FROM batch"
+                ),
+                {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+            ).scalar()
+            if last_id is None:
+                break
+
+        op.create_index(
+            'ix_messages_search_vector',
+            'messages',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_messages_search_vector',
+            table_name='messages',
+            postgresql_concurrently=True,
+        )
+    op.execute("DROP TRIGGER messages_search_vector_update ON messages")
+    op.execute("DROP FUNCTION messages_search_vector_update()")
+    op.drop_column('messages', 'search_vector')
+    op.drop_column('messages', 'edited_at')
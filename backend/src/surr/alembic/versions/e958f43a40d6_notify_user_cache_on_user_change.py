@@ -0,0 +1,45 @@
+"""Notify user cache on user change
+
+Revision ID: e958f43a40d6
+Revises: a621ba756e0f
+Create Date: 2026-10-19 09:12:44.105213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e958f43a40d6'
+down_revision: Union[str, Sequence[str], None] = 'a621ba756e0f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_user_cache() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('surr_user_cache', 'user:' || OLD.username);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_notify_user_cache
+        AFTER UPDATE OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_user_cache()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_notify_user_cache ON users")
+    op.execute("DROP FUNCTION IF EXISTS notify_user_cache()")
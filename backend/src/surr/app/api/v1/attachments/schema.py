@@ -0,0 +1,12 @@
+from datetime import datetime  # noqa: TC003
+
+from pydantic import BaseModel
+
+
+class AttachmentRead(BaseModel):
+    id: int
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+    created_at: datetime
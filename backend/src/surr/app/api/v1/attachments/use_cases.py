@@ -0,0 +1,153 @@
+from pathlib import PurePosixPath, PureWindowsPath
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+
+from surr.app.core.config import settings
+from surr.app.core.storage import blob_storage
+from surr.app.core.tracing import traced
+from surr.app.exceptions.attachment import AttachmentTooLargeError
+from surr.app.models.attachment import Attachment
+from surr.app.schema.user import UserRecord
+from surr.database import SessionFactory
+
+from .schema import AttachmentRead
+
+# Media types browsers may render inline; everything else is a download so
+# user-supplied HTML or SVG can never execute in our origin.
+INLINE_MEDIA_PREFIXES = ("image/", "video/", "audio/")
+INLINE_BLOCKLIST = {"image/svg+xml"}
+
+
+def normalize_content_type(content_type: str) -> str:
+    # Media types are case-insensitive; parameters are dropped so the
+    # inline checks below compare exactly what browsers will act on.
+    return content_type.split(";", maxsplit=1)[0].strip().lower()[:255]
+
+
+def clean_filename(filename: str) -> str:
+    name = PureWindowsPath(PurePosixPath(filename).name).name.strip()
+    return name[:255] or "file"
+
+
+class UploadAttachment:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self, request: Request, filename: str, uploader: UserRecord
+    ) -> AttachmentRead:
+        try:
+            content_length = int(request.headers.get("content-length") or 0)
+        except ValueError as err:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Content-Length",
+            ) from err
+        if content_length > settings.ATTACHMENT_MAX_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                detail="Attachment too large",
+            )
+
+        try:
+            blob = await blob_storage.store(
+                request.stream(), max_size=settings.ATTACHMENT_MAX_SIZE
+            )
+        except AttachmentTooLargeError as err:
+            raise HTTPException(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                detail="Attachment too large",
+            ) from err
+
+        content_type = request.headers.get("content-type", "application/octet-stream")
+
+        try:
+            async with self.session() as db:
+                await Attachment.lock_blob(db, blob.sha256)
+                await self._ensure_stored(blob.sha256)
+                attachment = await Attachment.create(
+                    session=db,
+                    uploader_id=uploader.id,
+                    sha256=blob.sha256,
+                    size=blob.size,
+                    filename=clean_filename(filename),
+                    content_type=normalize_content_type(content_type),
+                )
+                await db.commit()
+
+                return AttachmentRead.model_validate(attachment, from_attributes=True)
+        except Exception:
+            if blob.created:
+                await self._discard(blob.sha256)
+            raise
+
+    @staticmethod
+    async def _ensure_stored(sha256: str) -> None:
+        # A failed identical upload may have removed the blob before this
+        # one took the lock on it.
+        if not await blob_storage.exists(sha256):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Upload interrupted, please retry",
+            )
+
+    async def _discard(self, sha256: str) -> None:
+        # Removes a blob this upload created, unless an identical upload
+        # has committed a row for it in the meantime.
+        async with self.session() as db:
+            await Attachment.lock_blob(db, sha256, exclusive=True)
+            if not await Attachment.blob_in_use(db, sha256):
+                await blob_storage.remove(sha256)
+            await db.commit()
+
+
+class DownloadAttachment:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self, attachment_id: int, request: Request, user: UserRecord
+    ) -> Response:
+        async with self.session() as db:
+            attachment = await Attachment.read_by_id(db, attachment_id)
+
+        # Attachments are not linked to channels, so only their uploader may
+        # fetch them; other users' ids look missing rather than forbidden.
+        if not attachment or attachment.uploader_id != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Attachment not found"
+            )
+
+        # Blobs are content-addressed and therefore immutable, so the hash is
+        # a strong validator and clients may cache forever.
+        headers = {
+            "etag": f'"{attachment.sha256}"',
+            "cache-control": "private, max-age=31536000, immutable",
+            "x-content-type-options": "nosniff",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or headers["etag"] in (tag.strip() for tag in if_none_match.split(","))
+        ):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        content_type = normalize_content_type(attachment.content_type)
+        inline = (
+            content_type.startswith(INLINE_MEDIA_PREFIXES)
+            and content_type not in INLINE_BLOCKLIST
+        )
+
+        # FileResponse answers Range/If-Range itself and hands whole-file
+        # responses to the server's pathsend extension (sendfile) if offered.
+        return FileResponse(
+            blob_storage.path_for(attachment.sha256),
+            media_type=content_type,
+            filename=attachment.filename,
+            headers=headers,
+            content_disposition_type="inline" if inline else "attachment",
+        )
@@ -0,0 +1,33 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+
+from surr.app.api.v1.auth.dependencies import CurrentUser
+
+from .schema import AttachmentRead
+from .use_cases import DownloadAttachment, UploadAttachment
+
+router = APIRouter(prefix="/attachments")
+
+
+@router.post("", response_model=AttachmentRead, status_code=status.HTTP_201_CREATED)
+async def upload_attachment(
+    request: Request,
+    current_user: CurrentUser,
+    filename: Annotated[str, Query(min_length=1, max_length=1024)],
+    use_case: Annotated[UploadAttachment, Depends(UploadAttachment)],
+) -> AttachmentRead:
+    # Uploads the raw request body as a file. It is streamed to disk as it
+    # arrives rather than parsed as multipart, so memory use stays constant
+    # regardless of file size.
+    return await use_case.execute(request, filename, current_user)
+
+
+@router.get("/{attachment_id}")
+async def download_attachment(
+    attachment_id: int,
+    request: Request,
+    current_user: CurrentUser,
+    use_case: Annotated[DownloadAttachment, Depends(DownloadAttachment)],
+) -> Response:
+    return await use_case.execute(attachment_id, request, current_user)
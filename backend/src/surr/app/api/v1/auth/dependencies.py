@@ -0,0 +1,18 @@
+from typing import Annotated
+
+from fastapi import Depends
+
+from surr.app.core.security import oauth2_scheme
+from surr.app.schema.user import UserRecord
+
+from .use_cases import GetCurrentUser
+
+
+async def get_current_user(
+    access_token: Annotated[str, Depends(oauth2_scheme)],
+    use_case: Annotated[GetCurrentUser, Depends(GetCurrentUser)],
+) -> UserRecord:
+    return await use_case.execute(access_token)
+
+
+CurrentUser = Annotated[UserRecord, Depends(get_current_user)]
@@ -14,3 +14,7 @@ class UserCreate(UserBase):
 class Token(BaseModel):
     access_token: str
     token_type: str
+
+
+class UsernameAvailability(UserBase):
+    available: bool
@@ -12,21 +12,32 @@ from surr.app.core.security import (
     verify_password,
     verify_token,
 )
+from surr.app.core.tracing import traced
+from surr.app.core.user_cache import user_cache
+from surr.app.core.usernames import username_filter
 from surr.app.models import TokenBlacklist
 from surr.app.models.user import User
+from surr.app.schema.user import UserRecord
 from surr.database import SessionFactory
 
-from .schema import Token, UserCreate, UserRead
+from .schema import Token, UserCreate, UsernameAvailability, UserRead
 
 # We verify against this when the user is not found to simulate the
 # computational time of a real password check, mitigating timing attacks.
 DUMMY_HASH = get_password_hash("dummy_password_for_timing_protection")
 
 
+def username_taken() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT, detail="Username already taken"
+    )
+
+
 class LoginUser:
     def __init__(self, session: SessionFactory):
         self.session = session
 
+    @traced()
     async def execute(self, username: str, password: str, response: Response) -> Token:
         stmt = select(User).where(User.username == username)
 
@@ -64,6 +75,7 @@ class LogoutUser:
     def __init__(self, session: SessionFactory):
         self.session = session
 
+    @traced()
     async def execute(
         self, access_token: str, refresh_token: str | None, response: Response
     ) -> dict[str, str]:
@@ -78,6 +90,7 @@ class RefreshAccessToken:
     def __init__(self, session: SessionFactory):
         self.session = session
 
+    @traced()
     async def execute(self, request: Request, response: Response) -> Token:
         refresh_token = request.cookies.get("refresh_token")
         if not refresh_token:
@@ -133,7 +146,13 @@ class RegisterUser:
     def __init__(self, session: SessionFactory):
         self.session = session
 
+    @traced()
     async def execute(self, user_in: UserCreate) -> UserRead:
+        # Taken names are rejected before paying for a hash. The unique
+        # constraint still settles races between concurrent signups.
+        if await username_filter.is_taken(self.session, user_in.username):
+            raise username_taken()
+
         hashed_password = get_password_hash(user_in.password)
 
         async with self.session() as db:
@@ -143,13 +162,61 @@ class RegisterUser:
                     username=user_in.username,
                     hashed_password=hashed_password,
                 )
+                await username_filter.register(db, user.username)
                 await db.commit()
 
                 return UserRead(id=user.id, username=user.username)
 
             except IntegrityError as err:
                 await db.rollback()
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="Username already taken",
-                ) from err
+                raise username_taken() from err
+
+
+class CheckUsernameAvailability:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(self, username: str) -> UsernameAvailability:
+        taken = await username_filter.is_taken(self.session, username)
+        return UsernameAvailability(username=username, available=not taken)
+
+
+class GetCurrentUser:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(self, access_token: str) -> UserRecord:
+        credentials_error = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+        # Signature and expiry are always checked; only the blacklist lookup
+        # and the user row are served from the cache.
+        token_data = verify_token(access_token, TokenType.ACCESS)
+        if not token_data:
+            raise credentials_error
+
+        cached = user_cache.get(access_token)
+        if cached and cached.username == token_data.username:
+            return cached
+
+        generation = user_cache.generation
+        stmt = select(User).where(User.username == token_data.username)
+
+        async with self.session() as db:
+            if await TokenBlacklist.exists(db, access_token):
+                raise credentials_error
+
+            result = await db.execute(stmt)
+            user = result.scalar_one_or_none()
+
+        if not user:
+            raise credentials_error
+
+        record = UserRecord(id=user.id, username=user.username)
+        user_cache.store(access_token, record, generation)
+        return record
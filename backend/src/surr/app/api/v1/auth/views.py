@@ -1,14 +1,20 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Cookie, Depends, Request, Response, status
+from fastapi import APIRouter, Cookie, Depends, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from surr.app.api.v1.auth.use_cases import RefreshAccessToken
 from surr.app.core.rate_limiter import DatabaseRateLimiter
 from surr.app.core.security import oauth2_scheme
 
-from .schema import Token, UserCreate, UserRead
-from .use_cases import LoginUser, LogoutUser, RegisterUser
+from .dependencies import CurrentUser
+from .schema import Token, UserCreate, UsernameAvailability, UserRead
+from .use_cases import (
+    CheckUsernameAvailability,
+    LoginUser,
+    LogoutUser,
+    RegisterUser,
+)
 
 router = APIRouter(prefix="/auth")
 
@@ -48,3 +54,19 @@ async def register(
     _: Annotated[None, Depends(DatabaseRateLimiter(requests=5, window=60))],
 ) -> UserRead:
     return await use_case.execute(user_in)
+
+
+@router.get("/username-available", response_model=UsernameAvailability)
+async def username_available(
+    username: Annotated[str, Query(min_length=3, max_length=64, pattern=r"^\S+$")],
+    use_case: Annotated[CheckUsernameAvailability, Depends(CheckUsernameAvailability)],
+    _: Annotated[None, Depends(DatabaseRateLimiter(requests=30, window=60))],
+) -> UsernameAvailability:
+    # Usually answered from memory, so clients may check as the user types;
+    # limited per address so it cannot be used to enumerate usernames.
+    return await use_case.execute(username)
+
+
+@router.get("/me", response_model=UserRead)
+async def read_current_user(current_user: CurrentUser) -> UserRead:
+    return UserRead(id=current_user.id, username=current_user.username)
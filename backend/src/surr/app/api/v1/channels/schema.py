@@ -0,0 +1,47 @@
+from datetime import datetime  # noqa: TC003
+
+from pydantic import BaseModel, Field
+
+from surr.app.core.permissions import ALL_PERMISSIONS
+
+
+class ChannelCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+
+
+class ChannelRead(BaseModel):
+    id: int
+    guild_id: int
+    name: str
+    created_at: datetime
+
+
+class MessageCreate(BaseModel):
+    content: str = Field(..., min_length=1, max_length=4000)
+
+
+class MessageRead(BaseModel):
+    id: int
+    channel_id: int
+    author_id: int
+    content: str
+    created_at: datetime
+    edited_at: datetime | None = None
+
+
+class ReadMarkerUpdate(BaseModel):
+    # Message ids are bigint.
+    last_read_message_id: int = Field(..., ge=1, le=2**63 - 1)
+
+
+class UnreadRead(BaseModel):
+    channel_id: int
+    last_read_message_id: int
+    unread: int
+    # Set when the channel has more unread messages than are counted.
+    truncated: bool
+
+
+class OverwriteUpdate(BaseModel):
+    allow: int = Field(0, ge=0, le=ALL_PERMISSIONS)
+    deny: int = Field(0, ge=0, le=ALL_PERMISSIONS)
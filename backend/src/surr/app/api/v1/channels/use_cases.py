@@ -0,0 +1,217 @@
+from fastapi import HTTPException, Response, status
+
+from surr.app.core.http_cache import Conditional
+from surr.app.core.permission_cache import notify_channel_changed, permission_cache
+from surr.app.core.permissions import Permission
+from surr.app.core.read_state import notify_message_created, read_state_store
+from surr.app.core.tracing import traced
+from surr.app.models.channel import Channel
+from surr.app.models.guild import Guild
+from surr.app.models.message import Message
+from surr.app.models.permission_overwrite import OverwriteTarget, PermissionOverwrite
+from surr.app.schema.user import UserRecord
+from surr.database import SessionFactory
+
+from .schema import (
+    MessageCreate,
+    MessageRead,
+    OverwriteUpdate,
+    UnreadRead,
+)
+
+
+class CreateMessage:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self, channel_id: int, data: MessageCreate, author: UserRecord
+    ) -> MessageRead:
+        await permission_cache.require_channel(
+            self.session,
+            author.id,
+            channel_id,
+            Permission.VIEW_CHANNEL | Permission.SEND_MESSAGES,
+        )
+
+        async with self.session() as db:
+            message = await Message.create(
+                session=db,
+                channel_id=channel_id,
+                author_id=author.id,
+                content=data.content,
+            )
+            await notify_message_created(db, channel_id, message.id)
+            await db.commit()
+
+            read = MessageRead.model_validate(message, from_attributes=True)
+
+        read_state_store.record_message(channel_id, read.id)
+        # Authors have read their own messages.
+        read_state_store.mark_read(author.id, channel_id, read.id)
+        return read
+
+
+class EditMessage:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self, channel_id: int, message_id: int, data: MessageCreate, user: UserRecord
+    ) -> MessageRead:
+        await permission_cache.require_channel(self.session, user.id, channel_id)
+
+        async with self.session() as db:
+            message = await Message.read_by_id(db, message_id)
+            if not message or message.channel_id != channel_id:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Message not found"
+                )
+            if message.author_id != user.id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Only the author can edit a message",
+                )
+
+            edited = await Message.edit(db, message_id, data.content)
+            await Channel.bump_version(db, channel_id)
+            await db.commit()
+
+            return MessageRead.model_validate(edited, from_attributes=True)
+
+
+class ListMessages:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self,
+        channel_id: int,
+        before: int | None,
+        limit: int,
+        user: UserRecord,
+        conditional: Conditional,
+    ) -> list[MessageRead] | Response:
+        await permission_cache.require_channel(
+            self.session,
+            user.id,
+            channel_id,
+            Permission.VIEW_CHANNEL | Permission.READ_MESSAGE_HISTORY,
+        )
+
+        async with self.session() as db:
+            version, newest_id = await Message.page_watermark(db, channel_id)
+            # The latest page changes with every new message; older pages
+            # only when messages are edited.
+            if (
+                not_modified := conditional.check(
+                    channel_id, version, newest_id if before is None else before, limit
+                )
+            ) is not None:
+                return not_modified
+
+            messages = await Message.list_before(db, channel_id, before, limit)
+
+            return [
+                MessageRead.model_validate(message, from_attributes=True)
+                for message in messages
+            ]
+
+
+class MarkChannelRead:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(self, channel_id: int, message_id: int, user: UserRecord) -> None:
+        # All checks are served from caches for recent messages, so a warm
+        # channel is usually acknowledged without touching the database.
+        await permission_cache.require_channel(self.session, user.id, channel_id)
+        heads = await read_state_store.channel_heads(self.session, [channel_id])
+        if channel_id not in heads:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
+            )
+        if message_id not in heads[channel_id].ids:
+            async with self.session() as db:
+                message = await Message.read_by_id(db, message_id)
+            if not message or message.channel_id != channel_id:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Message not found"
+                )
+
+        read_state_store.mark_read(user.id, channel_id, message_id)
+
+
+class GetUnreadCounts:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self, channel_ids: list[int], user: UserRecord
+    ) -> list[UnreadRead]:
+        visible = await permission_cache.visible_channels(
+            self.session, user.id, channel_ids
+        )
+        states = await read_state_store.unread_counts(self.session, user.id, visible)
+
+        return [
+            UnreadRead(
+                channel_id=channel_id,
+                last_read_message_id=state.last_read_message_id,
+                unread=state.unread,
+                truncated=state.truncated,
+            )
+            for channel_id, state in states.items()
+        ]
+
+
+class SetPermissionOverwrite:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self,
+        channel_id: int,
+        target_type: OverwriteTarget,
+        target_id: int,
+        data: OverwriteUpdate | None,
+        user: UserRecord,
+    ) -> None:
+        # ``data`` of ``None`` removes the overwrite.
+        permissions = await permission_cache.require_channel(
+            self.session, user.id, channel_id, Permission.MANAGE_ROLES
+        )
+        if data is not None and (data.allow | data.deny) & ~permissions:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Cannot overwrite permissions you do not have",
+            )
+
+        async with self.session() as db:
+            if data is None:
+                await PermissionOverwrite.remove(
+                    db,
+                    channel_id=channel_id,
+                    target_type=target_type,
+                    target_id=target_id,
+                )
+            else:
+                await PermissionOverwrite.upsert(
+                    db,
+                    channel_id=channel_id,
+                    target_type=target_type,
+                    target_id=target_id,
+                    allow=data.allow,
+                    deny=data.deny,
+                )
+            channel = await Channel.read_by_id(db, channel_id)
+            if channel is not None:
+                await Guild.bump_version(db, channel.guild_id)
+            await notify_channel_changed(db, channel_id)
+            await db.commit()
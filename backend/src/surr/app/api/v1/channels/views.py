@@ -0,0 +1,119 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Response, status
+
+from surr.app.api.v1.auth.dependencies import CurrentUser
+from surr.app.core.http_cache import CachePolicy, Conditional, ConditionalGet
+from surr.app.models.permission_overwrite import OverwriteTarget
+from surr.app.schema.ids import RowId
+
+from .schema import (
+    MessageCreate,
+    MessageRead,
+    OverwriteUpdate,
+    ReadMarkerUpdate,
+    UnreadRead,
+)
+from .use_cases import (
+    CreateMessage,
+    EditMessage,
+    GetUnreadCounts,
+    ListMessages,
+    MarkChannelRead,
+    SetPermissionOverwrite,
+)
+
+router = APIRouter(prefix="/channels")
+
+# Pages are per user (permissions apply) and revalidated on every use.
+message_page_cache = ConditionalGet(
+    "messages", CachePolicy(private=True, no_cache=True)
+)
+
+
+@router.get("/unread", response_model=list[UnreadRead])
+async def get_unread_counts(
+    current_user: CurrentUser,
+    channel_ids: Annotated[list[RowId], Query(min_length=1, max_length=500)],
+    use_case: Annotated[GetUnreadCounts, Depends(GetUnreadCounts)],
+) -> list[UnreadRead]:
+    # Unread badge state for each of ``channel_ids`` the user can view.
+    return await use_case.execute(channel_ids, current_user)
+
+
+@router.post(
+    "/{channel_id}/messages",
+    response_model=MessageRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_message(
+    channel_id: RowId,
+    data: MessageCreate,
+    current_user: CurrentUser,
+    use_case: Annotated[CreateMessage, Depends(CreateMessage)],
+) -> MessageRead:
+    return await use_case.execute(channel_id, data, current_user)
+
+
+@router.get("/{channel_id}/messages", response_model=list[MessageRead])
+async def list_messages(  # noqa: PLR0913, PLR0917
+    channel_id: RowId,
+    current_user: CurrentUser,
+    use_case: Annotated[ListMessages, Depends(ListMessages)],
+    conditional: Annotated[Conditional, Depends(message_page_cache)],
+    before: int | None = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50,
+) -> list[MessageRead] | Response:
+    # Messages older than ``before``, newest first; 304 if unchanged.
+    return await use_case.execute(channel_id, before, limit, current_user, conditional)
+
+
+@router.patch("/{channel_id}/messages/{message_id}", response_model=MessageRead)
+async def edit_message(
+    channel_id: RowId,
+    message_id: int,
+    data: MessageCreate,
+    current_user: CurrentUser,
+    use_case: Annotated[EditMessage, Depends(EditMessage)],
+) -> MessageRead:
+    return await use_case.execute(channel_id, message_id, data, current_user)
+
+
+@router.put("/{channel_id}/read", status_code=status.HTTP_204_NO_CONTENT)
+async def mark_channel_read(
+    channel_id: RowId,
+    data: ReadMarkerUpdate,
+    current_user: CurrentUser,
+    use_case: Annotated[MarkChannelRead, Depends(MarkChannelRead)],
+) -> None:
+    """Move the read marker forward; it is persisted in the background."""
+    await use_case.execute(channel_id, data.last_read_message_id, current_user)
+
+
+@router.put(
+    "/{channel_id}/overwrites/{target_type}/{target_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def set_permission_overwrite(  # noqa: PLR0913, PLR0917
+    channel_id: RowId,
+    target_type: OverwriteTarget,
+    target_id: RowId,
+    data: OverwriteUpdate,
+    current_user: CurrentUser,
+    use_case: Annotated[SetPermissionOverwrite, Depends(SetPermissionOverwrite)],
+) -> None:
+    await use_case.execute(channel_id, target_type, target_id, data, current_user)
+
+
+@router.delete(
+    "/{channel_id}/overwrites/{target_type}/{target_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def remove_permission_overwrite(
+    channel_id: RowId,
+    target_type: OverwriteTarget,
+    target_id: RowId,
+    current_user: CurrentUser,
+    use_case: Annotated[SetPermissionOverwrite, Depends(SetPermissionOverwrite)],
+) -> None:
+    await use_case.execute(channel_id, target_type, target_id, None, current_user)
@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+
+from surr.app.core.permissions import ALL_PERMISSIONS
+from surr.app.schema.ids import INT4_MAX
+
+type PermissionBits = int
+
+
+class GuildCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+
+
+class GuildRead(BaseModel):
+    id: int
+    name: str
+    owner_id: int
+
+
+class RoleCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    permissions: PermissionBits = Field(0, ge=0, le=ALL_PERMISSIONS)
+    position: int = Field(0, ge=0, le=INT4_MAX)
+
+
+class RoleUpdate(BaseModel):
+    name: str | None = Field(None, min_length=1, max_length=100)
+    permissions: PermissionBits | None = Field(None, ge=0, le=ALL_PERMISSIONS)
+    position: int | None = Field(None, ge=0, le=INT4_MAX)
+
+
+class RoleRead(BaseModel):
+    id: int
+    guild_id: int
+    name: str
+    permissions: PermissionBits
+    position: int
+    is_default: bool
@@ -0,0 +1,260 @@
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException, Response, status
+
+from surr.app.api.v1.channels.schema import ChannelCreate, ChannelRead
+from surr.app.core.http_cache import Conditional
+from surr.app.core.permission_cache import (
+    notify_guild_changed,
+    notify_member_changed,
+    permission_cache,
+)
+from surr.app.core.permissions import (
+    ALL_PERMISSIONS,
+    DEFAULT_PERMISSIONS,
+    Permission,
+)
+from surr.app.core.tracing import traced
+from surr.app.models.channel import Channel
+from surr.app.models.guild import Guild
+from surr.app.models.guild_member import GuildMember
+from surr.app.models.member_role import MemberRole
+from surr.app.models.role import Role
+from surr.app.models.user import User
+from surr.app.schema.user import UserRecord
+from surr.database import SessionFactory
+
+from .schema import GuildCreate, GuildRead, RoleCreate, RoleRead, RoleUpdate
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def ensure_grantable(actor_permissions: Permission, permissions: int) -> None:
+    # Nobody can hand out permissions they do not hold themselves.
+    if actor_permissions != ALL_PERMISSIONS and permissions & ~actor_permissions:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot grant permissions you do not have",
+        )
+
+
+async def ensure_below(
+    db: AsyncSession,
+    guild_id: int,
+    actor_id: int,
+    actor_permissions: Permission,
+    position: int,
+) -> None:
+    # Roles at or above the actor's own highest role are out of their reach.
+    if actor_permissions == ALL_PERMISSIONS:
+        return
+    if position >= await Role.top_position(db, guild_id, actor_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot manage roles at or above your highest role",
+        )
+
+
+def role_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
+
+
+class CreateGuild:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(self, data: GuildCreate, owner: UserRecord) -> GuildRead:
+        async with self.session() as db:
+            guild = await Guild.create(session=db, name=data.name, owner_id=owner.id)
+            await Role.create(
+                db,
+                guild_id=guild.id,
+                name="@everyone",
+                permissions=DEFAULT_PERMISSIONS,
+                is_default=True,
+            )
+            await GuildMember.add(db, guild.id, owner.id)
+            await db.commit()
+
+            return GuildRead.model_validate(guild, from_attributes=True)
+
+
+class AddGuildMember:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(self, guild_id: int, user_id: int, actor: UserRecord) -> None:
+        await permission_cache.require_guild(
+            self.session, actor.id, guild_id, Permission.MANAGE_GUILD
+        )
+
+        async with self.session() as db:
+            if not await User.read_by_id(db, user_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+                )
+            await GuildMember.add(db, guild_id, user_id)
+            await Guild.bump_version(db, guild_id)
+            await notify_member_changed(db, guild_id, user_id)
+            await db.commit()
+
+
+class CreateGuildChannel:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self, guild_id: int, data: ChannelCreate, actor: UserRecord
+    ) -> ChannelRead:
+        await permission_cache.require_guild(
+            self.session, actor.id, guild_id, Permission.MANAGE_CHANNELS
+        )
+
+        async with self.session() as db:
+            channel = await Channel.create(
+                session=db, guild_id=guild_id, name=data.name
+            )
+            await Guild.bump_version(db, guild_id)
+            await db.commit()
+
+            return ChannelRead.model_validate(channel, from_attributes=True)
+
+
+class ListGuildChannels:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self, guild_id: int, user: UserRecord, conditional: Conditional
+    ) -> list[ChannelRead] | Response:
+        await permission_cache.require_guild(
+            self.session, user.id, guild_id, Permission(0)
+        )
+
+        async with self.session() as db:
+            # Lists differ per user, but all change with the guild version.
+            version = await Guild.read_version(db, guild_id)
+            if (
+                not_modified := conditional.check(guild_id, user.id, version)
+            ) is not None:
+                return not_modified
+
+            channels = await Channel.list_for_guild(db, guild_id)
+
+        # One bulk resolution for the whole sidebar.
+        visible = set(
+            await permission_cache.visible_channels(
+                self.session, user.id, [channel.id for channel in channels]
+            )
+        )
+        return [
+            ChannelRead.model_validate(channel, from_attributes=True)
+            for channel in channels
+            if channel.id in visible
+        ]
+
+
+class CreateRole:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self, guild_id: int, data: RoleCreate, actor: UserRecord
+    ) -> RoleRead:
+        actor_permissions = await permission_cache.require_guild(
+            self.session, actor.id, guild_id, Permission.MANAGE_ROLES
+        )
+        ensure_grantable(actor_permissions, data.permissions)
+
+        async with self.session() as db:
+            await ensure_below(db, guild_id, actor.id, actor_permissions, data.position)
+            role = await Role.create(
+                db,
+                guild_id=guild_id,
+                name=data.name,
+                permissions=data.permissions,
+                position=data.position,
+            )
+            await Guild.bump_version(db, guild_id)
+            await notify_guild_changed(db, guild_id)
+            await db.commit()
+
+            return RoleRead.model_validate(role, from_attributes=True)
+
+
+class UpdateRole:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self, guild_id: int, role_id: int, data: RoleUpdate, actor: UserRecord
+    ) -> RoleRead:
+        actor_permissions = await permission_cache.require_guild(
+            self.session, actor.id, guild_id, Permission.MANAGE_ROLES
+        )
+        if data.permissions is not None:
+            ensure_grantable(actor_permissions, data.permissions)
+
+        async with self.session() as db:
+            role = await Role.read_by_id(db, role_id)
+            if not role or role.guild_id != guild_id:
+                raise role_not_found()
+            await ensure_below(db, guild_id, actor.id, actor_permissions, role.position)
+            if data.position is not None:
+                await ensure_below(
+                    db, guild_id, actor.id, actor_permissions, data.position
+                )
+
+            # Every column is NOT NULL, so an explicit null leaves it as is.
+            for field, value in data.model_dump(exclude_none=True).items():
+                setattr(role, field, value)
+            await Guild.bump_version(db, guild_id)
+            await notify_guild_changed(db, guild_id)
+            await db.commit()
+
+            return RoleRead.model_validate(role, from_attributes=True)
+
+
+class SetMemberRole:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self,
+        guild_id: int,
+        user_id: int,
+        role_id: int,
+        actor: UserRecord,
+        *,
+        assigned: bool,
+    ) -> None:
+        actor_permissions = await permission_cache.require_guild(
+            self.session, actor.id, guild_id, Permission.MANAGE_ROLES
+        )
+
+        async with self.session() as db:
+            role = await Role.read_by_id(db, role_id)
+            if not role or role.guild_id != guild_id or role.is_default:
+                raise role_not_found()
+            ensure_grantable(actor_permissions, role.permissions)
+            await ensure_below(db, guild_id, actor.id, actor_permissions, role.position)
+            if not await GuildMember.exists(db, guild_id, user_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Member not found"
+                )
+
+            if assigned:
+                await MemberRole.add(db, guild_id, user_id, role_id)
+            else:
+                await MemberRole.remove(db, guild_id, user_id, role_id)
+            await Guild.bump_version(db, guild_id)
+            await notify_member_changed(db, guild_id, user_id)
+            await db.commit()
@@ -0,0 +1,120 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response, status
+
+from surr.app.api.v1.auth.dependencies import CurrentUser
+from surr.app.api.v1.channels.schema import ChannelCreate, ChannelRead
+from surr.app.core.http_cache import CachePolicy, Conditional, ConditionalGet
+from surr.app.schema.ids import RowId
+
+from .schema import GuildCreate, GuildRead, RoleCreate, RoleRead, RoleUpdate
+from .use_cases import (
+    AddGuildMember,
+    CreateGuild,
+    CreateGuildChannel,
+    CreateRole,
+    ListGuildChannels,
+    SetMemberRole,
+    UpdateRole,
+)
+
+router = APIRouter(prefix="/guilds")
+
+channel_list_cache = ConditionalGet(
+    "channels", CachePolicy(private=True, no_cache=True)
+)
+
+
+@router.post("", response_model=GuildRead, status_code=status.HTTP_201_CREATED)
+async def create_guild(
+    data: GuildCreate,
+    current_user: CurrentUser,
+    use_case: Annotated[CreateGuild, Depends(CreateGuild)],
+) -> GuildRead:
+    return await use_case.execute(data, current_user)
+
+
+@router.put("/{guild_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def add_guild_member(
+    guild_id: RowId,
+    user_id: RowId,
+    current_user: CurrentUser,
+    use_case: Annotated[AddGuildMember, Depends(AddGuildMember)],
+) -> None:
+    await use_case.execute(guild_id, user_id, current_user)
+
+
+@router.get("/{guild_id}/channels", response_model=list[ChannelRead])
+async def list_guild_channels(
+    guild_id: RowId,
+    current_user: CurrentUser,
+    use_case: Annotated[ListGuildChannels, Depends(ListGuildChannels)],
+    conditional: Annotated[Conditional, Depends(channel_list_cache)],
+) -> list[ChannelRead] | Response:
+    # Only the channels the current user can view; 304 if unchanged.
+    return await use_case.execute(guild_id, current_user, conditional)
+
+
+@router.post(
+    "/{guild_id}/channels",
+    response_model=ChannelRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_guild_channel(
+    guild_id: RowId,
+    data: ChannelCreate,
+    current_user: CurrentUser,
+    use_case: Annotated[CreateGuildChannel, Depends(CreateGuildChannel)],
+) -> ChannelRead:
+    return await use_case.execute(guild_id, data, current_user)
+
+
+@router.post(
+    "/{guild_id}/roles", response_model=RoleRead, status_code=status.HTTP_201_CREATED
+)
+async def create_role(
+    guild_id: RowId,
+    data: RoleCreate,
+    current_user: CurrentUser,
+    use_case: Annotated[CreateRole, Depends(CreateRole)],
+) -> RoleRead:
+    return await use_case.execute(guild_id, data, current_user)
+
+
+@router.patch("/{guild_id}/roles/{role_id}", response_model=RoleRead)
+async def update_role(
+    guild_id: RowId,
+    role_id: RowId,
+    data: RoleUpdate,
+    current_user: CurrentUser,
+    use_case: Annotated[UpdateRole, Depends(UpdateRole)],
+) -> RoleRead:
+    return await use_case.execute(guild_id, role_id, data, current_user)
+
+
+@router.put(
+    "/{guild_id}/members/{user_id}/roles/{role_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def assign_member_role(
+    guild_id: RowId,
+    user_id: RowId,
+    role_id: RowId,
+    current_user: CurrentUser,
+    use_case: Annotated[SetMemberRole, Depends(SetMemberRole)],
+) -> None:
+    await use_case.execute(guild_id, user_id, role_id, current_user, assigned=True)
+
+
+@router.delete(
+    "/{guild_id}/members/{user_id}/roles/{role_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def remove_member_role(
+    guild_id: RowId,
+    user_id: RowId,
+    role_id: RowId,
+    current_user: CurrentUser,
+    use_case: Annotated[SetMemberRole, Depends(SetMemberRole)],
+) -> None:
+    await use_case.execute(guild_id, user_id, role_id, current_user, assigned=False)
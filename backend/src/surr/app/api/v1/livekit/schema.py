@@ -0,0 +1,31 @@
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+
+# Rooms and participants are stored in ``String(255)`` columns.
+MAX_NAME_LENGTH = 255
+# 9999-12-31T23:59:59Z, the last second ``datetime`` can represent.
+MAX_TIMESTAMP = 253402300799
+
+
+class WebhookRoom(BaseModel):
+    sid: str = Field("", max_length=MAX_NAME_LENGTH)
+    name: str = Field(..., min_length=1, max_length=MAX_NAME_LENGTH)
+
+
+class WebhookParticipant(BaseModel):
+    sid: str = Field(..., max_length=MAX_NAME_LENGTH)
+    identity: str = Field("", max_length=MAX_NAME_LENGTH)
+
+
+class WebhookEvent(BaseModel):
+    """The parts of a LiveKit webhook payload the backend uses."""
+
+    # LiveKit sends protobuf JSON, so field names are camelCase.
+    model_config = ConfigDict(alias_generator=to_camel, validate_by_name=True)
+
+    event: str
+    id: str = ""
+    # Unix seconds; protobuf sends int64 values as strings.
+    created_at: int = Field(0, ge=0, le=MAX_TIMESTAMP)
+    room: WebhookRoom | None = None
+    participant: WebhookParticipant | None = None
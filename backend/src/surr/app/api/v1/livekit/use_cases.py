@@ -0,0 +1,48 @@
+from datetime import UTC, datetime
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+
+from surr.app.core.livekit import LiveKit
+from surr.app.core.voice_analytics import VoiceEvent, VoiceEventKind, voice_analytics
+
+from .schema import WebhookEvent
+
+
+class HandleLiveKitWebhook:
+    def __init__(self, livekit: LiveKit):
+        self.livekit = livekit
+
+    async def execute(self, body: bytes, authorization: str | None) -> None:
+        if not self.livekit.verify_webhook(body, authorization):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid webhook signature",
+            )
+
+        try:
+            event = WebhookEvent.model_validate_json(body)
+        except ValidationError as err:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid webhook event"
+            ) from err
+
+        # Other events are acknowledged and dropped.
+        if event.event not in VoiceEventKind or event.room is None:
+            return
+
+        at = (
+            datetime.fromtimestamp(event.created_at, UTC)
+            if event.created_at
+            else datetime.now(UTC)
+        )
+        voice_analytics.record(
+            VoiceEvent(
+                id=event.id,
+                kind=VoiceEventKind(event.event),
+                room=event.room.name,
+                at=at,
+                participant_sid=event.participant.sid if event.participant else "",
+                identity=event.participant.identity if event.participant else "",
+            )
+        )
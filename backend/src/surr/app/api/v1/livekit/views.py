@@ -0,0 +1,17 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Request, status
+
+from .use_cases import HandleLiveKitWebhook
+
+router = APIRouter(prefix="/livekit")
+
+
+@router.post("/webhook", status_code=status.HTTP_204_NO_CONTENT)
+async def livekit_webhook(
+    request: Request,
+    use_case: Annotated[HandleLiveKitWebhook, Depends(HandleLiveKitWebhook)],
+    authorization: Annotated[str | None, Header()] = None,
+) -> None:
+    """Receive LiveKit server events; the target set in ``livekit.yaml``."""
+    await use_case.execute(await request.body(), authorization)
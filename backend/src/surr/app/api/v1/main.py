@@ -1,6 +1,20 @@
 from fastapi import APIRouter
 
+from .attachments.views import router as attachments_router
 from .auth.views import router as auth_router
+from .channels.views import router as channels_router
+from .guilds.views import router as guilds_router
+from .livekit.views import router as livekit_router
+from .search.views import router as search_router
+from .users.views import router as users_router
+from .voice.views import router as voice_router
 
 router = APIRouter()
 router.include_router(auth_router)
+router.include_router(attachments_router)
+router.include_router(guilds_router)
+router.include_router(channels_router)
+router.include_router(search_router)
+router.include_router(users_router)
+router.include_router(voice_router)
+router.include_router(livekit_router)
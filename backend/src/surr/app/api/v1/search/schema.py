@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+from surr.app.api.v1.channels.schema import MessageRead
+
+
+class MessageSearchHit(MessageRead):
+    rank: float
+
+
+class MessageSearchResults(BaseModel):
+    results: list[MessageSearchHit]
+    # Pass back as ``cursor`` to fetch the next page; null on the last page.
+    next_cursor: str | None
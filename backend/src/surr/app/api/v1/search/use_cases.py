@@ -0,0 +1,78 @@
+import base64
+import binascii
+
+from fastapi import HTTPException, status
+
+from surr.app.api.v1.channels.schema import MessageRead
+from surr.app.core.tracing import traced
+from surr.app.models.message import Message
+from surr.app.schema.ids import INT8_MAX
+from surr.app.schema.user import UserRecord
+from surr.database import SessionFactory
+
+from .schema import MessageSearchHit, MessageSearchResults
+
+
+def encode_cursor(rank: float, message_id: int) -> str:
+    # repr() round-trips the float exactly, which keyset comparison needs.
+    return base64.urlsafe_b64encode(f"{rank!r}:{message_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        rank, _, message_id = base64.urlsafe_b64decode(cursor).decode().partition(":")
+        after = float(rank), int(message_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from err
+    # Message ids are bigint; a larger id would fail the keyset query.
+    if not 1 <= after[1] <= INT8_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return after
+
+
+class SearchMessages:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self,
+        query: str,
+        user: UserRecord,
+        channel_id: int | None,
+        cursor: str | None,
+        limit: int,
+    ) -> MessageSearchResults:
+        after = decode_cursor(cursor) if cursor else None
+
+        async with self.session() as db:
+            # One extra row tells whether another page exists.
+            rows = await Message.search(
+                db,
+                user_id=user.id,
+                query=query,
+                channel_id=channel_id,
+                after=after,
+                limit=limit + 1,
+            )
+
+            results = [
+                MessageSearchHit(
+                    **MessageRead.model_validate(
+                        message, from_attributes=True
+                    ).model_dump(),
+                    rank=rank,
+                )
+                for message, rank in rows[:limit]
+            ]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = results[-1]
+            next_cursor = encode_cursor(last.rank, last.id)
+
+        return MessageSearchResults(results=results, next_cursor=next_cursor)
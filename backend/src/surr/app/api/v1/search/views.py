@@ -0,0 +1,24 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+from surr.app.api.v1.auth.dependencies import CurrentUser
+from surr.app.schema.ids import RowId
+
+from .schema import MessageSearchResults
+from .use_cases import SearchMessages
+
+router = APIRouter(prefix="/search")
+
+
+@router.get("/messages", response_model=MessageSearchResults)
+async def search_messages(  # noqa: PLR0913, PLR0917
+    current_user: CurrentUser,
+    q: Annotated[str, Query(min_length=1, max_length=256)],
+    use_case: Annotated[SearchMessages, Depends(SearchMessages)],
+    channel_id: RowId | None = None,
+    cursor: Annotated[str | None, Query(max_length=128)] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 25,
+) -> MessageSearchResults:
+    # ``q`` uses web search syntax: "quoted phrases", OR and -exclusions.
+    return await use_case.execute(q, current_user, channel_id, cursor, limit)
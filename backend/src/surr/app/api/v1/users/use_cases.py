@@ -0,0 +1,16 @@
+from surr.app.core.tracing import traced
+from surr.app.core.user_loader import user_loader
+from surr.app.schema.user import UserRecord
+from surr.database import SessionFactory
+
+
+class GetUsers:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(self, user_ids: list[int]) -> list[UserRecord]:
+        users = await user_loader.load_many(self.session, user_ids)
+        return [
+            users[user_id] for user_id in dict.fromkeys(user_ids) if user_id in users
+        ]
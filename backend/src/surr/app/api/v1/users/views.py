@@ -0,0 +1,21 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+from surr.app.api.v1.auth.dependencies import CurrentUser
+from surr.app.schema.ids import RowId
+from surr.app.schema.user import UserRecord
+
+from .use_cases import GetUsers
+
+router = APIRouter(prefix="/users")
+
+
+@router.get("/batch", response_model=list[UserRecord])
+async def get_users(
+    _: CurrentUser,
+    ids: Annotated[list[RowId], Query(min_length=1, max_length=500)],
+    use_case: Annotated[GetUsers, Depends(GetUsers)],
+) -> list[UserRecord]:
+    # Users among ``ids`` that exist, in the order asked for.
+    return await use_case.execute(ids)
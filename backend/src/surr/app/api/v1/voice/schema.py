@@ -0,0 +1,48 @@
+from datetime import datetime  # noqa: TC003
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+
+class RoomRead(BaseModel):
+    sid: str = ""
+    name: str
+    num_participants: int = 0
+
+
+class ParticipantRead(BaseModel):
+    sid: str = ""
+    identity: str
+    name: str = ""
+
+
+class IngressRead(BaseModel):
+    ingress_id: str
+    url: str
+    stream_key: str
+
+
+class StatsResolution(StrEnum):
+    MINUTE = "minute"
+    HOUR = "hour"
+
+
+class VoiceStatsRead(BaseModel):
+    bucket: datetime
+    joins: int
+    # Sessions that ended in the bucket.
+    sessions: int
+    average_session_seconds: float | None
+    tracks_published: int
+    peak_participants: int
+    # Head count after the last event; carries over to buckets with no row.
+    closing_participants: int
+
+
+class VoicePeakHourRead(BaseModel):
+    # Hour of day in UTC.
+    hour: int
+    peak_participants: int
+    # Mean of the hourly peaks, over hours anyone was connected.
+    average_participants: float
+    joins: int
@@ -0,0 +1,210 @@
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException, status
+
+from surr.app.core.livekit import LiveKit, channel_room, room_channel_id
+from surr.app.core.permission_cache import permission_cache
+from surr.app.core.permissions import Permission
+from surr.app.core.tracing import traced
+from surr.app.exceptions.livekit import LiveKitError
+from surr.app.models.channel import Channel
+from surr.app.models.voice_stats import VoiceHourStats, VoiceMinuteStats
+from surr.app.schema.user import UserRecord
+from surr.database import SessionFactory
+
+from .schema import (
+    IngressRead,
+    ParticipantRead,
+    RoomRead,
+    StatsResolution,
+    VoicePeakHourRead,
+    VoiceStatsRead,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+ROLLUPS = {
+    StatsResolution.MINUTE: VoiceMinuteStats,
+    StatsResolution.HOUR: VoiceHourStats,
+}
+# Longest range one stats request may span, per resolution.
+MAX_STATS_RANGE = {
+    StatsResolution.MINUTE: timedelta(days=1),
+    StatsResolution.HOUR: timedelta(days=90),
+}
+
+
+def upstream_error(err: LiveKitError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail=f"Voice server error: {err.code}",
+    )
+
+
+async def require_room(
+    session_factory: async_sessionmaker,
+    user: UserRecord,
+    room: str,
+    required: Permission = Permission.VIEW_CHANNEL,
+) -> None:
+    # Rooms are reached through the channel they belong to; rooms that
+    # belong to none, or to a channel the user cannot see, look missing.
+    channel_id = room_channel_id(room)
+    if channel_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
+        )
+    await permission_cache.require_channel(
+        session_factory, user.id, channel_id, required
+    )
+
+
+class ListVoiceRooms:
+    def __init__(self, livekit: LiveKit, session: SessionFactory):
+        self.livekit = livekit
+        self.session = session
+
+    async def execute(self, user: UserRecord) -> list[RoomRead]:
+        try:
+            rooms = await self.livekit.list_rooms()
+        except LiveKitError as err:
+            raise upstream_error(err) from err
+
+        # Only rooms of channels the user can see.
+        channels = {
+            room["name"]: channel_id
+            for room in rooms
+            if (channel_id := room_channel_id(room.get("name", ""))) is not None
+        }
+        visible = set(
+            await permission_cache.visible_channels(
+                self.session, user.id, channels.values()
+            )
+        )
+        return [
+            RoomRead.model_validate(room)
+            for room in rooms
+            if channels.get(room.get("name", "")) in visible
+        ]
+
+
+class ListVoiceParticipants:
+    def __init__(self, livekit: LiveKit, session: SessionFactory):
+        self.livekit = livekit
+        self.session = session
+
+    async def execute(self, room: str, user: UserRecord) -> list[ParticipantRead]:
+        await require_room(self.session, user, room)
+        try:
+            participants = await self.livekit.list_participants(room)
+        except LiveKitError as err:
+            raise upstream_error(err) from err
+
+        return [
+            ParticipantRead.model_validate(participant) for participant in participants
+        ]
+
+
+class CreateStreamIngress:
+    def __init__(self, livekit: LiveKit, session: SessionFactory):
+        self.livekit = livekit
+        self.session = session
+
+    async def execute(self, room: str, user: UserRecord) -> IngressRead:
+        # The ingress publishes with server-signed grants, so the user must
+        # be allowed to stream in the channel the room belongs to.
+        await require_room(
+            self.session,
+            user,
+            room,
+            Permission.VIEW_CHANNEL | Permission.CONNECT | Permission.STREAM,
+        )
+
+        try:
+            ingress = await self.livekit.create_ingress(
+                room=room, identity=user.username, name=f"{user.username}-stream"
+            )
+        except LiveKitError as err:
+            raise upstream_error(err) from err
+
+        return IngressRead.model_validate(ingress)
+
+
+class GetRoomVoiceStats:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self,
+        room: str,
+        user: UserRecord,
+        resolution: StatsResolution,
+        since: datetime,
+        until: datetime | None,
+    ) -> list[VoiceStatsRead]:
+        # Naive times are taken as UTC.
+        since = since if since.tzinfo else since.replace(tzinfo=UTC)
+        until = until or datetime.now(UTC)
+        until = until if until.tzinfo else until.replace(tzinfo=UTC)
+        if until - since > MAX_STATS_RANGE[resolution]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Ranges are limited to {MAX_STATS_RANGE[resolution].days} "
+                f"days at {resolution} resolution",
+            )
+        await require_room(self.session, user, room)
+
+        async with self.session() as db:
+            rows = await ROLLUPS[resolution].read_range(db, room, since, until)
+
+        return [
+            VoiceStatsRead(
+                bucket=row.bucket,
+                joins=row.joins,
+                sessions=row.sessions,
+                average_session_seconds=(
+                    row.session_seconds / row.sessions if row.sessions else None
+                ),
+                tracks_published=row.tracks_published,
+                peak_participants=row.peak_participants,
+                closing_participants=row.closing_participants,
+            )
+            for row in rows
+        ]
+
+
+class GetVoicePeakHours:
+    def __init__(self, session: SessionFactory):
+        self.session = session
+
+    @traced()
+    async def execute(
+        self, days: int, room: str | None, user: UserRecord
+    ) -> list[VoicePeakHourRead]:
+        if room is not None:
+            await require_room(self.session, user, room)
+
+        since = datetime.now(UTC) - timedelta(days=days)
+        async with self.session() as db:
+            if room is None:
+                # Every room of a channel the user can see.
+                rooms = [
+                    channel_room(channel_id)
+                    for channel_id in await db.scalars(Channel.visible_ids(user.id))
+                ]
+            else:
+                rooms = [room]
+            rows = await VoiceHourStats.by_hour_of_day(db, since, rooms)
+
+        return [
+            VoicePeakHourRead(
+                hour=hour,
+                peak_participants=peak,
+                average_participants=average,
+                joins=joins,
+            )
+            for hour, peak, average, joins in rows
+        ]
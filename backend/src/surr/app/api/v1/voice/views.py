@@ -0,0 +1,81 @@
+from datetime import datetime  # noqa: TC003
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Path, Query, status
+
+from surr.app.api.v1.auth.dependencies import CurrentUser
+from surr.app.core.livekit import CHANNEL_ROOM_PATTERN
+
+from .schema import (
+    IngressRead,
+    ParticipantRead,
+    RoomRead,
+    StatsResolution,
+    VoicePeakHourRead,
+    VoiceStatsRead,
+)
+from .use_cases import (
+    CreateStreamIngress,
+    GetRoomVoiceStats,
+    GetVoicePeakHours,
+    ListVoiceParticipants,
+    ListVoiceRooms,
+)
+
+router = APIRouter(prefix="/voice")
+
+
+@router.get("/rooms", response_model=list[RoomRead])
+async def list_rooms(
+    current_user: CurrentUser,
+    use_case: Annotated[ListVoiceRooms, Depends(ListVoiceRooms)],
+) -> list[RoomRead]:
+    return await use_case.execute(current_user)
+
+
+@router.get("/rooms/{room}/participants", response_model=list[ParticipantRead])
+async def list_participants(
+    room: str,
+    current_user: CurrentUser,
+    use_case: Annotated[ListVoiceParticipants, Depends(ListVoiceParticipants)],
+) -> list[ParticipantRead]:
+    return await use_case.execute(room, current_user)
+
+
+@router.post(
+    "/rooms/{room}/ingress",
+    response_model=IngressRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_ingress(
+    room: Annotated[str, Path(pattern=CHANNEL_ROOM_PATTERN)],
+    current_user: CurrentUser,
+    use_case: Annotated[CreateStreamIngress, Depends(CreateStreamIngress)],
+) -> IngressRead:
+    return await use_case.execute(room, current_user)
+
+
+@router.get("/stats/rooms/{room}", response_model=list[VoiceStatsRead])
+async def get_room_stats(  # noqa: PLR0913, PLR0917
+    room: str,
+    current_user: CurrentUser,
+    since: datetime,
+    use_case: Annotated[GetRoomVoiceStats, Depends(GetRoomVoiceStats)],
+    resolution: StatsResolution = StatsResolution.MINUTE,
+    until: datetime | None = None,
+) -> list[VoiceStatsRead]:
+    # Rollup buckets in ``[since, until)``, oldest first; buckets nobody
+    # was connected in are omitted.
+    return await use_case.execute(room, current_user, resolution, since, until)
+
+
+@router.get("/stats/peak-hours", response_model=list[VoicePeakHourRead])
+async def get_peak_hours(
+    current_user: CurrentUser,
+    use_case: Annotated[GetVoicePeakHours, Depends(GetVoicePeakHours)],
+    days: Annotated[int, Query(ge=1, le=90)] = 7,
+    room: str | None = None,
+) -> list[VoicePeakHourRead]:
+    # Voice activity by hour of day over the last ``days``, in ``room`` or
+    # across the rooms of every channel the user can see.
+    return await use_case.execute(days, room, current_user)
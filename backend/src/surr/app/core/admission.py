@@ -0,0 +1,250 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from starlette.responses import JSONResponse
+
+from surr.app.core.config import settings
+from surr.app.core.metrics import registry
+from surr.app.core.tracing import span
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+ADMISSION_IN_FLIGHT = registry.gauge(
+    "surr_admission_in_flight",
+    "Requests currently admitted per route class.",
+    labels=("route_class",),
+)
+ADMISSION_QUEUE_DEPTH = registry.gauge(
+    "surr_admission_queue_depth",
+    "Requests waiting for admission per route class.",
+    labels=("route_class",),
+)
+ADMISSION_LIMIT = registry.gauge(
+    "surr_admission_limit",
+    "Current concurrency limit per route class.",
+    labels=("route_class",),
+)
+ADMISSION_SHED = registry.counter(
+    "surr_admission_shed_total",
+    "Requests rejected with 503 per route class and reason.",
+    labels=("route_class", "reason"),
+)
+
+# Weight of the newest sample in the latency moving average.
+LATENCY_EWMA_ALPHA = 0.2
+
+
+@dataclass(frozen=True, slots=True)
+class AdmissionPolicy:
+    max_concurrency: int
+    max_queue: int
+    queue_timeout: float
+    retry_after: int = 1
+    # Setting a target latency (seconds) enables adaptive limiting: the limit
+    # shrinks while the observed latency is above target and grows back,
+    # up to ``max_concurrency``, once it recovers.
+    target_latency: float | None = None
+    min_concurrency: int = 1
+
+
+class ConcurrencyGate:
+    """Concurrency limit with a bounded FIFO wait queue for one route class."""
+
+    def __init__(self, route_class: str, policy: AdmissionPolicy):
+        self.route_class = route_class
+        self.policy = policy
+        self.limit = policy.max_concurrency
+        self.in_flight = 0
+        self.latency: float | None = None
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._last_decrease = 0.0
+        self._publish()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> str | None:
+        # Returns None once a slot is held, otherwise the reason for shedding.
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self._publish()
+            return None
+
+        if len(self._waiters) >= self.policy.max_queue:
+            return self._shed("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+
+        try:
+            async with asyncio.timeout(self.policy.queue_timeout):
+                await waiter
+        except TimeoutError:
+            # The slot may have been handed over in the same loop iteration
+            # the deadline fired; in that case the request keeps it.
+            if waiter.done() and not waiter.cancelled():
+                return None
+            self._discard(waiter)
+            return self._shed("deadline")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(None)
+            else:
+                self._discard(waiter)
+            raise
+
+        return None
+
+    def release(self, latency: float | None) -> None:
+        self.in_flight -= 1
+        if latency is not None:
+            self._observe(latency)
+        self._wake()
+
+    def _observe(self, latency: float) -> None:
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += LATENCY_EWMA_ALPHA * (latency - self.latency)
+
+        target = self.policy.target_latency
+        if target is None:
+            return
+
+        now = time.monotonic()
+        if self.latency > target:
+            # Decrease at most once per observed latency period so a single
+            # slow burst does not collapse the limit to the floor.
+            if now - self._last_decrease >= self.latency:
+                self.limit = max(
+                    self.policy.min_concurrency, math.floor(self.limit * 0.9)
+                )
+                self._last_decrease = now
+        elif self.in_flight + 1 >= self.limit:
+            self.limit = min(self.policy.max_concurrency, self.limit + 1)
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            waiter.set_result(None)
+            self.in_flight += 1
+        self._publish()
+
+    def _discard(self, waiter: asyncio.Future[None]) -> None:
+        waiter.cancel()
+        with suppress(ValueError):
+            self._waiters.remove(waiter)
+        self._publish()
+
+    def _shed(self, reason: str) -> str:
+        ADMISSION_SHED.inc(route_class=self.route_class, reason=reason)
+        self._publish()
+        return reason
+
+    def _publish(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self.in_flight, route_class=self.route_class)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters), route_class=self.route_class)
+        ADMISSION_LIMIT.set(self.limit, route_class=self.route_class)
+
+
+class AdmissionControlMiddleware:
+    """Per-route-class concurrency limits that shed excess load with 503.
+
+    ``routes`` maps path prefixes to route classes; the longest matching
+    prefix wins and unmatched paths bypass admission control entirely.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: Sequence[tuple[str, str]],
+        policies: Mapping[str, AdmissionPolicy],
+    ):
+        self.app = app
+        self.routes = sorted(routes, key=lambda route: len(route[0]), reverse=True)
+        self.gates = {
+            route_class: ConcurrencyGate(route_class, policy)
+            for route_class, policy in policies.items()
+        }
+
+    def gate_for(self, path: str) -> ConcurrencyGate | None:
+        for prefix, route_class in self.routes:
+            if path.startswith(prefix):
+                return self.gates[route_class]
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        gate = self.gate_for(scope["path"])
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        with span("admission.acquire", route_class=gate.route_class):
+            reason = await gate.acquire()
+        if reason is not None:
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is busy. Please try again later."},
+                headers={"Retry-After": str(gate.policy.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        latency: float | None = None
+        try:
+            await self.app(scope, receive, send)
+            latency = time.perf_counter() - started
+        finally:
+            gate.release(latency)
+
+
+def default_admission_policies() -> dict[str, AdmissionPolicy]:
+    return {
+        "hashing": AdmissionPolicy(
+            max_concurrency=settings.ADMISSION_HASHING_CONCURRENCY,
+            max_queue=settings.ADMISSION_HASHING_QUEUE,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+            retry_after=settings.ADMISSION_RETRY_AFTER,
+            target_latency=settings.ADMISSION_TARGET_LATENCY,
+        ),
+        "transfer": AdmissionPolicy(
+            max_concurrency=settings.ADMISSION_TRANSFER_CONCURRENCY,
+            max_queue=settings.ADMISSION_TRANSFER_QUEUE,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+            retry_after=settings.ADMISSION_RETRY_AFTER,
+        ),
+        "default": AdmissionPolicy(
+            max_concurrency=settings.ADMISSION_DEFAULT_CONCURRENCY,
+            max_queue=settings.ADMISSION_DEFAULT_QUEUE,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+            retry_after=settings.ADMISSION_RETRY_AFTER,
+        ),
+    }
+
+
+# Argon2-bound routes get their own class so a login storm cannot starve
+# cheap routes such as token refresh or webhooks, and long-lived file
+# transfers must not hold slots meant for short API calls.
+DEFAULT_ADMISSION_ROUTES = [
+    ("/api/auth/login", "hashing"),
+    ("/api/auth/signup", "hashing"),
+    ("/api/attachments", "transfer"),
+    ("/api", "default"),
+]
@@ -0,0 +1,104 @@
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+class TTLCache[K, V]:
+    """Bounded LRU mapping whose entries expire ``ttl`` seconds after insert."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class CoalescingCache[K, V]:
+    """Short-TTL cache that collapses concurrent misses into one load.
+
+    While a load for a key is in flight, every caller for that key awaits the
+    same task, so N concurrent readers cause a single upstream call. Values
+    are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache: TTLCache[K, V] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: dict[K, asyncio.Future[V]] = {}
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(loader())
+            self._inflight[key] = future
+            future.add_done_callback(functools.partial(self._settle, key))
+
+        # Shielded so one cancelled caller does not cancel the shared load.
+        return await asyncio.shield(future)
+
+    def _settle(self, key: K, future: asyncio.Future[V]) -> None:
+        # Reading the exception also marks it retrieved when nobody awaited.
+        failed = future.cancelled() or future.exception() is not None
+
+        # A load invalidated while in flight must not repopulate the cache.
+        if self._inflight.get(key) is not future:
+            return
+        del self._inflight[key]
+
+        if not failed:
+            self._cache.set(key, future.result())
+
+    def invalidate(self, key: K) -> None:
+        self._cache.pop(key)
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._inflight.clear()
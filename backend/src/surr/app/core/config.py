@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import SecretStr, computed_field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -37,6 +39,75 @@ class LiveKitSettings(BaseSettings):
     LIVEKIT_URL: str = "127.0.0.1:7880"
     LIVEKIT_API_KEY: str = "devkey"
     LIVEKIT_API_SECRET: SecretStr = SecretStr("secret")
+    LIVEKIT_ADMIN_TOKEN_TTL_SECONDS: int = 600
+    LIVEKIT_LISTING_CACHE_TTL_SECONDS: float = 2.0
+    LIVEKIT_MAX_CONNECTIONS: int = 20
+
+
+class AdmissionSettings(BaseSettings):
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_HASHING_CONCURRENCY: int = 4
+    ADMISSION_HASHING_QUEUE: int = 32
+    ADMISSION_DEFAULT_CONCURRENCY: int = 128
+    ADMISSION_DEFAULT_QUEUE: int = 512
+    ADMISSION_TRANSFER_CONCURRENCY: int = 32
+    ADMISSION_TRANSFER_QUEUE: int = 64
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+    ADMISSION_RETRY_AFTER: int = 1
+    ADMISSION_TARGET_LATENCY: float | None = None
+
+
+class UserCacheSettings(BaseSettings):
+    USER_CACHE_MAXSIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 300
+    USER_LOADER_WINDOW_SECONDS: float = 0.002
+    USER_LOADER_MAX_BATCH: int = 500
+
+
+class UsernameFilterSettings(BaseSettings):
+    USERNAME_FILTER_CAPACITY: int = 1_000_000
+    USERNAME_FILTER_ERROR_RATE: float = 0.001
+
+
+class TracingSettings(BaseSettings):
+    TRACING_SAMPLE_RATE: float = 0.0
+    TRACING_EXPORTER: Literal["jsonl", "otlp"] | None = "jsonl"
+    TRACING_JSONL_PATH: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+
+
+class AttachmentSettings(BaseSettings):
+    ATTACHMENTS_DIR: str = "attachments"
+    ATTACHMENT_MAX_SIZE: int = 8 * 1024**3
+
+
+class ReadStateSettings(BaseSettings):
+    READ_STATE_FLUSH_INTERVAL_SECONDS: float = 0.25
+    READ_STATE_CACHE_MAXSIZE: int = 50_000
+    READ_STATE_CACHE_TTL_SECONDS: float = 300
+    READ_STATE_UNREAD_CAP: int = 100
+
+
+class PermissionCacheSettings(BaseSettings):
+    PERMISSION_CACHE_MAXSIZE: int = 100_000
+    PERMISSION_CACHE_TTL_SECONDS: float = 600
+
+
+class JobSettings(BaseSettings):
+    JOB_WORKER_IN_PROCESS: bool = True
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_WORKER_METRICS_PORT: int | None = 9100
+    JOB_CLAIM_BATCH_SIZE: int = 16
+    JOB_POLL_INTERVAL_SECONDS: float = 5.0
+    JOB_LEASE_SECONDS: float = 300
+    JOB_RETRY_BASE_SECONDS: float = 5
+    JOB_RETRY_MAX_SECONDS: float = 3600
+    JOB_SHUTDOWN_TIMEOUT_SECONDS: float = 10
+
+
+class VoiceAnalyticsSettings(BaseSettings):
+    VOICE_ANALYTICS_FLUSH_INTERVAL_SECONDS: float = 1.0
+    VOICE_ANALYTICS_OCCUPANCY_INTERVAL_SECONDS: float = 30
 
 
 class PostgresSettings(BaseSettings):
@@ -67,6 +138,15 @@ class Settings(
     CORSSettings,
     LiveKitSettings,
     PostgresSettings,
+    AdmissionSettings,
+    UserCacheSettings,
+    UsernameFilterSettings,
+    TracingSettings,
+    AttachmentSettings,
+    ReadStateSettings,
+    PermissionCacheSettings,
+    JobSettings,
+    VoiceAnalyticsSettings,
 ):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,93 @@
+import hashlib
+from dataclasses import dataclass
+
+from fastapi import Request, Response, status
+
+from surr.app.core.metrics import registry
+
+CONDITIONAL_REQUESTS = registry.counter(
+    "surr_http_conditional_requests_total",
+    "Requests to routes with ETags, by whether they were answered with 304.",
+    ["route", "result"],
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    """A ``Cache-Control`` policy for one route."""
+
+    max_age: int = 0
+    private: bool = True
+    # Revalidate on every use; cheap here since that is usually a 304.
+    no_cache: bool = True
+
+    @property
+    def header(self) -> str:
+        directives = ["private" if self.private else "public"]
+        if self.no_cache:
+            directives.append("no-cache")
+        directives.append(f"max-age={self.max_age}")
+        return ", ".join(directives)
+
+
+def make_etag(*parts: object) -> str:
+    # Opaque strong validator over the versions a response was built from.
+    digest = hashlib.blake2b(
+        "\x1f".join(map(str, parts)).encode(), digest_size=12
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # ``If-None-Match`` uses the weak comparison: ``W/`` prefixes are ignored.
+    if not if_none_match:
+        return False
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == etag
+        for candidate in candidates
+    )
+
+
+class Conditional:
+    """Validators for a single request; see ``ConditionalGet``."""
+
+    def __init__(
+        self, route: str, policy: CachePolicy, request: Request, response: Response
+    ):
+        self.route = route
+        self.policy = policy
+        self.request = request
+        self.response = response
+
+    def check(self, *version: object) -> Response | None:
+        # Tags the response with an ETag built from ``version``, which must
+        # identify its content, and returns a 304 to send instead if the
+        # client already has it.
+        etag = make_etag(self.route, *version)
+        headers = {"ETag": etag, "Cache-Control": self.policy.header}
+        if etag_matches(self.request.headers.get("if-none-match"), etag):
+            CONDITIONAL_REQUESTS.inc(route=self.route, result="not_modified")
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        CONDITIONAL_REQUESTS.inc(route=self.route, result="modified")
+        self.response.headers.update(headers)
+        return None
+
+
+class ConditionalGet:
+    """Dependency handling ``If-None-Match`` for a GET route.
+
+    Use cases compute a version from watermarks they can read cheaply,
+    check it, and return the 304 before running the real query::
+
+        if (not_modified := conditional.check(version)) is not None:
+            return not_modified
+    """
+
+    def __init__(self, route: str, policy: CachePolicy | None = None):
+        self.route = route
+        self.policy = policy or CachePolicy()
+
+    def __call__(self, request: Request, response: Response) -> Conditional:
+        return Conditional(self.route, self.policy, request, response)
@@ -0,0 +1,330 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from surr.app.core.config import settings
+from surr.app.core.metrics import registry
+from surr.app.core.pubsub import notify, pg_listener
+from surr.app.core.tracing import tracer
+from surr.app.models.job import Job
+from surr.database import AsyncSessionLocal
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from sqlalchemy import Row
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel waking idle workers when a job is enqueued.
+JOBS_CHANNEL = "surr_jobs"
+
+# How often an idle worker samples the backlog for the metrics below.
+BACKLOG_SAMPLE_INTERVAL = 15.0
+
+JOBS_CLAIMED = registry.counter(
+    "surr_jobs_claimed_total", "Jobs claimed by this worker.", ["kind"]
+)
+JOBS_COMPLETED = registry.counter(
+    "surr_jobs_completed_total", "Jobs that ran successfully.", ["kind"]
+)
+JOBS_FAILED = registry.counter(
+    "surr_jobs_failed_total",
+    "Job runs that raised, by whether the job will be retried.",
+    ["kind", "outcome"],
+)
+JOBS_RUNNING = registry.gauge("surr_jobs_running", "Jobs currently running.")
+JOB_SECONDS = registry.counter(
+    "surr_job_seconds_total", "Time spent running jobs.", ["kind"]
+)
+JOB_CLAIM_LAG = registry.gauge(
+    "surr_job_claim_lag_seconds",
+    "How long the most recently claimed job waited past its due time.",
+    ["kind"],
+)
+JOBS_READY = registry.gauge("surr_jobs_ready", "Due jobs not yet claimed.")
+JOB_QUEUE_LAG = registry.gauge(
+    "surr_job_queue_lag_seconds", "How long the oldest due job has been waiting."
+)
+
+type JobHandler = Callable[[async_sessionmaker, dict[str, Any]], Awaitable[None]]
+type ClaimedJob = Row[tuple[int, str, dict[str, Any], int, int, float]]
+
+
+@dataclass(frozen=True, slots=True)
+class JobType:
+    handler: JobHandler
+    max_attempts: int
+    # Periodic jobs are a single row that is rescheduled after each run.
+    interval: float | None = None
+
+
+class JobQueue:
+    """Registry of job kinds, and the way to enqueue them."""
+
+    def __init__(self):
+        self.types: dict[str, JobType] = {}
+        # Workers running in this process, woken when a job is enqueued.
+        self.workers: set[JobWorker] = set()
+
+    def wake_workers(self, _payload: str = "") -> None:
+        for worker in self.workers:
+            worker.wake()
+
+    def _register(self, kind: str, job_type: JobType) -> None:
+        if kind in self.types:
+            msg = f"Job kind {kind!r} is already registered"
+            raise ValueError(msg)
+        self.types[kind] = job_type
+
+    def job(
+        self, kind: str, *, max_attempts: int = 5
+    ) -> Callable[[JobHandler], JobHandler]:
+        def decorator(handler: JobHandler) -> JobHandler:
+            self._register(kind, JobType(handler, max_attempts))
+            return handler
+
+        return decorator
+
+    def periodic(
+        self, kind: str, *, interval: float, max_attempts: int = 3
+    ) -> Callable[[JobHandler], JobHandler]:
+        def decorator(handler: JobHandler) -> JobHandler:
+            self._register(kind, JobType(handler, max_attempts, interval))
+            return handler
+
+        return decorator
+
+    async def enqueue(
+        self,
+        session: AsyncSession,
+        kind: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        key: str | None = None,
+        delay: float = 0,
+    ) -> int | None:
+        # Adds a job in the caller's transaction, so it only becomes
+        # visible, and only wakes workers, if that transaction commits.
+        job_type = self.types.get(kind)
+        if job_type is None:
+            msg = f"Unknown job kind {kind!r}"
+            raise ValueError(msg)
+
+        job_id = await Job.enqueue(
+            session,
+            kind,
+            payload or {},
+            key=key,
+            delay=delay,
+            max_attempts=job_type.max_attempts,
+        )
+        if job_id is not None and delay <= 0:
+            await notify(session, JOBS_CHANNEL, kind)
+        return job_id
+
+    async def schedule_periodic(self, session_factory: async_sessionmaker) -> None:
+        # Idempotent: every worker calls this, one row per kind survives.
+        async with session_factory() as db:
+            for kind, job_type in self.types.items():
+                if job_type.interval is not None:
+                    await Job.enqueue(
+                        db, kind, {}, key=kind, max_attempts=job_type.max_attempts
+                    )
+            await db.commit()
+
+
+def retry_delay(attempts: int, base: float, maximum: float) -> float:
+    # Exponential backoff with jitter, so failing jobs do not retry in step.
+    delay = min(maximum, base * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)  # noqa: S311
+
+
+class JobWorker:
+    """Claims due jobs in batches and runs up to ``concurrency`` at a time.
+
+    Claims use ``FOR UPDATE SKIP LOCKED``, so any number of workers, in API
+    processes or ``surr-worker``, can share the table. A claim leases the
+    job for ``lease`` seconds; jobs still running when it runs out are
+    cancelled, and jobs of a crashed worker become due again.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        queue: JobQueue,
+        session_factory: async_sessionmaker,
+        *,
+        concurrency: int,
+        batch_size: int,
+        lease: float,
+        poll_interval: float,
+        retry_base: float,
+        retry_max: float,
+    ):
+        self.queue = queue
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.active: set[asyncio.Task[None]] = set()
+        self._wake = asyncio.Event()
+        self._sampled_at = 0.0
+
+    def wake(self, _payload: str = "") -> None:
+        self._wake.set()
+
+    async def poll(self) -> int:
+        # Claims as many due jobs as there are free slots and starts them.
+        free = min(self.concurrency - len(self.active), self.batch_size)
+        if free <= 0:
+            return 0
+
+        async with self.session_factory() as db:
+            jobs = await Job.claim(db, free, self.lease)
+            await db.commit()
+
+        for job in jobs:
+            JOBS_CLAIMED.inc(kind=job.kind)
+            JOB_CLAIM_LAG.set(float(job.lag), kind=job.kind)
+            task = asyncio.create_task(self._run(job))
+            self.active.add(task)
+            task.add_done_callback(self._finished)
+        return len(jobs)
+
+    def _finished(self, task: asyncio.Task[None]) -> None:
+        self.active.discard(task)
+        self.wake()
+
+    async def _run(self, job: ClaimedJob) -> None:
+        job_type = self.queue.types.get(job.kind)
+        if job_type is None:
+            # Another version of the code enqueued it; leave it for that.
+            logger.warning("No handler for job %s of kind %r", job.id, job.kind)
+            await self._ack(job, error="Unknown job kind")
+            return
+
+        JOBS_RUNNING.inc()
+        started = time.perf_counter()
+        try:
+            with tracer.trace(f"job {job.kind}", **{"job.id": job.id}):
+                async with asyncio.timeout(self.lease):
+                    await job_type.handler(self.session_factory, job.payload)
+        except Exception as exc:
+            logger.exception("Job %s of kind %r failed", job.id, job.kind)
+            await self._ack(job, error=repr(exc), job_type=job_type)
+        else:
+            JOBS_COMPLETED.inc(kind=job.kind)
+            await self._ack(job, job_type=job_type)
+        finally:
+            JOBS_RUNNING.dec()
+            JOB_SECONDS.inc(time.perf_counter() - started, kind=job.kind)
+
+    async def _ack(
+        self,
+        job: ClaimedJob,
+        *,
+        error: str | None = None,
+        job_type: JobType | None = None,
+    ) -> None:
+        interval = job_type.interval if job_type else None
+        exhausted = job.attempts >= job.max_attempts
+        if error is not None:
+            outcome = "dead" if exhausted and interval is None else "retry"
+            JOBS_FAILED.inc(kind=job.kind, outcome=outcome)
+
+        try:
+            async with self.session_factory() as db:
+                if job_type is None:
+                    await Job.reschedule(db, job.id, self.lease, error=error)
+                elif interval is not None and (error is None or exhausted):
+                    # Periodic jobs go back on their schedule.
+                    await Job.reschedule(
+                        db, job.id, interval, reset_attempts=True, error=error
+                    )
+                elif error is None:
+                    await Job.complete(db, job.id)
+                elif exhausted:
+                    await Job.fail(db, job.id, error)
+                else:
+                    delay = retry_delay(job.attempts, self.retry_base, self.retry_max)
+                    await Job.reschedule(db, job.id, delay, error=error)
+                await db.commit()
+        except Exception:
+            # The lease runs out and the job is retried.
+            logger.exception("Error recording the outcome of job %s", job.id)
+
+    async def _sample_backlog(self) -> None:
+        now = time.monotonic()
+        if now - self._sampled_at < BACKLOG_SAMPLE_INTERVAL:
+            return
+        self._sampled_at = now
+        async with self.session_factory() as db:
+            ready, lag = await Job.backlog(db)
+        JOBS_READY.set(ready)
+        JOB_QUEUE_LAG.set(lag)
+
+    async def run(self) -> None:
+        scheduled = False
+        while True:
+            self._wake.clear()
+            try:
+                if not scheduled:
+                    await self.queue.schedule_periodic(self.session_factory)
+                    scheduled = True
+                claimed = await self.poll()
+                if claimed == self.batch_size and len(self.active) < self.concurrency:
+                    # There may be more waiting behind a full batch.
+                    continue
+                await self._sample_backlog()
+            except Exception:
+                logger.exception("Error claiming jobs")
+
+            # Woken by NOTIFY or a finished job; the timeout catches retries
+            # and periodic jobs coming due.
+            with suppress(TimeoutError):
+                async with asyncio.timeout(self.poll_interval):
+                    await self._wake.wait()
+
+    async def close(self, grace: float) -> None:
+        # Lets running jobs finish; those that do not are retried elsewhere
+        # once their lease runs out.
+        if not self.active:
+            return
+        _, pending = await asyncio.wait(self.active, timeout=grace)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+job_queue = JobQueue()
+# Subscribed at import, since the listener only LISTENs on the channels
+# registered when it connects.
+pg_listener.subscribe(JOBS_CHANNEL, job_queue.wake_workers)
+
+
+async def run_job_worker() -> None:
+    """Background task running jobs until cancelled."""
+    worker = JobWorker(
+        job_queue,
+        AsyncSessionLocal,
+        concurrency=settings.JOB_WORKER_CONCURRENCY,
+        batch_size=settings.JOB_CLAIM_BATCH_SIZE,
+        lease=settings.JOB_LEASE_SECONDS,
+        poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+        retry_base=settings.JOB_RETRY_BASE_SECONDS,
+        retry_max=settings.JOB_RETRY_MAX_SECONDS,
+    )
+    job_queue.workers.add(worker)
+    try:
+        await worker.run()
+    finally:
+        job_queue.workers.discard(worker)
+        await worker.close(settings.JOB_SHUTDOWN_TIMEOUT_SECONDS)
@@ -0,0 +1,264 @@
+import base64
+import hashlib
+import hmac
+import re
+import time
+from typing import TYPE_CHECKING, Annotated, Any
+
+import httpx
+import jwt
+from fastapi import Depends
+
+from surr.app.core.cache import CoalescingCache, TTLCache
+from surr.app.core.config import settings
+from surr.app.core.tracing import span
+from surr.app.exceptions.livekit import LiveKitError
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+type JsonObject = dict[str, Any]
+
+INT32_MAX = 2**31 - 1
+
+# Admin tokens are re-signed once they are this close to expiring.
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+
+# Voice rooms belong to channels and are named after them.
+CHANNEL_ROOM_PATTERN = r"^channel-[1-9][0-9]{0,9}$"
+
+
+def channel_room(channel_id: int) -> str:
+    return f"channel-{channel_id}"
+
+
+def room_channel_id(room: str) -> int | None:
+    # The channel a room belongs to, or None for names not of that form.
+    if not re.fullmatch(CHANNEL_ROOM_PATTERN, room):
+        return None
+    channel_id = int(room.removeprefix("channel-"))
+    return channel_id if channel_id <= INT32_MAX else None
+
+
+def http_base_url(url: str) -> str:
+    # LIVEKIT_URL may be a bare host:port or the ws(s):// URL handed to clients.
+    for ws_scheme, http_scheme in (("wss://", "https://"), ("ws://", "http://")):
+        if url.startswith(ws_scheme):
+            return http_scheme + url.removeprefix(ws_scheme)
+    if url.startswith(("http://", "https://")):
+        return url
+    return f"http://{url}"
+
+
+class AdminTokenSigner:
+    """Signs LiveKit server-API tokens and reuses them until near expiry."""
+
+    def __init__(self, api_key: str, api_secret: str, ttl: int):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.ttl = ttl
+        self._tokens: TTLCache[tuple[tuple[str, Any], ...], str] = TTLCache(
+            maxsize=1024, ttl=max(ttl - TOKEN_REFRESH_MARGIN_SECONDS, 1)
+        )
+
+    def token(self, grants: Mapping[str, Any]) -> str:
+        key = tuple(sorted(grants.items()))
+        cached = self._tokens.get(key)
+        if cached is not None:
+            return cached
+
+        now = int(time.time())
+        claims = {
+            "iss": self.api_key,
+            "nbf": now,
+            "exp": now + self.ttl,
+            "video": dict(grants),
+        }
+
+        signed = jwt.encode(claims, self.api_secret, algorithm="HS256")
+        self._tokens.set(key, signed)
+        return signed
+
+
+def verify_webhook(
+    body: bytes, token: str | None, api_key: str, api_secret: str
+) -> bool:
+    # LiveKit signs webhooks with a token from our API key whose
+    # ``sha256`` claim is the base64 digest of the body.
+    if not token:
+        return False
+    try:
+        claims = jwt.decode(
+            token.removeprefix("Bearer "),
+            api_secret,
+            algorithms=["HS256"],
+            issuer=api_key,
+            leeway=60,
+        )
+    except jwt.InvalidTokenError:
+        return False
+
+    digest = base64.b64encode(hashlib.sha256(body).digest()).decode()
+    return hmac.compare_digest(str(claims.get("sha256", "")), digest)
+
+
+class LiveKitClient:
+    """Async client for LiveKit's Twirp server API.
+
+    One pooled keep-alive HTTP client is shared by all calls. Room and
+    participant listings go through short-TTL coalescing caches, so a burst
+    of clients opening the same voice panel costs one upstream request.
+    Mutations invalidate the listings they affect.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        url: str,
+        api_key: str,
+        api_secret: str,
+        *,
+        listing_ttl: float = 2.0,
+        token_ttl: int = 600,
+        max_connections: int = 20,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.signer = AdminTokenSigner(api_key, api_secret, ttl=token_ttl)
+        self._http = httpx.AsyncClient(
+            base_url=http_base_url(url),
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+        self._rooms: CoalescingCache[tuple[str, ...], list[JsonObject]] = (
+            CoalescingCache(maxsize=256, ttl=listing_ttl)
+        )
+        self._participants: CoalescingCache[str, list[JsonObject]] = CoalescingCache(
+            maxsize=4096, ttl=listing_ttl
+        )
+
+    def verify_webhook(self, body: bytes, token: str | None) -> bool:
+        return verify_webhook(body, token, self.signer.api_key, self.signer.api_secret)
+
+    async def _call(
+        self,
+        service: str,
+        method: str,
+        payload: JsonObject,
+        grants: Mapping[str, Any],
+    ) -> JsonObject:
+        headers = {"Authorization": f"Bearer {self.signer.token(grants)}"}
+
+        with span(f"livekit.{method}"):
+            response = await self._http.post(
+                f"/twirp/livekit.{service}/{method}", json=payload, headers=headers
+            )
+
+        if response.is_error:
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            raise LiveKitError(
+                status_code=response.status_code,
+                code=body.get("code", "unknown"),
+                message=body.get("msg", response.text),
+            )
+        return response.json()
+
+    async def list_rooms(self, names: list[str] | None = None) -> list[JsonObject]:
+        key = tuple(sorted(names or ()))
+
+        async def load() -> list[JsonObject]:
+            body = await self._call(
+                "RoomService",
+                "ListRooms",
+                {"names": list(key)},
+                {"roomList": True},
+            )
+            return body.get("rooms", [])
+
+        return await self._rooms.get_or_load(key, load)
+
+    async def list_participants(self, room: str) -> list[JsonObject]:
+        async def load() -> list[JsonObject]:
+            body = await self._call(
+                "RoomService",
+                "ListParticipants",
+                {"room": room},
+                {"roomAdmin": True, "room": room},
+            )
+            return body.get("participants", [])
+
+        return await self._participants.get_or_load(room, load)
+
+    async def mute_published_track(
+        self, room: str, identity: str, track_sid: str, *, muted: bool = True
+    ) -> JsonObject:
+        body = await self._call(
+            "RoomService",
+            "MutePublishedTrack",
+            {
+                "room": room,
+                "identity": identity,
+                "track_sid": track_sid,
+                "muted": muted,
+            },
+            {"roomAdmin": True, "room": room},
+        )
+        self._participants.invalidate(room)
+        return body
+
+    async def remove_participant(self, room: str, identity: str) -> None:
+        await self._call(
+            "RoomService",
+            "RemoveParticipant",
+            {"room": room, "identity": identity},
+            {"roomAdmin": True, "room": room},
+        )
+        self._participants.invalidate(room)
+        # Participant counts are part of the room listing.
+        self._rooms.clear()
+
+    async def create_ingress(
+        self,
+        room: str,
+        identity: str,
+        name: str,
+        input_type: str = "WHIP_INPUT",
+    ) -> JsonObject:
+        return await self._call(
+            "Ingress",
+            "CreateIngress",
+            {
+                "input_type": input_type,
+                "name": name,
+                "room_name": room,
+                "participant_identity": identity,
+                "participant_name": identity,
+            },
+            {"ingressAdmin": True},
+        )
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+livekit_client = LiveKitClient(
+    settings.LIVEKIT_URL,
+    settings.LIVEKIT_API_KEY,
+    settings.LIVEKIT_API_SECRET.get_secret_value(),
+    listing_ttl=settings.LIVEKIT_LISTING_CACHE_TTL_SECONDS,
+    token_ttl=settings.LIVEKIT_ADMIN_TOKEN_TTL_SECONDS,
+    max_connections=settings.LIVEKIT_MAX_CONNECTIONS,
+)
+
+
+def get_livekit_client() -> LiveKitClient:
+    return livekit_client
+
+
+LiveKit = Annotated[LiveKitClient, Depends(get_livekit_client)]
@@ -0,0 +1,350 @@
+import itertools
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, select
+
+from surr.app.core.cache import TTLCache
+from surr.app.core.config import settings
+from surr.app.core.permissions import (
+    ChannelOverwrites,
+    GuildPermissions,
+    MemberRoles,
+    Permission,
+    base_permissions,
+    channel_permissions,
+)
+from surr.app.core.pubsub import notify, pg_listener
+from surr.app.models.channel import Channel
+from surr.app.models.guild import Guild
+from surr.app.models.guild_member import GuildMember
+from surr.app.models.member_role import MemberRole
+from surr.app.models.permission_overwrite import OverwriteTarget, PermissionOverwrite
+from surr.app.models.role import Role
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# Postgres channel used to invalidate permission caches in every worker.
+PERMISSION_CACHE_CHANNEL = "surr_permissions"
+
+type Stamps = tuple[int, int, int]
+
+
+class PermissionCache:
+    """Per-process cache of effective permissions.
+
+    The inputs are cached separately: role permissions per guild, role ids
+    per member and overwrites per channel. Every cached input carries a
+    unique stamp, and each resolved ``(user, channel)`` bitset remembers the
+    stamps it was computed from. Invalidating one input therefore drops
+    exactly the bitsets that depend on it, the next time they are read.
+
+    As with the user cache, nothing is cached while the LISTEN connection
+    is down, and a load racing an invalidation is not stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.guilds: TTLCache[int, GuildPermissions] = TTLCache(maxsize, ttl)
+        self.members: TTLCache[tuple[int, int], MemberRoles] = TTLCache(maxsize, ttl)
+        self.channels: TTLCache[int, ChannelOverwrites] = TTLCache(maxsize, ttl)
+        self.resolved: TTLCache[tuple[int, int], tuple[Permission, Stamps]] = TTLCache(
+            maxsize, ttl
+        )
+        self.generation = 0
+        self.enabled = False
+        self._stamps = itertools.count(1)
+
+    async def _get_many[K, V: GuildPermissions | MemberRoles | ChannelOverwrites](
+        self,
+        cache: TTLCache[K, V],
+        keys: Iterable[K],
+        fetch: Callable[[list[K]], Awaitable[dict[K, V]]],
+    ) -> dict[K, V]:
+        # Looks ``keys`` up in ``cache``, reading all misses in one ``fetch``.
+        found: dict[K, V] = {}
+        missing: list[K] = []
+        for key in keys:
+            if (value := cache.get(key)) is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+        if not missing:
+            return found
+
+        generation = self.generation
+        fetched = await fetch(missing)
+        for key, value in fetched.items():
+            value.stamp = next(self._stamps)
+            if self.enabled and generation == self.generation:
+                cache.set(key, value)
+            found[key] = value
+        return found
+
+    async def _channels(
+        self, session_factory: async_sessionmaker, channel_ids: Iterable[int]
+    ) -> dict[int, ChannelOverwrites]:
+        async def fetch(ids: list[int]) -> dict[int, ChannelOverwrites]:
+            stmt = (
+                select(
+                    Channel.id,
+                    Channel.guild_id,
+                    PermissionOverwrite.target_type,
+                    PermissionOverwrite.target_id,
+                    PermissionOverwrite.allow,
+                    PermissionOverwrite.deny,
+                )
+                .outerjoin(
+                    PermissionOverwrite, PermissionOverwrite.channel_id == Channel.id
+                )
+                .where(Channel.id.in_(ids))
+            )
+            async with session_factory() as db:
+                rows = (await db.execute(stmt)).all()
+
+            channels: dict[int, ChannelOverwrites] = {}
+            for channel_id, guild_id, target_type, target_id, allow, deny in rows:
+                channel = channels.setdefault(channel_id, ChannelOverwrites(guild_id))
+                if target_type == OverwriteTarget.ROLE:
+                    channel.roles[target_id] = (allow, deny)
+                elif target_type == OverwriteTarget.MEMBER:
+                    channel.members[target_id] = (allow, deny)
+            return channels
+
+        return await self._get_many(self.channels, channel_ids, fetch)
+
+    async def _guilds(
+        self, session_factory: async_sessionmaker, guild_ids: Iterable[int]
+    ) -> dict[int, GuildPermissions]:
+        async def fetch(ids: list[int]) -> dict[int, GuildPermissions]:
+            stmt = (
+                select(
+                    Guild.id,
+                    Guild.owner_id,
+                    Role.id,
+                    Role.permissions,
+                    Role.is_default,
+                )
+                .join(Role, Role.guild_id == Guild.id)
+                .where(Guild.id.in_(ids))
+            )
+            async with session_factory() as db:
+                rows = (await db.execute(stmt)).all()
+
+            guilds: dict[int, GuildPermissions] = {}
+            for guild_id, owner_id, role_id, permissions, is_default in rows:
+                guild = guilds.setdefault(
+                    guild_id, GuildPermissions(owner_id, everyone_role_id=0, roles={})
+                )
+                guild.roles[role_id] = permissions
+                if is_default:
+                    guild.everyone_role_id = role_id
+            return guilds
+
+        return await self._get_many(self.guilds, guild_ids, fetch)
+
+    async def _members(
+        self,
+        session_factory: async_sessionmaker,
+        user_id: int,
+        guild_ids: Iterable[int],
+    ) -> dict[int, MemberRoles]:
+        async def fetch(
+            keys: list[tuple[int, int]],
+        ) -> dict[tuple[int, int], MemberRoles]:
+            stmt = (
+                select(GuildMember.guild_id, MemberRole.role_id)
+                .outerjoin(
+                    MemberRole,
+                    and_(
+                        MemberRole.guild_id == GuildMember.guild_id,
+                        MemberRole.user_id == GuildMember.user_id,
+                    ),
+                )
+                .where(
+                    GuildMember.user_id == user_id,
+                    GuildMember.guild_id.in_([guild_id for guild_id, _ in keys]),
+                )
+            )
+            async with session_factory() as db:
+                rows = (await db.execute(stmt)).all()
+
+            role_ids: dict[int, set[int]] = {}
+            for guild_id, role_id in rows:
+                roles = role_ids.setdefault(guild_id, set())
+                if role_id is not None:
+                    roles.add(role_id)
+
+            # Non-members are cached too, as having no roles at all.
+            return {
+                (guild_id, member_id): MemberRoles(
+                    frozenset(role_ids[guild_id]) if guild_id in role_ids else None
+                )
+                for guild_id, member_id in keys
+            }
+
+        members = await self._get_many(
+            self.members, [(guild_id, user_id) for guild_id in guild_ids], fetch
+        )
+        return {guild_id: member for (guild_id, _), member in members.items()}
+
+    async def resolve_many(
+        self,
+        session_factory: async_sessionmaker,
+        user_id: int,
+        channel_ids: Iterable[int],
+    ) -> dict[int, Permission]:
+        # Effective permissions of ``user_id`` in each channel, in at most
+        # three queries however many channels are asked for. Channels that
+        # do not exist are left out.
+        channels = await self._channels(session_factory, dict.fromkeys(channel_ids))
+        guild_ids = {channel.guild_id for channel in channels.values()}
+        guilds = await self._guilds(session_factory, guild_ids)
+        members = await self._members(session_factory, user_id, guild_ids)
+
+        resolved: dict[int, Permission] = {}
+        for channel_id, channel in channels.items():
+            guild = guilds.get(channel.guild_id)
+            if guild is None:
+                continue
+            member = members[channel.guild_id]
+
+            key = (user_id, channel_id)
+            stamps = (guild.stamp, member.stamp, channel.stamp)
+            cached = self.resolved.get(key)
+            if cached is not None and cached[1] == stamps:
+                resolved[channel_id] = cached[0]
+                continue
+
+            permissions = channel_permissions(guild, channel, user_id, member)
+            if self.enabled:
+                self.resolved.set(key, (permissions, stamps))
+            resolved[channel_id] = permissions
+        return resolved
+
+    async def visible_channels(
+        self,
+        session_factory: async_sessionmaker,
+        user_id: int,
+        channel_ids: Iterable[int],
+    ) -> list[int]:
+        resolved = await self.resolve_many(session_factory, user_id, channel_ids)
+        return [
+            channel_id
+            for channel_id, permissions in resolved.items()
+            if permissions & Permission.VIEW_CHANNEL
+        ]
+
+    async def guild_permissions(
+        self, session_factory: async_sessionmaker, user_id: int, guild_id: int
+    ) -> Permission | None:
+        # ``None`` unless the guild exists and ``user_id`` is a member.
+        guild = (await self._guilds(session_factory, [guild_id])).get(guild_id)
+        if guild is None:
+            return None
+        member = (await self._members(session_factory, user_id, [guild_id]))[guild_id]
+        if member.role_ids is None:
+            return None
+        return base_permissions(guild, user_id, member)
+
+    async def require_channel(
+        self,
+        session_factory: async_sessionmaker,
+        user_id: int,
+        channel_id: int,
+        required: Permission = Permission.VIEW_CHANNEL,
+    ) -> Permission:
+        resolved = await self.resolve_many(session_factory, user_id, [channel_id])
+        permissions = resolved.get(channel_id, Permission(0))
+        # Channels the user cannot see are indistinguishable from missing ones.
+        if not permissions & Permission.VIEW_CHANNEL:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Channel not found"
+            )
+        if permissions & required != required:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Missing permissions"
+            )
+        return permissions
+
+    async def require_guild(
+        self,
+        session_factory: async_sessionmaker,
+        user_id: int,
+        guild_id: int,
+        required: Permission,
+    ) -> Permission:
+        permissions = await self.guild_permissions(session_factory, user_id, guild_id)
+        if permissions is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Guild not found"
+            )
+        if permissions & required != required:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Missing permissions"
+            )
+        return permissions
+
+    def invalidate_guild(self, guild_id: int) -> None:
+        self.generation += 1
+        self.guilds.pop(guild_id)
+
+    def invalidate_member(self, guild_id: int, user_id: int) -> None:
+        self.generation += 1
+        self.members.pop((guild_id, user_id))
+
+    def invalidate_channel(self, channel_id: int) -> None:
+        self.generation += 1
+        self.channels.pop(channel_id)
+
+    def handle_notification(self, payload: str) -> None:
+        kind, *ids = payload.split(":")
+        if kind == "guild":
+            self.invalidate_guild(int(ids[0]))
+        elif kind == "member":
+            self.invalidate_member(int(ids[0]), int(ids[1]))
+        elif kind == "channel":
+            self.invalidate_channel(int(ids[0]))
+        else:
+            self.clear()
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.guilds.clear()
+        self.members.clear()
+        self.channels.clear()
+        self.resolved.clear()
+
+    def set_listening(self, listening: bool) -> None:  # noqa: FBT001
+        self.clear()
+        self.enabled = listening
+
+
+permission_cache = PermissionCache(
+    maxsize=settings.PERMISSION_CACHE_MAXSIZE,
+    ttl=settings.PERMISSION_CACHE_TTL_SECONDS,
+)
+pg_listener.subscribe(PERMISSION_CACHE_CHANNEL, permission_cache.handle_notification)
+pg_listener.on_connection_change(permission_cache.set_listening)
+
+
+async def notify_guild_changed(session: AsyncSession, guild_id: int) -> None:
+    """Queue a cross-worker invalidation, delivered when ``session`` commits."""
+    permission_cache.invalidate_guild(guild_id)
+    await notify(session, PERMISSION_CACHE_CHANNEL, f"guild:{guild_id}")
+
+
+async def notify_member_changed(
+    session: AsyncSession, guild_id: int, user_id: int
+) -> None:
+    """Queue a cross-worker invalidation, delivered when ``session`` commits."""
+    permission_cache.invalidate_member(guild_id, user_id)
+    await notify(session, PERMISSION_CACHE_CHANNEL, f"member:{guild_id}:{user_id}")
+
+
+async def notify_channel_changed(session: AsyncSession, channel_id: int) -> None:
+    """Queue a cross-worker invalidation, delivered when ``session`` commits."""
+    permission_cache.invalidate_channel(channel_id)
+    await notify(session, PERMISSION_CACHE_CHANNEL, f"channel:{channel_id}")
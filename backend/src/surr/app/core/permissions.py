@@ -0,0 +1,114 @@
+from dataclasses import dataclass, field
+from enum import IntFlag
+
+
+class Permission(IntFlag):
+    """Permission bits stored on roles and channel overwrites."""
+
+    VIEW_CHANNEL = 1 << 0
+    SEND_MESSAGES = 1 << 1
+    READ_MESSAGE_HISTORY = 1 << 2
+    MANAGE_MESSAGES = 1 << 3
+    ATTACH_FILES = 1 << 4
+    CONNECT = 1 << 5
+    SPEAK = 1 << 6
+    STREAM = 1 << 7
+    MUTE_MEMBERS = 1 << 8
+    MANAGE_CHANNELS = 1 << 9
+    MANAGE_ROLES = 1 << 10
+    MANAGE_GUILD = 1 << 11
+    ADMINISTRATOR = 1 << 12
+
+
+ALL_PERMISSIONS = Permission(sum(Permission))
+
+# Granted to @everyone in a new guild.
+DEFAULT_PERMISSIONS = (
+    Permission.VIEW_CHANNEL
+    | Permission.SEND_MESSAGES
+    | Permission.READ_MESSAGE_HISTORY
+    | Permission.ATTACH_FILES
+    | Permission.CONNECT
+    | Permission.SPEAK
+    | Permission.STREAM
+)
+
+type Overwrite = tuple[int, int]
+
+
+@dataclass(slots=True)
+class GuildPermissions:
+    """Role permissions of a guild, keyed by role id."""
+
+    owner_id: int
+    everyone_role_id: int
+    roles: dict[int, int]
+    stamp: int = 0
+
+
+@dataclass(slots=True)
+class ChannelOverwrites:
+    """``(allow, deny)`` overwrites of a channel, keyed by role or user id."""
+
+    guild_id: int
+    roles: dict[int, Overwrite] = field(default_factory=dict)
+    members: dict[int, Overwrite] = field(default_factory=dict)
+    stamp: int = 0
+
+
+@dataclass(slots=True)
+class MemberRoles:
+    """Role ids of a guild member, or ``None`` if the user is not a member."""
+
+    role_ids: frozenset[int] | None
+    stamp: int = 0
+
+
+def base_permissions(
+    guild: GuildPermissions, user_id: int, member: MemberRoles
+) -> Permission:
+    if member.role_ids is None:
+        return Permission(0)
+    if user_id == guild.owner_id:
+        return ALL_PERMISSIONS
+
+    permissions = guild.roles.get(guild.everyone_role_id, 0)
+    for role_id in member.role_ids:
+        permissions |= guild.roles.get(role_id, 0)
+
+    if permissions & Permission.ADMINISTRATOR:
+        return ALL_PERMISSIONS
+    return Permission(permissions)
+
+
+def channel_permissions(
+    guild: GuildPermissions,
+    channel: ChannelOverwrites,
+    user_id: int,
+    member: MemberRoles,
+) -> Permission:
+    # Base role permissions, then the @everyone overwrite, then all of the
+    # member's role overwrites together, then the member's own overwrite.
+    # Denies are applied before allows at each step.
+    # Overwrites apply even to members whose roles grant nothing.
+    permissions = base_permissions(guild, user_id, member)
+    if member.role_ids is None or permissions == ALL_PERMISSIONS:
+        return permissions
+
+    everyone_allow, everyone_deny = channel.roles.get(guild.everyone_role_id, (0, 0))
+    permissions = (permissions & ~everyone_deny) | everyone_allow
+
+    allow = deny = 0
+    for role_id in member.role_ids or ():
+        role_allow, role_deny = channel.roles.get(role_id, (0, 0))
+        allow |= role_allow
+        deny |= role_deny
+    permissions = (permissions & ~deny) | allow
+
+    member_allow, member_deny = channel.members.get(user_id, (0, 0))
+    permissions = (permissions & ~member_deny) | member_allow
+
+    # A channel that cannot be seen grants nothing else either.
+    if not permissions & Permission.VIEW_CHANNEL:
+        return Permission(0)
+    return Permission(permissions & ALL_PERMISSIONS)
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+import asyncpg
+from sqlalchemy import func, select
+
+from surr.app.core.config import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Postgres caps NOTIFY payloads at 8000 bytes.
+MAX_PAYLOAD_BYTES = 7900
+
+
+class PgListener:
+    """One LISTEN connection per process, fanned out to in-process handlers.
+
+    Caches built on notifications register a connection callback: it is
+    called with ``True`` once LISTEN is established and ``False`` when the
+    connection is lost, since notifications sent while disconnected are
+    gone for good and anything cached may be stale.
+    """
+
+    def __init__(self, dsn: str, reconnect_delay: float = 5.0):
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self.connected = False
+        self._handlers: dict[str, list[Callable[[str], None]]] = {}
+        self._connection_callbacks: list[Callable[[bool], None]] = []
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def on_connection_change(self, callback: Callable[[bool], None]) -> None:
+        self._connection_callbacks.append(callback)
+
+    def _dispatch(
+        self, _connection: asyncpg.Connection, _pid: int, channel: str, payload: str
+    ) -> None:
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Notification handler for %s failed", channel)
+
+    def _set_connected(self, connected: bool) -> None:  # noqa: FBT001
+        self.connected = connected
+        for callback in self._connection_callbacks:
+            callback(connected)
+
+    async def run(self) -> None:
+        """Background task holding the LISTEN connection open."""
+        closed = asyncio.Event()
+
+        while True:
+            connection: asyncpg.Connection | None = None
+            closed.clear()
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                connection.add_termination_listener(lambda _: closed.set())
+                for channel in self._handlers:
+                    await connection.add_listener(channel, self._dispatch)
+
+                self._set_connected(connected=True)
+                await closed.wait()
+                logger.warning("LISTEN connection closed, reconnecting")
+
+            except Exception:
+                logger.exception("LISTEN connection failed")
+
+            finally:
+                if self.connected:
+                    self._set_connected(connected=False)
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(self.reconnect_delay)
+
+
+async def notify(session: AsyncSession, channel: str, payload: str) -> None:
+    """Queue a notification, delivered when ``session`` commits."""
+    await session.execute(select(func.pg_notify(channel, payload)))
+
+
+def pack_payloads(items: list[str], separator: str = ";") -> list[str]:
+    # Joins items into as few payloads as fit under the NOTIFY size limit.
+    payloads: list[str] = []
+    current: list[str] = []
+    size = 0
+    for item in items:
+        item_size = len(item.encode()) + len(separator)
+        if current and size + item_size > MAX_PAYLOAD_BYTES:
+            payloads.append(separator.join(current))
+            current, size = [], 0
+        current.append(item)
+        size += item_size
+    if current:
+        payloads.append(separator.join(current))
+    return payloads
+
+
+pg_listener = PgListener(f"{settings.POSTGRES_SYNC_PREFIX}{settings.POSTGRES_URI}")
@@ -1,13 +1,18 @@
-import asyncio
 import logging
 from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
 from fastapi import HTTPException, Request, status
 from sqlalchemy import delete, select
 from sqlalchemy.exc import IntegrityError
 
+from surr.app.core.jobs import job_queue
+from surr.app.core.tracing import traced
 from surr.app.models.rate_limit import RateLimit
-from surr.database import AsyncSessionLocal, SessionFactory
+from surr.database import SessionFactory
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +22,7 @@ class DatabaseRateLimiter:
         self.requests = requests
         self.window = window
 
+    @traced("DatabaseRateLimiter")
     async def __call__(self, request: Request, session_factory: SessionFactory):
         client_ip = request.client.host if request.client else "127.0.0.1"
         key = f"{request.url.path}:{client_ip}"
@@ -68,16 +74,11 @@ class DatabaseRateLimiter:
                 return
 
 
-async def delete_expired_rate_limits() -> None:
-    """Background task to cleanup expired rate limit rows."""
-    while True:
-        try:
-            await asyncio.sleep(600)
-
-            async with AsyncSessionLocal() as db, db.begin():
-                stmt = delete(RateLimit).where(RateLimit.reset_at < datetime.now(UTC))
-                await db.execute(stmt)
-
-        except Exception:
-            logger.exception("Error cleaning rate limits")
-            await asyncio.sleep(60)
+@job_queue.periodic("rate_limits.delete_expired", interval=600)
+async def delete_expired_rate_limits(
+    session_factory: async_sessionmaker, _payload: dict[str, Any]
+) -> None:
+    """Delete rate limit rows whose window has passed."""
+    async with session_factory() as db, db.begin():
+        stmt = delete(RateLimit).where(RateLimit.reset_at < datetime.now(UTC))
+        await db.execute(stmt)
@@ -0,0 +1,476 @@
+import asyncio
+import bisect
+import logging
+from dataclasses import dataclass, field
+from itertools import batched
+from typing import TYPE_CHECKING
+
+from sqlalchemy import BigInteger, Integer, column, func, select, true, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+
+from surr.app.core.cache import TTLCache
+from surr.app.core.config import settings
+from surr.app.core.metrics import registry
+from surr.app.core.pubsub import notify, pack_payloads, pg_listener
+from surr.app.models.channel import Channel
+from surr.app.models.message import Message
+from surr.app.models.read_state import ReadState
+from surr.app.models.user import User
+from surr.database import AsyncSessionLocal
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+    from sqlalchemy.dialects.postgresql import Insert
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel carrying new message ids and flushed read markers.
+READ_STATE_CHANNEL = "surr_read_state"
+
+# Rows per upsert statement when flushing.
+FLUSH_BATCH_SIZE = 1000
+# Flushes a marker may fail before it is dropped.
+MAX_FLUSH_ATTEMPTS = 3
+
+READ_STATE_PENDING = registry.gauge(
+    "surr_read_state_pending", "Read markers waiting to be flushed."
+)
+READ_STATE_FLUSHED = registry.counter(
+    "surr_read_state_flushed_total", "Read markers written to the database."
+)
+READ_STATE_FLUSH_ERRORS = registry.counter(
+    "surr_read_state_flush_errors_total", "Read-state flushes that failed."
+)
+READ_STATE_DROPPED = registry.counter(
+    "surr_read_state_dropped_total",
+    "Read markers dropped after failing to flush repeatedly.",
+)
+
+
+@dataclass(slots=True)
+class ChannelHead:
+    """The newest message ids of a channel, oldest first.
+
+    ``complete`` is false once older messages have been cut off, in which
+    case a reader behind the oldest id has at least ``len(ids)`` unread.
+    """
+
+    ids: list[int] = field(default_factory=list)
+    complete: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class UnreadState:
+    last_read_message_id: int
+    unread: int
+    truncated: bool
+
+
+@dataclass(slots=True)
+class _Load[V]:
+    future: asyncio.Future[V | None]
+    # Changes that arrived while the rows were being read, replayed onto the
+    # result so it cannot miss them.
+    updates: list[Callable[[V], None]] = field(default_factory=list)
+
+
+def _fail(future: asyncio.Future, err: BaseException) -> None:
+    if isinstance(err, asyncio.CancelledError):
+        future.cancel()
+        return
+    future.set_exception(err)
+    # Marked retrieved: the loading caller re-raises it already.
+    future.exception()
+
+
+class ReadStateStore:
+    """Write-behind store for per-(user, channel) read markers.
+
+    ``mark_read`` only touches memory: markers are coalesced per key, keeping
+    the highest message id, and written by ``flush`` in batched upserts.
+    Unread counts are computed from cached markers and a cached head of
+    recent message ids per channel, so rendering badges does not query
+    Postgres once both are warm.
+
+    Other workers learn about new messages and flushed markers through
+    NOTIFY. As with the user cache, nothing is cached while the LISTEN
+    connection is down.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, unread_cap: int):
+        self.unread_cap = unread_cap
+        self.markers: TTLCache[int, dict[int, int]] = TTLCache(maxsize, ttl)
+        self.heads: TTLCache[int, ChannelHead] = TTLCache(maxsize, ttl)
+        self.pending: dict[tuple[int, int], int] = {}
+        self._flushing: dict[tuple[int, int], int] = {}
+        # Failed flushes per marker, for markers waiting to be retried.
+        self._attempts: dict[tuple[int, int], int] = {}
+        self.enabled = False
+        self._marker_loads: dict[int, _Load[dict[int, int]]] = {}
+        self._head_loads: dict[int, _Load[ChannelHead]] = {}
+
+    def mark_read(self, user_id: int, channel_id: int, message_id: int) -> None:
+        key = (user_id, channel_id)
+        if message_id <= self.pending.get(key, 0):
+            return
+
+        self.pending[key] = message_id
+        READ_STATE_PENDING.set(len(self.pending))
+        self._apply_marker(user_id, channel_id, message_id)
+
+    def record_message(self, channel_id: int, message_id: int) -> None:
+        def apply(head: ChannelHead) -> None:
+            index = bisect.bisect_left(head.ids, message_id)
+            if index < len(head.ids) and head.ids[index] == message_id:
+                return
+            head.ids.insert(index, message_id)
+            if len(head.ids) > self.unread_cap:
+                del head.ids[0]
+                head.complete = False
+
+        self._update(self.heads, self._head_loads, channel_id, apply)
+
+    def _apply_marker(self, user_id: int, channel_id: int, message_id: int) -> None:
+        def apply(markers: dict[int, int]) -> None:
+            markers[channel_id] = max(markers.get(channel_id, 0), message_id)
+
+        self._update(self.markers, self._marker_loads, user_id, apply)
+
+    @staticmethod
+    def _update[K, V](
+        cache: TTLCache[K, V],
+        loads: dict[K, _Load[V]],
+        key: K,
+        apply: Callable[[V], None],
+    ) -> None:
+        value = cache.get(key)
+        if value is not None:
+            apply(value)
+        elif (load := loads.get(key)) is not None:
+            load.updates.append(apply)
+
+    async def _get_many[K, V](
+        self,
+        cache: TTLCache[K, V],
+        loads: dict[K, _Load[V]],
+        keys: Iterable[K],
+        fetch: Callable[[list[K]], Awaitable[dict[K, V]]],
+    ) -> dict[K, V]:
+        # Looks ``keys`` up in ``cache``, reading every miss in one ``fetch``.
+        # A key already being read by another caller is awaited instead of
+        # read again. Keys ``fetch`` does not return are left out.
+        found: dict[K, V] = {}
+        waiting: dict[K, asyncio.Future[V | None]] = {}
+        missing: list[K] = []
+        for key in dict.fromkeys(keys):
+            if (value := cache.get(key)) is not None:
+                found[key] = value
+            elif (load := loads.get(key)) is not None:
+                waiting[key] = load.future
+            else:
+                missing.append(key)
+
+        if missing:
+            found.update(await self._load(cache, loads, missing, fetch))
+
+        for key, future in waiting.items():
+            value = await asyncio.shield(future)
+            if value is not None:
+                found[key] = value
+        return found
+
+    async def _load[K, V](
+        self,
+        cache: TTLCache[K, V],
+        loads: dict[K, _Load[V]],
+        keys: list[K],
+        fetch: Callable[[list[K]], Awaitable[dict[K, V]]],
+    ) -> dict[K, V]:
+        loop = asyncio.get_running_loop()
+        batch = {key: _Load[V](loop.create_future()) for key in keys}
+        loads.update(batch)
+        try:
+            fetched = await fetch(keys)
+        except BaseException as err:
+            for key, load in batch.items():
+                if loads.get(key) is load:
+                    del loads[key]
+                _fail(load.future, err)
+            raise
+
+        found: dict[K, V] = {}
+        for key, load in batch.items():
+            value = fetched.get(key)
+            if value is not None:
+                for apply in load.updates:
+                    apply(value)
+                found[key] = value
+            if loads.get(key) is load:
+                del loads[key]
+                if value is not None and self.enabled:
+                    cache.set(key, value)
+            load.future.set_result(value)
+        return found
+
+    async def channel_heads(
+        self, session_factory: async_sessionmaker, channel_ids: Iterable[int]
+    ) -> dict[int, ChannelHead]:
+        # Missing channels are left out of the result.
+        async def fetch(ids: list[int]) -> dict[int, ChannelHead]:
+            recent = (
+                select(Message.id)
+                .where(Message.channel_id == Channel.id)
+                .order_by(Message.id.desc())
+                .limit(self.unread_cap + 1)
+                .lateral()
+            )
+            stmt = (
+                select(Channel.id, recent.c.id)
+                .outerjoin(recent, true())
+                .where(Channel.id.in_(ids))
+            )
+            async with session_factory() as db:
+                rows = (await db.execute(stmt)).all()
+
+            heads: dict[int, ChannelHead] = {}
+            for channel_id, message_id in rows:
+                head = heads.setdefault(channel_id, ChannelHead())
+                if message_id is not None:
+                    head.ids.append(message_id)
+            for head in heads.values():
+                head.ids.sort()
+                if len(head.ids) > self.unread_cap:
+                    del head.ids[0]
+                    head.complete = False
+            return heads
+
+        return await self._get_many(self.heads, self._head_loads, channel_ids, fetch)
+
+    async def user_markers(
+        self, session_factory: async_sessionmaker, user_id: int
+    ) -> dict[int, int]:
+        async def fetch(user_ids: list[int]) -> dict[int, dict[int, int]]:
+            stmt = select(
+                ReadState.user_id,
+                ReadState.channel_id,
+                ReadState.last_read_message_id,
+            ).where(ReadState.user_id.in_(user_ids))
+            async with session_factory() as db:
+                rows = (await db.execute(stmt)).all()
+
+            markers: dict[int, dict[int, int]] = {key: {} for key in user_ids}
+            for row_user_id, channel_id, message_id in rows:
+                markers[row_user_id][channel_id] = message_id
+
+            # Markers not yet committed are invisible to the query above.
+            for unflushed in (self._flushing, self.pending):
+                for (mark_user_id, channel_id), message_id in unflushed.items():
+                    if (user_markers := markers.get(mark_user_id)) is not None:
+                        user_markers[channel_id] = max(
+                            user_markers.get(channel_id, 0), message_id
+                        )
+            return markers
+
+        found = await self._get_many(self.markers, self._marker_loads, [user_id], fetch)
+        return found[user_id]
+
+    async def unread_counts(
+        self,
+        session_factory: async_sessionmaker,
+        user_id: int,
+        channel_ids: Iterable[int],
+    ) -> dict[int, UnreadState]:
+        heads = await self.channel_heads(session_factory, channel_ids)
+        markers = await self.user_markers(session_factory, user_id)
+
+        states: dict[int, UnreadState] = {}
+        for channel_id, head in heads.items():
+            last_read = markers.get(channel_id, 0)
+            unread = len(head.ids) - bisect.bisect_right(head.ids, last_read)
+            states[channel_id] = UnreadState(
+                last_read_message_id=last_read,
+                unread=unread,
+                truncated=not head.complete and unread == len(head.ids),
+            )
+        return states
+
+    async def flush(self, session_factory: async_sessionmaker) -> int:
+        # Writes all pending markers. Each chunk is written in its own
+        # savepoint, so a marker the database rejects does not hold back the
+        # rest; it is retried a few times and then dropped. If the
+        # whole flush fails, everything is merged back for the next one.
+        # Returns the number of markers written.
+        if not self.pending:
+            return 0
+
+        batch, self.pending = self.pending, {}
+        self._flushing = batch
+        failed: dict[tuple[int, int], int] = {}
+        try:
+            async with session_factory() as db:
+                # Sorted so concurrent flushes from several workers take row
+                # locks in the same order and cannot deadlock.
+                for chunk in batched(
+                    sorted(batch.items()), FLUSH_BATCH_SIZE, strict=False
+                ):
+                    failed.update(await self._write(db, chunk))
+
+                items = [
+                    f"read:{user_id}:{channel_id}:{message_id}"
+                    for (user_id, channel_id), message_id in batch.items()
+                    if (user_id, channel_id) not in failed
+                ]
+                for payload in pack_payloads(items):
+                    await notify(db, READ_STATE_CHANNEL, payload)
+
+                await db.commit()
+
+        except BaseException:
+            READ_STATE_FLUSH_ERRORS.inc()
+            self._requeue(batch)
+            raise
+
+        finally:
+            self._flushing = {}
+            READ_STATE_PENDING.set(len(self.pending))
+
+        for key in batch.keys() - failed.keys():
+            self._attempts.pop(key, None)
+        if failed:
+            READ_STATE_FLUSH_ERRORS.inc()
+            self._retry(failed)
+            READ_STATE_PENDING.set(len(self.pending))
+
+        written = len(batch) - len(failed)
+        READ_STATE_FLUSHED.inc(written)
+        return written
+
+    async def _write(
+        self, db: AsyncSession, chunk: tuple[tuple[tuple[int, int], int], ...]
+    ) -> dict[tuple[int, int], int]:
+        # Upserts ``chunk`` in a savepoint. If the database rejects it, the
+        # markers are written one by one to find the bad ones, which are
+        # returned.
+        try:
+            async with db.begin_nested():
+                await db.execute(self._upsert(chunk))
+        except DBAPIError:
+            if len(chunk) == 1:
+                logger.exception("Error writing read marker %s", chunk[0])
+                return dict(chunk)
+        else:
+            return {}
+
+        failed: dict[tuple[int, int], int] = {}
+        for marker in chunk:
+            failed.update(await self._write(db, (marker,)))
+        return failed
+
+    def _requeue(self, markers: dict[tuple[int, int], int]) -> None:
+        for key, message_id in markers.items():
+            self.pending[key] = max(self.pending.get(key, 0), message_id)
+
+    def _retry(self, failed: dict[tuple[int, int], int]) -> None:
+        # Requeues markers the database rejected, dropping those that have
+        # failed too often so one bad marker cannot block every flush.
+        for key, message_id in failed.items():
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts >= MAX_FLUSH_ATTEMPTS:
+                self._attempts.pop(key, None)
+                READ_STATE_DROPPED.inc()
+                logger.warning("Dropping read marker %s -> %d", key, message_id)
+            else:
+                self._attempts[key] = attempts
+                self._requeue({key: message_id})
+
+    @staticmethod
+    def _upsert(chunk: tuple[tuple[tuple[int, int], int], ...]) -> Insert:
+        rows = values(
+            column("user_id", Integer),
+            column("channel_id", Integer),
+            column("message_id", BigInteger),
+            name="marks",
+        ).data(
+            [
+                (user_id, channel_id, message_id)
+                for (user_id, channel_id), message_id in chunk
+            ]
+        )
+
+        # Joining users and channels drops markers for rows deleted since
+        # they were recorded instead of failing the whole batch on the FK.
+        source = (
+            select(rows.c.user_id, rows.c.channel_id, rows.c.message_id)
+            .join(User, User.id == rows.c.user_id)
+            .join(Channel, Channel.id == rows.c.channel_id)
+            # Without a WHERE, Postgres would parse ON CONFLICT as a join
+            # condition.
+            .where(true())
+        )
+        stmt = insert(ReadState).from_select(
+            ["user_id", "channel_id", "last_read_message_id"], source
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[ReadState.user_id, ReadState.channel_id],
+            set_={
+                "last_read_message_id": func.greatest(
+                    ReadState.last_read_message_id,
+                    stmt.excluded.last_read_message_id,
+                ),
+                "updated_at": func.now(),
+            },
+        )
+
+    def handle_notification(self, payload: str) -> None:
+        for item in payload.split(";"):
+            kind, *ids = item.split(":")
+            if kind == "message":
+                channel_id, message_id = map(int, ids)
+                self.record_message(channel_id, message_id)
+            elif kind == "read":
+                user_id, channel_id, message_id = map(int, ids)
+                self._apply_marker(user_id, channel_id, message_id)
+
+    def clear(self) -> None:
+        self.markers.clear()
+        self.heads.clear()
+        # In-flight loads may already have missed a notification.
+        self._marker_loads.clear()
+        self._head_loads.clear()
+
+    def set_listening(self, listening: bool) -> None:  # noqa: FBT001
+        self.clear()
+        self.enabled = listening
+
+
+read_state_store = ReadStateStore(
+    maxsize=settings.READ_STATE_CACHE_MAXSIZE,
+    ttl=settings.READ_STATE_CACHE_TTL_SECONDS,
+    unread_cap=settings.READ_STATE_UNREAD_CAP,
+)
+pg_listener.subscribe(READ_STATE_CHANNEL, read_state_store.handle_notification)
+pg_listener.on_connection_change(read_state_store.set_listening)
+
+
+async def notify_message_created(
+    session: AsyncSession, channel_id: int, message_id: int
+) -> None:
+    """Queue a new-message notification, delivered when ``session`` commits."""
+    await notify(session, READ_STATE_CHANNEL, f"message:{channel_id}:{message_id}")
+
+
+async def flush_pending_read_states() -> None:
+    try:
+        await read_state_store.flush(AsyncSessionLocal)
+    except Exception:
+        logger.exception("Error flushing read states")
+
+
+async def flush_read_states() -> None:
+    """Background task writing coalesced read markers."""
+    while True:
+        await asyncio.sleep(settings.READ_STATE_FLUSH_INTERVAL_SECONDS)
+        await flush_pending_read_states()
@@ -10,6 +10,8 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from surr.app.core.config import settings
+from surr.app.core.tracing import span
+from surr.app.core.user_cache import notify_token_revoked
 from surr.app.models.token_blacklist import TokenBlacklist
 
 password_hash = PasswordHash.recommended()
@@ -32,11 +34,13 @@ class TokenData(BaseModel):
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return password_hash.verify(plain_password, hashed_password)
+    with span("security.verify_password"):
+        return password_hash.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return password_hash.hash(password)
+    with span("security.get_password_hash"):
+        return password_hash.hash(password)
 
 
 def create_token(
@@ -60,7 +64,8 @@ def create_token(
 
     to_encode.update({"exp": expire, "token_type": token_type.value})
 
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    with span("jwt.encode"):
+        return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
 async def blacklist_token(token: str, session: AsyncSession) -> None:
@@ -76,6 +81,7 @@ async def blacklist_token(token: str, session: AsyncSession) -> None:
 
     expires_at = datetime.fromtimestamp(exp, UTC)
     await TokenBlacklist.create(session, token=token, expires_at=expires_at)
+    await notify_token_revoked(session, token)
     await session.commit()
 
 
@@ -91,7 +97,8 @@ async def blacklist_tokens(
 
 def verify_token(token: str, expected_token_type: TokenType) -> TokenData | None:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        with span("jwt.decode"):
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str | None = payload.get("sub")
         token_type: str | None = payload.get("token_type")
 
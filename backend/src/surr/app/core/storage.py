@@ -0,0 +1,96 @@
+import asyncio
+import hashlib
+import secrets
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from surr.app.core.config import settings
+from surr.app.exceptions.attachment import AttachmentTooLargeError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from io import BufferedWriter
+
+# Request chunks are small (~64 KiB); coalescing them keeps the number of
+# thread hops per upload low without holding more than this in memory.
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class StoredBlob:
+    sha256: str
+    size: int
+    created: bool
+
+
+class BlobStorage:
+    """Content-addressed file store: blobs live at ``objects/ab/cd/<sha256>``."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.tmp = self.root / "tmp"
+
+    def path_for(self, sha256: str) -> Path:
+        return self.objects / sha256[:2] / sha256[2:4] / sha256
+
+    async def store(self, chunks: AsyncIterator[bytes], max_size: int) -> StoredBlob:
+        # Streams ``chunks`` to disk while hashing them, raising
+        # AttachmentTooLargeError once more than ``max_size`` bytes arrive.
+        await asyncio.to_thread(self.tmp.mkdir, parents=True, exist_ok=True)
+        tmp_path = self.tmp / secrets.token_hex(16)
+        digest = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+
+        file = await asyncio.to_thread(self._open, tmp_path)
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_size:
+                    msg = f"Attachment exceeds {max_size} bytes"
+                    raise AttachmentTooLargeError(msg)
+
+                digest.update(chunk)
+                buffer += chunk
+                if len(buffer) >= WRITE_BUFFER_SIZE:
+                    await asyncio.to_thread(file.write, bytes(buffer))
+                    buffer.clear()
+
+            if buffer:
+                await asyncio.to_thread(file.write, bytes(buffer))
+            await asyncio.to_thread(file.close)
+
+            sha256 = digest.hexdigest()
+            created = await asyncio.to_thread(self._commit, tmp_path, sha256)
+        finally:
+            if not file.closed:
+                await asyncio.to_thread(file.close)
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+
+        return StoredBlob(sha256=sha256, size=size, created=created)
+
+    async def exists(self, sha256: str) -> bool:
+        return await asyncio.to_thread(self.path_for(sha256).exists)
+
+    async def remove(self, sha256: str) -> None:
+        await asyncio.to_thread(self.path_for(sha256).unlink, missing_ok=True)
+
+    @staticmethod
+    def _open(path: Path) -> BufferedWriter:
+        return path.open("wb")
+
+    def _commit(self, tmp_path: Path, sha256: str) -> bool:
+        final_path = self.path_for(sha256)
+        if final_path.exists():
+            return False
+
+        final_path.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic on the same filesystem; a concurrent upload of the same
+        # content simply replaces an identical file.
+        tmp_path.replace(final_path)
+        return True
+
+
+blob_storage = BlobStorage(settings.ATTACHMENTS_DIR)
@@ -0,0 +1,468 @@
+import asyncio
+import functools
+import json
+import logging
+import random
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from itertools import starmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+import httpx
+from sqlalchemy import event
+
+from surr.app.core.config import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator, Sequence
+
+    from sqlalchemy.engine import (
+        Connection,
+        Engine,
+        ExceptionContext,
+        ExecutionContext,
+    )
+    from sqlalchemy.engine.interfaces import DBAPICursor
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+type AttributeValue = str | int | float | bool | None
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Span | None] = ContextVar("surr_current_span", default=None)
+
+# Longest SQL statement text kept on a span.
+MAX_STATEMENT_LENGTH = 512
+TRACEPARENT_PARTS = 4
+
+
+class Span:
+    __slots__ = (
+        "attributes",
+        "end_ns",
+        "error",
+        "name",
+        "parent_id",
+        "span_id",
+        "start_ns",
+        "trace",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace: Trace,
+        parent_id: str | None,
+        attributes: dict[str, AttributeValue],
+    ):
+        self.name = name
+        self.trace = trace
+        self.parent_id = parent_id
+        self.span_id = secrets.token_hex(8)
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1_000_000
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self.attributes[key] = value
+
+    def end(self, error: BaseException | None = None) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self.trace.spans.append(self)
+
+    def child(self, name: str, attributes: dict[str, AttributeValue]) -> Span:
+        return Span(name, self.trace, self.span_id, attributes)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    __slots__ = ("spans", "trace_id")
+
+    def __init__(self, trace_id: str | None = None):
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.spans: list[Span] = []
+
+
+class _SpanScope:
+    """Context manager making a child of the current span the current span."""
+
+    __slots__ = ("attributes", "name", "span", "token")
+
+    def __init__(self, name: str, attributes: dict[str, AttributeValue]):
+        self.name = name
+        self.attributes = attributes
+        self.span: Span | None = None
+        self.token: Token[Span | None] | None = None
+
+    def __enter__(self) -> Span | None:
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        self.span = parent.child(self.name, self.attributes)
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, _exc_type: object, exc: BaseException | None, _tb: object):
+        if self.span is not None and self.token is not None:
+            self.span.end(exc)
+            _current_span.reset(self.token)
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *_: object) -> None:
+        return None
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+def span(name: str, **attributes: AttributeValue) -> _SpanScope | _NoopScope:
+    # Outside a sampled request this costs one context variable lookup.
+    if _current_span.get() is None:
+        return _NOOP_SCOPE
+    return _SpanScope(name, attributes)
+
+
+def start_span(name: str, **attributes: AttributeValue) -> Span | None:
+    # Leaf span that is not made current; the caller must end it.
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return parent.child(name, attributes)
+
+
+class _Traced(Protocol):
+    def __call__[**P, R](
+        self, func: Callable[P, Awaitable[R]], /
+    ) -> Callable[P, Awaitable[R]]: ...
+
+
+def traced(name: str | None = None) -> _Traced:
+    # Wraps a coroutine function in a span named after it.
+
+    def decorator[**P, R](
+        func: Callable[P, Awaitable[R]],
+    ) -> Callable[P, Awaitable[R]]:
+        span_name = name or getattr(func, "__qualname__", repr(func))
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(span_name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+    async def shutdown(self) -> None: ...
+
+
+class JsonlSpanExporter:
+    """Appends one JSON object per finished span to a local file.
+
+    Spans are buffered and written from a worker thread, one write per
+    burst, so requests never wait on disk I/O.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._buffer: list[str] = []
+        self._writer: asyncio.Task[None] | None = None
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self._buffer.extend(
+            json.dumps(span.to_json(), default=str) + "\n" for span in spans
+        )
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while self._buffer:
+            lines, self._buffer = "".join(self._buffer), []
+            try:
+                await asyncio.to_thread(self._append, lines)
+            except OSError:
+                logger.exception("Failed to write spans to %s", self.path)
+
+    def _append(self, lines: str) -> None:
+        with self.path.open("a", encoding="utf-8") as file:
+            file.write(lines)
+
+    async def shutdown(self) -> None:
+        if self._writer is not None:
+            await self._writer
+        await self._drain()
+
+
+class OtlpHttpSpanExporter:
+    """Posts spans as OTLP/JSON to a collector, e.g. ``/v1/traces``."""
+
+    def __init__(self, endpoint: str, service_name: str = "surr"):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._client = httpx.AsyncClient(timeout=5)
+        self._pending: set[asyncio.Task[None]] = set()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        task = asyncio.get_running_loop().create_task(self._send(self._encode(spans)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _send(self, payload: dict[str, Any]) -> None:
+        try:
+            response = await self._client.post(self.endpoint, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            logger.exception("Failed to export spans to %s", self.endpoint)
+
+    def _encode(self, spans: Sequence[Span]) -> dict[str, Any]:
+        def attribute(key: str, value: AttributeValue) -> dict[str, Any]:
+            if isinstance(value, bool):
+                return {"key": key, "value": {"boolValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [attribute("service.name", self.service_name)]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [
+                                {
+                                    "traceId": span.trace.trace_id,
+                                    "spanId": span.span_id,
+                                    "parentSpanId": span.parent_id or "",
+                                    "name": span.name,
+                                    "startTimeUnixNano": str(span.start_ns),
+                                    "endTimeUnixNano": str(span.end_ns),
+                                    "attributes": list(
+                                        starmap(attribute, span.attributes.items())
+                                    ),
+                                    "status": {"code": 2, "message": span.error}
+                                    if span.error
+                                    else {"code": 1},
+                                }
+                                for span in spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    async def shutdown(self) -> None:
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self._client.aclose()
+
+
+class Tracer:
+    def __init__(self, sample_rate: float, exporter: SpanExporter | None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 and self.exporter is not None
+
+    def should_sample(self, traceparent: str | None = None) -> bool:
+        if not self.enabled:
+            return False
+        # Honour an upstream W3C ``traceparent`` whose sampled flag is set.
+        if traceparent and traceparent.endswith("-01"):
+            return True
+        return random.random() < self.sample_rate  # noqa: S311
+
+    @staticmethod
+    def start_trace(
+        name: str,
+        attributes: dict[str, AttributeValue] | None = None,
+        traceparent: str | None = None,
+    ) -> Span:
+        # W3C format: version-trace_id-parent_id-flags
+        parts = traceparent.split("-") if traceparent else []
+        if len(parts) == TRACEPARENT_PARTS:
+            trace_id, parent_id = parts[1], parts[2]
+        else:
+            trace_id, parent_id = None, None
+        return Span(name, Trace(trace_id), parent_id, attributes or {})
+
+    def finish_trace(self, root: Span) -> None:
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.export(root.trace.spans)
+        except Exception:
+            logger.exception("Failed to export trace %s", root.trace.trace_id)
+
+    @contextmanager
+    def trace(self, name: str, **attributes: AttributeValue) -> Iterator[Span | None]:
+        # Sampled root span for work outside a request, such as a job.
+        if not self.should_sample():
+            yield None
+            return
+
+        root = self.start_trace(name, attributes)
+        token = _current_span.set(root)
+        error: BaseException | None = None
+        try:
+            yield root
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            _current_span.reset(token)
+            root.end(error)
+            self.finish_trace(root)
+
+    async def shutdown(self) -> None:
+        if self.exporter is not None:
+            await self.exporter.shutdown()
+
+
+def build_exporter() -> SpanExporter | None:
+    if settings.TRACING_EXPORTER == "jsonl":
+        return JsonlSpanExporter(settings.TRACING_JSONL_PATH)
+    if settings.TRACING_EXPORTER == "otlp":
+        return OtlpHttpSpanExporter(settings.TRACING_OTLP_ENDPOINT)
+    return None
+
+
+tracer = Tracer(sample_rate=settings.TRACING_SAMPLE_RATE, exporter=build_exporter())
+
+
+class TracingMiddleware:
+    """Starts a root span per sampled HTTP request."""
+
+    def __init__(self, app: ASGIApp, tracer: Tracer = tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for key, value in scope["headers"]:
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        if not self.tracer.should_sample(traceparent):
+            await self.app(scope, receive, send)
+            return
+
+        root = self.tracer.start_trace(
+            f"{scope['method']} {scope['path']}",
+            {"http.method": scope["method"], "http.target": scope["path"]},
+            traceparent=traceparent,
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+            await send(message)
+
+        token = _current_span.set(root)
+        error: BaseException | None = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            _current_span.reset(token)
+            route = scope.get("route")
+            if route is not None and hasattr(route, "path"):
+                root.name = f"{scope['method']} {route.path}"
+                root.set_attribute("http.route", route.path)
+            root.end(error)
+            self.tracer.finish_trace(root)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record a span for every SQL statement executed through ``engine``."""
+
+    # A connection runs one statement at a time, so its info dict can carry
+    # the open span from "before" to "after".
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn: Connection,
+        _cursor: DBAPICursor,
+        statement: str,
+        _parameters: object,
+        _context: ExecutionContext | None,
+        executemany: bool,  # noqa: FBT001
+    ) -> None:
+        db_span = start_span(
+            "db.query",
+            **{
+                "db.statement": statement[:MAX_STATEMENT_LENGTH],
+                "db.executemany": executemany,
+            },
+        )
+        if db_span is not None:
+            conn.info["surr_span"] = db_span
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(
+        conn: Connection,
+        cursor: DBAPICursor,
+        _statement: str,
+        _parameters: object,
+        _context: ExecutionContext | None,
+        _executemany: bool,  # noqa: FBT001
+    ) -> None:
+        db_span: Span | None = conn.info.pop("surr_span", None)
+        if db_span is not None:
+            db_span.set_attribute("db.rowcount", cursor.rowcount)
+            db_span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context: ExceptionContext) -> None:
+        conn = exception_context.connection
+        db_span: Span | None = conn.info.pop("surr_span", None) if conn else None
+        if db_span is not None:
+            db_span.end(exception_context.original_exception)
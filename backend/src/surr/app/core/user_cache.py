@@ -0,0 +1,110 @@
+import hashlib
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from surr.app.core.cache import TTLCache
+from surr.app.core.config import settings
+from surr.app.core.pubsub import notify, pg_listener
+from surr.app.schema.user import UserRecord
+
+# Postgres channel used to invalidate identity caches in every worker.
+USER_CACHE_CHANNEL = "surr_user_cache"
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class UserCache:
+    """Per-process cache of resolved identities.
+
+    ``tokens`` remembers access tokens that were checked against the
+    blacklist, ``users`` holds the slim record for each username and
+    ``records`` the same records by id, for the user loader. The
+    cache only serves hits while ``enabled``, i.e. while the LISTEN
+    connection is up, so a missed invalidation can never be served.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.users: TTLCache[str, UserRecord] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.tokens: TTLCache[str, str] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.records: TTLCache[int, UserRecord] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.generation = 0
+        self.enabled = False
+
+    def get(self, token: str) -> UserRecord | None:
+        if not self.enabled:
+            return None
+
+        username = self.tokens.get(token_digest(token))
+        if username is None:
+            return None
+        return self.users.get(username)
+
+    def store(self, token: str, user: UserRecord, generation: int) -> None:
+        # An invalidation that arrived while the caller was reading from the
+        # database makes its result suspect, so it is dropped.
+        if not self.enabled or generation != self.generation:
+            return
+        self.tokens.set(token_digest(token), user.username)
+        self.users.set(user.username, user)
+
+    def store_records(self, records: list[UserRecord], generation: int) -> None:
+        if not self.enabled or generation != self.generation:
+            return
+        for record in records:
+            self.records.set(record.id, record)
+
+    def invalidate_user(self, username: str, user_id: int) -> None:
+        self.generation += 1
+        self.users.pop(username)
+        self.records.pop(user_id)
+
+    def invalidate_token(self, digest: str) -> None:
+        self.generation += 1
+        self.tokens.pop(digest)
+
+    def handle_notification(self, payload: str) -> None:
+        kind, _, key = payload.partition(":")
+        # Usernames may contain colons, so the user id comes last.
+        username, _, user_id = key.rpartition(":")
+        if kind == "user" and user_id.isdigit():
+            self.invalidate_user(username, int(user_id))
+        elif kind == "token":
+            self.invalidate_token(key)
+        else:
+            self.clear()
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.users.clear()
+        self.tokens.clear()
+        self.records.clear()
+
+    def set_listening(self, listening: bool) -> None:  # noqa: FBT001
+        # Anything cached across a LISTEN reconnect may have missed an
+        # invalidation.
+        self.clear()
+        self.enabled = listening
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+pg_listener.subscribe(USER_CACHE_CHANNEL, user_cache.handle_notification)
+pg_listener.on_connection_change(user_cache.set_listening)
+
+
+async def notify_user_changed(
+    session: AsyncSession, username: str, user_id: int
+) -> None:
+    """Queue a cross-worker invalidation, delivered when ``session`` commits."""
+    user_cache.invalidate_user(username, user_id)
+    await notify(session, USER_CACHE_CHANNEL, f"user:{username}:{user_id}")
+
+
+async def notify_token_revoked(session: AsyncSession, token: str) -> None:
+    """Queue a cross-worker invalidation, delivered when ``session`` commits."""
+    digest = token_digest(token)
+    user_cache.invalidate_token(digest)
+    await notify(session, USER_CACHE_CHANNEL, f"token:{digest}")
@@ -0,0 +1,140 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from surr.app.core.config import settings
+from surr.app.core.metrics import registry
+from surr.app.core.user_cache import UserCache, user_cache
+from surr.app.models.user import User
+from surr.app.schema.user import UserRecord
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from surr.database import SessionOpener
+
+USER_LOADER_BATCHES = registry.counter(
+    "surr_user_loader_batches_total", "Queries issued by the user loader."
+)
+USER_LOADER_IDS = registry.counter(
+    "surr_user_loader_ids_total", "User ids resolved by those queries."
+)
+
+
+@dataclass
+class _Batch:
+    futures: dict[int, asyncio.Future[UserRecord | None]] = field(default_factory=dict)
+    handle: asyncio.TimerHandle | None = None
+
+
+class UserLoader:
+    """Coalesces user lookups into one query per batch.
+
+    Ids requested within ``window`` seconds of each other, from any number
+    of requests, are resolved together with a single ``id = ANY(:ids)``
+    query; a batch is sent early once it holds ``max_batch`` ids. Records
+    in the user cache are answered without joining a batch at all.
+    """
+
+    def __init__(self, cache: UserCache, window: float, max_batch: int):
+        self.cache = cache
+        self.window = window
+        self.max_batch = max_batch
+        # Open batches, one per session factory.
+        self._batches: dict[SessionOpener, _Batch] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load_many(
+        self, session_factory: SessionOpener, user_ids: Iterable[int]
+    ) -> dict[int, UserRecord]:
+        # Records of the ``user_ids`` that exist.
+        found: dict[int, UserRecord] = {}
+        waiting: dict[int, asyncio.Future[UserRecord | None]] = {}
+        for user_id in dict.fromkeys(user_ids):
+            if self.cache.enabled and (record := self.cache.records.get(user_id)):
+                found[user_id] = record
+            else:
+                waiting[user_id] = self._enqueue(session_factory, user_id)
+
+        if waiting:
+            # Shielded so one cancelled caller does not fail the whole batch.
+            results = await asyncio.shield(asyncio.gather(*waiting.values()))
+            found.update(
+                (user_id, record)
+                for user_id, record in zip(waiting, results, strict=True)
+                if record is not None
+            )
+        return found
+
+    async def load(
+        self, session_factory: SessionOpener, user_id: int
+    ) -> UserRecord | None:
+        return (await self.load_many(session_factory, [user_id])).get(user_id)
+
+    def _enqueue(
+        self, session_factory: SessionOpener, user_id: int
+    ) -> asyncio.Future[UserRecord | None]:
+        batch = self._batches.get(session_factory)
+        if batch is None:
+            batch = self._batches[session_factory] = _Batch()
+            batch.handle = asyncio.get_running_loop().call_later(
+                self.window, self._dispatch, session_factory
+            )
+
+        future = batch.futures.get(user_id)
+        if future is None:
+            future = batch.futures[user_id] = asyncio.get_running_loop().create_future()
+            if len(batch.futures) >= self.max_batch:
+                self._dispatch(session_factory)
+        return future
+
+    def _dispatch(self, session_factory: SessionOpener) -> None:
+        batch = self._batches.pop(session_factory, None)
+        if batch is None:
+            return
+        if batch.handle is not None:
+            batch.handle.cancel()
+        task = asyncio.create_task(self._resolve(session_factory, batch.futures))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(
+        self,
+        session_factory: SessionOpener,
+        futures: dict[int, asyncio.Future[UserRecord | None]],
+    ) -> None:
+        generation = self.cache.generation
+        try:
+            async with session_factory() as db:
+                rows = await User.read_many_slim(db, list(futures))
+        except asyncio.CancelledError:
+            for future in futures.values():
+                future.cancel()
+            raise
+        except Exception as err:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(err)
+                    # Marked retrieved: callers that are still waiting
+                    # re-raise it anyway.
+                    future.exception()
+            return
+
+        USER_LOADER_BATCHES.inc()
+        USER_LOADER_IDS.inc(len(futures))
+        records = [
+            UserRecord(id=user_id, username=username) for user_id, username in rows
+        ]
+        self.cache.store_records(records, generation)
+
+        by_id = {record.id: record for record in records}
+        for user_id, future in futures.items():
+            if not future.done():
+                future.set_result(by_id.get(user_id))
+
+
+user_loader = UserLoader(
+    user_cache,
+    window=settings.USER_LOADER_WINDOW_SECONDS,
+    max_batch=settings.USER_LOADER_MAX_BATCH,
+)
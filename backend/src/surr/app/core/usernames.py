@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import logging
+import math
+import unicodedata
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, select
+
+from surr.app.core.config import settings
+from surr.app.core.metrics import registry
+from surr.app.core.pubsub import notify, pg_listener
+from surr.app.models.user import User
+from surr.database import AsyncSessionLocal
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel carrying usernames registered by any worker.
+USERNAMES_CHANNEL = "surr_usernames"
+
+USERNAME_CHECKS = registry.counter(
+    "surr_username_checks_total",
+    "Username lookups, by whether the filter alone answered them.",
+    ["result"],
+)
+
+
+def normalize_username(username: str) -> str:
+    return unicodedata.normalize("NFKC", username).casefold()
+
+
+class BloomFilter:
+    """Set membership with no false negatives and a bounded false positive rate.
+
+    Sized for ``capacity`` items at ``error_rate``; adding more still works
+    but the false positive rate climbs.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing: k positions from two independent 64-bit hashes.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class UsernameFilter:
+    """In-memory filter of every registered username, normalized.
+
+    A miss proves a username is free without touching the database; a hit
+    may be a false positive (or a name differing only in case) and is
+    confirmed with an exact lookup. The filter is rebuilt from ``users``
+    whenever the LISTEN connection comes up, since signups announced while
+    it was down are lost, and the database answers every check until the
+    rebuild is done.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom: BloomFilter | None = None
+        # Names announced while a rebuild is reading ``users``.
+        self._loading: list[str] | None = None
+        self._reload: asyncio.Task[None] | None = None
+
+    def add(self, username: str) -> None:
+        normalized = normalize_username(username)
+        if self.bloom is not None:
+            self.bloom.add(normalized)
+        if self._loading is not None:
+            self._loading.append(normalized)
+
+    async def register(self, session: AsyncSession, username: str) -> None:
+        """Announce a new username to every worker once ``session`` commits."""
+        self.add(username)
+        await notify(session, USERNAMES_CHANNEL, username)
+
+    def might_exist(self, username: str) -> bool:
+        if self.bloom is None:
+            return True
+        return normalize_username(username) in self.bloom
+
+    async def is_taken(
+        self, session_factory: async_sessionmaker, username: str
+    ) -> bool:
+        if not self.might_exist(username):
+            USERNAME_CHECKS.inc(result="filtered")
+            return False
+
+        async with session_factory() as db:
+            taken = await User.username_exists(db, username)
+        USERNAME_CHECKS.inc(result="taken" if taken else "false_positive")
+        return taken
+
+    async def load(self, session_factory: async_sessionmaker) -> None:
+        self._loading = []
+        try:
+            async with session_factory() as db:
+                count = await db.scalar(select(func.count()).select_from(User)) or 0
+                # Room to grow before the false positive rate degrades.
+                bloom = BloomFilter(max(self.capacity, 2 * count), self.error_rate)
+                usernames = await db.stream_scalars(
+                    select(User.username).execution_options(yield_per=10_000)
+                )
+                async for username in usernames:
+                    bloom.add(normalize_username(username))
+
+            for normalized in self._loading:
+                bloom.add(normalized)
+            self.bloom = bloom
+            logger.info("Loaded %d usernames into the username filter", count)
+        finally:
+            self._loading = None
+
+    async def _load_logged(self, session_factory: async_sessionmaker) -> None:
+        try:
+            await self.load(session_factory)
+        except Exception:
+            logger.exception("Error loading the username filter")
+
+    def set_listening(self, listening: bool) -> None:  # noqa: FBT001
+        self.bloom = None
+        if self._reload is not None:
+            self._reload.cancel()
+            self._reload = None
+        if listening:
+            self._reload = asyncio.create_task(self._load_logged(AsyncSessionLocal))
+
+
+username_filter = UsernameFilter(
+    capacity=settings.USERNAME_FILTER_CAPACITY,
+    error_rate=settings.USERNAME_FILTER_ERROR_RATE,
+)
+pg_listener.subscribe(USERNAMES_CHANNEL, username_filter.add)
+pg_listener.on_connection_change(username_filter.set_listening)
@@ -0,0 +1,251 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import func, select
+
+from surr.app.core.config import settings
+from surr.app.core.jobs import job_queue
+from surr.app.core.metrics import registry
+from surr.app.models.voice_presence import VoicePresence
+from surr.app.models.voice_stats import VoiceHourStats, VoiceMinuteStats, VoiceStats
+from surr.database import AsyncSessionLocal
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from surr.database import SessionOpener
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock serializing rollup writes across workers, so each flush
+# starts from the head counts the previous one left behind.
+ROLLUP_LOCK_KEY = 0x766F696365  # "voice"
+
+ROLLUPS: tuple[type[VoiceStats], ...] = (VoiceMinuteStats, VoiceHourStats)
+
+# Flushes a batch may fail before its events are dropped.
+MAX_FLUSH_ATTEMPTS = 3
+
+VOICE_EVENTS = registry.counter(
+    "surr_voice_events_total", "LiveKit webhook events received.", ["event"]
+)
+VOICE_ANALYTICS_PENDING = registry.gauge(
+    "surr_voice_analytics_pending", "Voice events waiting to be rolled up."
+)
+VOICE_ANALYTICS_FLUSH_ERRORS = registry.counter(
+    "surr_voice_analytics_flush_errors_total", "Voice rollup flushes that failed."
+)
+VOICE_EVENTS_DROPPED = registry.counter(
+    "surr_voice_events_dropped_total",
+    "Voice events dropped after failing to flush repeatedly.",
+)
+
+
+class VoiceEventKind(StrEnum):
+    """LiveKit webhook events that feed the rollups."""
+
+    PARTICIPANT_JOINED = "participant_joined"
+    PARTICIPANT_LEFT = "participant_left"
+    TRACK_PUBLISHED = "track_published"
+    ROOM_FINISHED = "room_finished"
+
+
+@dataclass(frozen=True, slots=True)
+class VoiceEvent:
+    id: str
+    kind: VoiceEventKind
+    room: str
+    at: datetime
+    participant_sid: str = ""
+    identity: str = ""
+
+
+def bucket_start(resolution: str, at: datetime) -> datetime:
+    if resolution == "minute":
+        return at.replace(second=0, microsecond=0)
+    return at.replace(minute=0, second=0, microsecond=0)
+
+
+class VoiceRollup:
+    """Rollup rows touched by one flush, keyed by table, room and bucket."""
+
+    def __init__(self) -> None:
+        self.rows: dict[type[VoiceStats], dict[tuple[str, datetime], VoiceStats]] = {
+            rollup: {} for rollup in ROLLUPS
+        }
+
+    def buckets(self, room: str, at: datetime) -> list[VoiceStats]:
+        buckets = []
+        for rollup, rows in self.rows.items():
+            bucket = bucket_start(rollup.resolution, at)
+            row = rows.get((room, bucket))
+            if row is None:
+                row = rows[room, bucket] = rollup(room=room, bucket=bucket)
+            buckets.append(row)
+        return buckets
+
+    async def write(self, session: AsyncSession) -> None:
+        for rollup, rows in self.rows.items():
+            await rollup.upsert(session, rows.values())
+
+
+def replay(
+    event: VoiceEvent,
+    room: dict[str, datetime],
+    rollup: VoiceRollup,
+    identities: dict[tuple[str, str], str],
+) -> None:
+    # Applies ``event`` to ``room``, the join times of everyone in it, and
+    # counts it into its buckets.
+    buckets = rollup.buckets(event.room, event.at)
+    # A leave counts toward the peak of the bucket it happens in.
+    peak = len(room)
+
+    joins = tracks = 0
+    ended: list[datetime] = []
+    match event.kind:
+        case VoiceEventKind.PARTICIPANT_JOINED if event.participant_sid not in room:
+            room[event.participant_sid] = event.at
+            identities[event.room, event.participant_sid] = event.identity
+            joins = 1
+        case VoiceEventKind.PARTICIPANT_LEFT if event.participant_sid in room:
+            ended.append(room.pop(event.participant_sid))
+        case VoiceEventKind.ROOM_FINISHED:
+            ended.extend(room.values())
+            room.clear()
+        case VoiceEventKind.TRACK_PUBLISHED:
+            tracks = 1
+
+    peak = max(peak, len(room))
+    for row in buckets:
+        row.joins += joins
+        row.tracks_published += tracks
+        row.sessions += len(ended)
+        row.session_seconds += sum(
+            (event.at - joined_at).total_seconds() for joined_at in ended
+        )
+        row.peak_participants = max(row.peak_participants, peak)
+        row.closing_participants = len(room)
+
+
+class VoiceAnalytics:
+    """Rolls LiveKit events up into per-minute and per-hour room stats.
+
+    Webhook events are buffered in memory and applied by ``flush`` in one
+    transaction: who is in each room is read from ``voice_presence``, the
+    batch is replayed in order against it, and only the touched buckets
+    are upserted. Raw events are never stored, so the rollups cost the
+    same to query however much history there is. Joins and leaves are
+    matched against ``voice_presence``, which makes redelivered events
+    harmless.
+    """
+
+    def __init__(self) -> None:
+        self.pending: list[VoiceEvent] = []
+        # Consecutive failed flushes of the events at the head of ``pending``.
+        self._failures = 0
+
+    def record(self, event: VoiceEvent) -> None:
+        VOICE_EVENTS.inc(event=event.kind)
+        self.pending.append(event)
+        VOICE_ANALYTICS_PENDING.set(len(self.pending))
+
+    async def flush(self, session_factory: SessionOpener) -> int:
+        # Applies all pending events; on failure they are put back so the
+        # next flush retries them, until ``MAX_FLUSH_ATTEMPTS`` failures in
+        # a row drop them so one bad event cannot stop every later rollup.
+        # Returns the number of events applied.
+        if not self.pending:
+            return 0
+
+        batch, self.pending = self.pending, []
+        try:
+            async with session_factory() as db:
+                await db.execute(select(func.pg_advisory_xact_lock(ROLLUP_LOCK_KEY)))
+                await self._apply(db, batch)
+                await db.commit()
+
+        except BaseException:
+            VOICE_ANALYTICS_FLUSH_ERRORS.inc()
+            self._failures += 1
+            if self._failures >= MAX_FLUSH_ATTEMPTS:
+                self._failures = 0
+                VOICE_EVENTS_DROPPED.inc(len(batch))
+                logger.warning("Dropping %d voice events", len(batch))
+            else:
+                self.pending[:0] = batch
+            raise
+
+        finally:
+            VOICE_ANALYTICS_PENDING.set(len(self.pending))
+
+        self._failures = 0
+        return len(batch)
+
+    @staticmethod
+    async def _apply(session: AsyncSession, batch: list[VoiceEvent]) -> None:
+        # Redeliveries share an id. Stable sort, so events from the same
+        # second keep their arrival order.
+        unique = {event.id or index: event for index, event in enumerate(batch)}
+        events = sorted(unique.values(), key=lambda event: event.at)
+        before = await VoicePresence.read_rooms(session, {e.room for e in events})
+        present = {room: dict(joined) for room, joined in before.items()}
+        identities: dict[tuple[str, str], str] = {}
+        rollup = VoiceRollup()
+        for event in events:
+            replay(event, present[event.room], rollup, identities)
+
+        removed = [
+            (room, sid)
+            for room, joined in before.items()
+            for sid in joined.keys() - present[room].keys()
+        ]
+        added = [
+            VoicePresence(
+                room=room,
+                participant_sid=sid,
+                identity=identities[room, sid],
+                joined_at=joined[sid],
+            )
+            for room, joined in present.items()
+            for sid in joined.keys() - before[room].keys()
+        ]
+        await VoicePresence.remove_many(session, removed)
+        await VoicePresence.add_many(session, added)
+        await rollup.write(session)
+
+
+voice_analytics = VoiceAnalytics()
+
+
+@job_queue.periodic(
+    "voice_analytics.record_occupancy",
+    interval=settings.VOICE_ANALYTICS_OCCUPANCY_INTERVAL_SECONDS,
+)
+async def record_voice_occupancy(
+    session_factory: async_sessionmaker, _payload: dict[str, Any]
+) -> None:
+    """Give occupied rooms a row in the current buckets."""
+    async with session_factory() as db, db.begin():
+        await db.execute(select(func.pg_advisory_xact_lock(ROLLUP_LOCK_KEY)))
+        for rollup in ROLLUPS:
+            await rollup.record_occupancy(db)
+
+
+async def flush_pending_voice_events() -> None:
+    try:
+        await voice_analytics.flush(AsyncSessionLocal)
+    except Exception:
+        logger.exception("Error flushing voice analytics")
+
+
+async def flush_voice_events() -> None:
+    """Background task rolling up buffered voice events."""
+    while True:
+        await asyncio.sleep(settings.VOICE_ANALYTICS_FLUSH_INTERVAL_SECONDS)
+        await flush_pending_voice_events()
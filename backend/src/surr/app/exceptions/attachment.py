@@ -0,0 +1,2 @@
+class AttachmentTooLargeError(Exception):
+    """Raised when an uploaded attachment exceeds the configured size limit."""
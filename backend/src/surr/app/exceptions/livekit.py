@@ -0,0 +1,8 @@
+class LiveKitError(Exception):
+    """Raised when the LiveKit server API returns an error response."""
+
+    def __init__(self, status_code: int, code: str, message: str):
+        super().__init__(f"LiveKit API error {status_code} ({code}): {message}")
+        self.status_code = status_code
+        self.code = code
+        self.message = message
@@ -2,9 +2,39 @@
 Imports all models for Alembic discovery.
 """
 
+from .attachment import Attachment
 from .base import Base
+from .channel import Channel
+from .guild import Guild
+from .guild_member import GuildMember
+from .job import Job
+from .member_role import MemberRole
+from .message import Message
+from .permission_overwrite import PermissionOverwrite
 from .rate_limit import RateLimit
+from .read_state import ReadState
+from .role import Role
 from .token_blacklist import TokenBlacklist
 from .user import User
+from .voice_presence import VoicePresence
+from .voice_stats import VoiceHourStats, VoiceMinuteStats
 
-__all__ = ["Base", "RateLimit", "TokenBlacklist", "User"]
+__all__ = [
+    "Attachment",
+    "Base",
+    "Channel",
+    "Guild",
+    "GuildMember",
+    "Job",
+    "MemberRole",
+    "Message",
+    "PermissionOverwrite",
+    "RateLimit",
+    "ReadState",
+    "Role",
+    "TokenBlacklist",
+    "User",
+    "VoiceHourStats",
+    "VoiceMinuteStats",
+    "VoicePresence",
+]
@@ -0,0 +1,89 @@
+from datetime import datetime  # noqa: TC003
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, String, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class Attachment(Base):
+    """Metadata for an uploaded file.
+
+    File contents live in content-addressed storage keyed by ``sha256``, so
+    several attachments may share one blob on disk.
+    """
+
+    __tablename__ = "attachments"
+
+    id: Mapped[int] = mapped_column(
+        "id",
+        autoincrement=True,
+        nullable=False,
+        unique=True,
+        primary_key=True,
+        init=False,
+    )
+    uploader_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    sha256: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    content_type: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, init=False
+    )
+
+    @classmethod
+    async def read_by_id(
+        cls, session: AsyncSession, attachment_id: int
+    ) -> Attachment | None:
+        stmt = select(cls).where(cls.id == attachment_id)
+        return await session.scalar(stmt)
+
+    @staticmethod
+    async def lock_blob(
+        session: AsyncSession, sha256: str, *, exclusive: bool = False
+    ) -> None:
+        # Transaction-level lock on one blob. Uploads hold it shared while
+        # recording a row for the blob; removing an orphaned blob holds it
+        # exclusively, so a blob is never removed under a new row.
+        lock = (
+            func.pg_advisory_xact_lock
+            if exclusive
+            else func.pg_advisory_xact_lock_shared
+        )
+        await session.execute(select(lock(int(sha256[:15], 16))))
+
+    @classmethod
+    async def blob_in_use(cls, session: AsyncSession, sha256: str) -> bool:
+        stmt = select(cls.id).where(cls.sha256 == sha256).limit(1)
+        return await session.scalar(stmt) is not None
+
+    @classmethod
+    async def create(  # noqa: PLR0913
+        cls,
+        session: AsyncSession,
+        *,
+        uploader_id: int,
+        sha256: str,
+        size: int,
+        filename: str,
+        content_type: str,
+    ) -> Attachment:
+        attachment = cls(
+            uploader_id=uploader_id,
+            sha256=sha256,
+            size=size,
+            filename=filename,
+            content_type=content_type,
+        )
+        session.add(attachment)
+        await session.flush()
+
+        new = await cls.read_by_id(session, attachment.id)
+        if not new:
+            msg = "Attachment creation failed"
+            raise RuntimeError(msg)
+        return new
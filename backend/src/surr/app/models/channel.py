@@ -0,0 +1,184 @@
+from datetime import datetime  # noqa: TC003
+from typing import TYPE_CHECKING
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Select,
+    String,
+    and_,
+    func,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, aliased, mapped_column
+
+from surr.app.core.permissions import Permission
+
+from .base import Base
+from .guild import Guild
+from .guild_member import GuildMember
+from .member_role import MemberRole
+from .permission_overwrite import OverwriteTarget, PermissionOverwrite
+from .role import Role
+
+if TYPE_CHECKING:
+    from sqlalchemy import ColumnElement
+    from sqlalchemy.orm import InstrumentedAttribute
+
+
+class Channel(Base):
+    """ORM model for text channels.
+
+    ``version`` is bumped when existing messages change, and together with
+    the newest message id tags cached message pages.
+    """
+
+    __tablename__ = "channels"
+
+    id: Mapped[int] = mapped_column(
+        "id",
+        autoincrement=True,
+        nullable=False,
+        unique=True,
+        primary_key=True,
+        init=False,
+    )
+    guild_id: Mapped[int] = mapped_column(
+        ForeignKey("guilds.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, init=False
+    )
+    version: Mapped[int] = mapped_column(
+        BigInteger, server_default="0", nullable=False, init=False
+    )
+
+    @classmethod
+    async def read_by_id(cls, session: AsyncSession, channel_id: int) -> Channel | None:
+        stmt = select(cls).where(cls.id == channel_id)
+        return await session.scalar(stmt)
+
+    @classmethod
+    async def list_for_guild(
+        cls, session: AsyncSession, guild_id: int
+    ) -> list[Channel]:
+        stmt = select(cls).where(cls.guild_id == guild_id).order_by(cls.id)
+        return list(await session.scalars(stmt))
+
+    @classmethod
+    def visible_ids(cls, user_id: int) -> Select[tuple[int]]:
+        # Subquery of channel ids ``user_id`` may view, for filtering in SQL.
+        # Mirrors ``channel_permissions`` for the VIEW_CHANNEL bit only.
+        base = (
+            select(
+                GuildMember.guild_id,
+                func.bit_or(Role.permissions).label("permissions"),
+            )
+            .join(Role, Role.guild_id == GuildMember.guild_id)
+            .outerjoin(
+                MemberRole,
+                and_(
+                    MemberRole.guild_id == GuildMember.guild_id,
+                    MemberRole.user_id == GuildMember.user_id,
+                    MemberRole.role_id == Role.id,
+                ),
+            )
+            .where(
+                GuildMember.user_id == user_id,
+                or_(Role.is_default, MemberRole.role_id.is_not(None)),
+            )
+            .group_by(GuildMember.guild_id)
+            .cte("base")
+        )
+
+        everyone_role = aliased(Role)
+        everyone = aliased(PermissionOverwrite)
+        member = aliased(PermissionOverwrite)
+        roles = (
+            select(
+                func.coalesce(func.bit_or(PermissionOverwrite.allow), 0).label("allow"),
+                func.coalesce(func.bit_or(PermissionOverwrite.deny), 0).label("deny"),
+            )
+            .join(
+                MemberRole,
+                and_(
+                    MemberRole.role_id == PermissionOverwrite.target_id,
+                    MemberRole.user_id == user_id,
+                ),
+            )
+            .where(
+                PermissionOverwrite.channel_id == cls.id,
+                PermissionOverwrite.target_type == OverwriteTarget.ROLE,
+            )
+            .lateral("role_overwrites")
+        )
+
+        def apply(
+            permissions: ColumnElement[int],
+            allow: ColumnElement[int] | InstrumentedAttribute[int],
+            deny: ColumnElement[int] | InstrumentedAttribute[int],
+        ) -> ColumnElement[int]:
+            return permissions.bitwise_and(
+                func.coalesce(deny, 0).bitwise_not()
+            ).bitwise_or(func.coalesce(allow, 0))
+
+        permissions = apply(base.c.permissions, everyone.allow, everyone.deny)
+        permissions = apply(permissions, roles.c.allow, roles.c.deny)
+        permissions = apply(permissions, member.allow, member.deny)
+
+        return (
+            select(cls.id)
+            .join(base, base.c.guild_id == cls.guild_id)
+            .join(Guild, Guild.id == cls.guild_id)
+            .join(
+                everyone_role,
+                and_(everyone_role.guild_id == cls.guild_id, everyone_role.is_default),
+            )
+            .outerjoin(
+                everyone,
+                and_(
+                    everyone.channel_id == cls.id,
+                    everyone.target_type == OverwriteTarget.ROLE,
+                    everyone.target_id == everyone_role.id,
+                ),
+            )
+            .join(roles, true())
+            .outerjoin(
+                member,
+                and_(
+                    member.channel_id == cls.id,
+                    member.target_type == OverwriteTarget.MEMBER,
+                    member.target_id == user_id,
+                ),
+            )
+            .where(
+                or_(
+                    Guild.owner_id == user_id,
+                    base.c.permissions.bitwise_and(int(Permission.ADMINISTRATOR)) != 0,
+                    permissions.bitwise_and(int(Permission.VIEW_CHANNEL)) != 0,
+                )
+            )
+        )
+
+    @classmethod
+    async def bump_version(cls, session: AsyncSession, channel_id: int) -> None:
+        stmt = update(cls).where(cls.id == channel_id).values(version=cls.version + 1)
+        await session.execute(stmt)
+
+    @classmethod
+    async def create(cls, session: AsyncSession, guild_id: int, name: str) -> Channel:
+        channel = cls(guild_id=guild_id, name=name)
+        session.add(channel)
+        await session.flush()
+
+        new = await cls.read_by_id(session, channel.id)
+        if not new:
+            msg = "Channel creation failed"
+            raise RuntimeError(msg)
+        return new
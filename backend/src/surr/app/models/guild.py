@@ -0,0 +1,62 @@
+from datetime import datetime  # noqa: TC003
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, String, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class Guild(Base):
+    """ORM model for guilds, which own channels, roles and members.
+
+    ``version`` is bumped by every change to which channels members can
+    see, and tags cached channel lists.
+    """
+
+    __tablename__ = "guilds"
+
+    id: Mapped[int] = mapped_column(
+        "id",
+        autoincrement=True,
+        nullable=False,
+        unique=True,
+        primary_key=True,
+        init=False,
+    )
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, init=False
+    )
+    version: Mapped[int] = mapped_column(
+        BigInteger, server_default="0", nullable=False, init=False
+    )
+
+    @classmethod
+    async def read_by_id(cls, session: AsyncSession, guild_id: int) -> Guild | None:
+        stmt = select(cls).where(cls.id == guild_id)
+        return await session.scalar(stmt)
+
+    @classmethod
+    async def read_version(cls, session: AsyncSession, guild_id: int) -> int | None:
+        return await session.scalar(select(cls.version).where(cls.id == guild_id))
+
+    @classmethod
+    async def bump_version(cls, session: AsyncSession, guild_id: int) -> None:
+        stmt = update(cls).where(cls.id == guild_id).values(version=cls.version + 1)
+        await session.execute(stmt)
+
+    @classmethod
+    async def create(cls, session: AsyncSession, name: str, owner_id: int) -> Guild:
+        guild = cls(name=name, owner_id=owner_id)
+        session.add(guild)
+        await session.flush()
+
+        new = await cls.read_by_id(session, guild.id)
+        if not new:
+            msg = "Guild creation failed"
+            raise RuntimeError(msg)
+        return new
@@ -0,0 +1,40 @@
+from datetime import datetime  # noqa: TC003
+
+from sqlalchemy import DateTime, ForeignKey, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class GuildMember(Base):
+    """Membership of a user in a guild."""
+
+    __tablename__ = "guild_members"
+
+    guild_id: Mapped[int] = mapped_column(
+        ForeignKey("guilds.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    joined_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, init=False
+    )
+
+    @classmethod
+    async def exists(cls, session: AsyncSession, guild_id: int, user_id: int) -> bool:
+        stmt = select(cls.user_id).where(
+            cls.guild_id == guild_id, cls.user_id == user_id
+        )
+        return await session.scalar(stmt) is not None
+
+    @classmethod
+    async def add(cls, session: AsyncSession, guild_id: int, user_id: int) -> None:
+        stmt = (
+            insert(cls)
+            .values(guild_id=guild_id, user_id=user_id)
+            .on_conflict_do_nothing()
+        )
+        await session.execute(stmt)
@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    delete,
+    func,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+if TYPE_CHECKING:
+    from sqlalchemy import Row
+
+
+class Job(Base):
+    """A unit of background work.
+
+    ``run_at`` is when the job may next be claimed. Claiming pushes it
+    forward by the lease, so a job whose worker died is picked up again
+    once the lease runs out. Finished jobs are deleted; jobs out of
+    attempts keep their row with ``failed_at`` set.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index(
+            "ix_jobs_run_at",
+            "run_at",
+            postgresql_where=text("failed_at IS NULL"),
+        ),
+        # Jobs sharing a key are deduplicated while pending; periodic jobs
+        # use their kind.
+        Index(
+            "ix_jobs_key",
+            "key",
+            unique=True,
+            postgresql_where=text("failed_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=True, init=False
+    )
+    kind: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    key: Mapped[str | None] = mapped_column(String(255), default=None)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    run_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, init=False
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, default=None)
+    failed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), default=None
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, init=False
+    )
+
+    @classmethod
+    async def enqueue(  # noqa: PLR0913
+        cls,
+        session: AsyncSession,
+        kind: str,
+        payload: dict[str, Any],
+        *,
+        key: str | None = None,
+        delay: float = 0,
+        max_attempts: int = 5,
+    ) -> int | None:
+        # Returns the new job's id, or ``None`` if ``key`` is already queued.
+        stmt = (
+            insert(cls)
+            .values(
+                kind=kind,
+                payload=payload,
+                key=key,
+                max_attempts=max_attempts,
+                run_at=func.now() + timedelta(seconds=delay),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[cls.key], index_where=cls.failed_at.is_(None)
+            )
+            .returning(cls.id)
+        )
+        return await session.scalar(stmt)
+
+    @classmethod
+    async def claim(
+        cls, session: AsyncSession, limit: int, lease: float
+    ) -> list[Row[tuple[int, str, dict[str, Any], int, int, float]]]:
+        # Claims up to ``limit`` due jobs that no other worker holds, and
+        # returns (id, kind, payload, attempts, max_attempts, lag seconds).
+        due = (
+            select(cls.id, cls.run_at)
+            .where(cls.failed_at.is_(None), cls.run_at <= func.now())
+            .order_by(cls.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("due")
+        )
+        stmt = (
+            update(cls)
+            .where(cls.id == due.c.id)
+            .values(
+                attempts=cls.attempts + 1,
+                run_at=func.now() + timedelta(seconds=lease),
+            )
+            .returning(
+                cls.id,
+                cls.kind,
+                cls.payload,
+                cls.attempts,
+                cls.max_attempts,
+                func.extract("epoch", func.now() - due.c.run_at)
+                .cast(Float)
+                .label("lag"),
+            )
+        )
+        return list((await session.execute(stmt)).all())
+
+    @classmethod
+    async def complete(cls, session: AsyncSession, job_id: int) -> None:
+        await session.execute(delete(cls).where(cls.id == job_id))
+
+    @classmethod
+    async def reschedule(
+        cls,
+        session: AsyncSession,
+        job_id: int,
+        delay: float,
+        *,
+        reset_attempts: bool = False,
+        error: str | None = None,
+    ) -> None:
+        values: dict[str, Any] = {
+            "run_at": func.now() + timedelta(seconds=delay),
+            "last_error": error,
+        }
+        if reset_attempts:
+            values["attempts"] = 0
+        await session.execute(update(cls).where(cls.id == job_id).values(**values))
+
+    @classmethod
+    async def fail(cls, session: AsyncSession, job_id: int, error: str) -> None:
+        stmt = (
+            update(cls)
+            .where(cls.id == job_id)
+            .values(failed_at=func.now(), last_error=error)
+        )
+        await session.execute(stmt)
+
+    @classmethod
+    async def backlog(cls, session: AsyncSession) -> tuple[int, float]:
+        # Number of due jobs and seconds the oldest has been waiting.
+        stmt = select(
+            func.count(),
+            func.coalesce(func.extract("epoch", func.now() - func.min(cls.run_at)), 0),
+        ).where(cls.failed_at.is_(None), cls.run_at <= func.now())
+        count, lag = (await session.execute(stmt)).one()
+        return count, float(lag)
@@ -0,0 +1,45 @@
+from sqlalchemy import ForeignKey, ForeignKeyConstraint, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class MemberRole(Base):
+    """A role assigned to a guild member; @everyone is implicit."""
+
+    __tablename__ = "member_roles"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["guild_id", "user_id"],
+            ["guild_members.guild_id", "guild_members.user_id"],
+            ondelete="CASCADE",
+        ),
+    )
+
+    guild_id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(primary_key=True)
+    role_id: Mapped[int] = mapped_column(
+        ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+
+    @classmethod
+    async def add(
+        cls, session: AsyncSession, guild_id: int, user_id: int, role_id: int
+    ) -> None:
+        stmt = (
+            insert(cls)
+            .values(guild_id=guild_id, user_id=user_id, role_id=role_id)
+            .on_conflict_do_nothing()
+        )
+        await session.execute(stmt)
+
+    @classmethod
+    async def remove(
+        cls, session: AsyncSession, guild_id: int, user_id: int, role_id: int
+    ) -> None:
+        stmt = delete(cls).where(
+            cls.guild_id == guild_id, cls.user_id == user_id, cls.role_id == role_id
+        )
+        await session.execute(stmt)
@@ -0,0 +1,187 @@
+from datetime import datetime  # noqa: TC003
+
+from sqlalchemy import (
+    DDL,
+    REAL,
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    Text,
+    event,
+    func,
+    literal,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, websearch_to_tsquery
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .channel import Channel
+
+# Text search configuration used both to index messages and parse queries.
+SEARCH_CONFIG = "english"
+
+
+class Message(Base):
+    """ORM model for channel messages.
+
+    Ids are allocated from one sequence, so within a channel a larger id is
+    always a newer message. Read markers and pagination rely on that.
+
+    ``search_vector`` is kept up to date by a trigger on insert and on edits
+    of ``content``, so the GIN index is maintained incrementally.
+    """
+
+    __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_channel_id_id", "channel_id", "id"),
+        Index("ix_messages_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        autoincrement=True,
+        nullable=False,
+        unique=True,
+        primary_key=True,
+        init=False,
+    )
+    channel_id: Mapped[int] = mapped_column(
+        ForeignKey("channels.id", ondelete="CASCADE"), nullable=False
+    )
+    author_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, init=False
+    )
+    edited_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, init=False
+    )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, nullable=True, init=False, deferred=True
+    )
+
+    @classmethod
+    async def read_by_id(cls, session: AsyncSession, message_id: int) -> Message | None:
+        stmt = select(cls).where(cls.id == message_id)
+        return await session.scalar(stmt)
+
+    @classmethod
+    async def create(
+        cls, session: AsyncSession, channel_id: int, author_id: int, content: str
+    ) -> Message:
+        message = cls(channel_id=channel_id, author_id=author_id, content=content)
+        session.add(message)
+        await session.flush()
+
+        new = await cls.read_by_id(session, message.id)
+        if not new:
+            msg = "Message creation failed"
+            raise RuntimeError(msg)
+        return new
+
+    @classmethod
+    async def edit(
+        cls, session: AsyncSession, message_id: int, content: str
+    ) -> Message | None:
+        stmt = (
+            update(cls)
+            .where(cls.id == message_id)
+            .values(content=content, edited_at=func.now())
+            .returning(cls)
+        )
+        return await session.scalar(stmt)
+
+    @classmethod
+    async def list_before(
+        cls,
+        session: AsyncSession,
+        channel_id: int,
+        before: int | None,
+        limit: int,
+    ) -> list[Message]:
+        # Keyset pagination on (channel_id, id), newest first.
+        stmt = select(cls).where(cls.channel_id == channel_id)
+        if before is not None:
+            stmt = stmt.where(cls.id < before)
+        stmt = stmt.order_by(cls.id.desc()).limit(limit)
+        return list(await session.scalars(stmt))
+
+    @classmethod
+    async def page_watermark(
+        cls, session: AsyncSession, channel_id: int
+    ) -> tuple[int, int | None]:
+        # The channel's version and newest message id: every message page
+        # is unchanged as long as both are. One index lookup each.
+        newest = (
+            select(func.max(cls.id))
+            .where(cls.channel_id == channel_id)
+            .scalar_subquery()
+        )
+        stmt = select(Channel.version, newest).where(Channel.id == channel_id)
+        row = (await session.execute(stmt)).first()
+        return (row[0], row[1]) if row else (0, None)
+
+    @classmethod
+    async def search(  # noqa: PLR0913
+        cls,
+        session: AsyncSession,
+        *,
+        user_id: int,
+        query: str,
+        channel_id: int | None = None,
+        after: tuple[float, int] | None = None,
+        limit: int,
+    ) -> list[tuple[Message, float]]:
+        # Best matches first, paginated on (rank, id). ``after`` is the last
+        # (rank, id) of the previous page. Only channels visible to the user
+        # are searched, filtered in the same statement.
+        tsquery = websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(cls.search_vector, tsquery, type_=REAL)
+        ranked = rank.label("rank")
+
+        stmt = select(cls, ranked).where(
+            cls.search_vector.bool_op("@@")(tsquery),
+            cls.channel_id.in_(Channel.visible_ids(user_id)),
+        )
+        if channel_id is not None:
+            stmt = stmt.where(cls.channel_id == channel_id)
+        if after is not None:
+            after_rank, after_id = after
+            stmt = stmt.where(
+                tuple_(rank, cls.id)
+                < tuple_(literal(after_rank, REAL), literal(after_id, BigInteger))
+            )
+
+        stmt = stmt.order_by(ranked.desc(), cls.id.desc()).limit(limit)
+        rows = await session.execute(stmt)
+        return [(message, score) for message, score in rows]
+
+
+# The same statements are issued by the migration adding search; these keep
+# ``Base.metadata.create_all`` databases equivalent.
+event.listen(
+    Message.__table__,
+    "after_create",
+    DDL(
+        "CREATE OR REPLACE FUNCTION messages_search_vector_update() "
+        "RETURNS trigger AS $$ BEGIN "
+        f"NEW.search_vector := to_tsvector('{SEARCH_CONFIG}', NEW.content); "
+        "RETURN NEW; END $$ LANGUAGE plpgsql"
+    ),
+)
+event.listen(
+    Message.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER messages_search_vector_update "
+        "BEFORE INSERT OR UPDATE OF content ON messages "
+        "FOR EACH ROW EXECUTE FUNCTION messages_search_vector_update()"
+    ),
+)
@@ -0,0 +1,67 @@
+from enum import StrEnum
+
+from sqlalchemy import BigInteger, ForeignKey, String, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class OverwriteTarget(StrEnum):
+    ROLE = "role"
+    MEMBER = "member"
+
+
+class PermissionOverwrite(Base):
+    """Per-channel ``allow``/``deny`` bitsets for a role or a member."""
+
+    __tablename__ = "permission_overwrites"
+
+    channel_id: Mapped[int] = mapped_column(
+        ForeignKey("channels.id", ondelete="CASCADE"), primary_key=True
+    )
+    target_type: Mapped[OverwriteTarget] = mapped_column(String(8), primary_key=True)
+    # A role id or a user id, depending on ``target_type``.
+    target_id: Mapped[int] = mapped_column(primary_key=True)
+    allow: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    deny: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    @classmethod
+    async def upsert(  # noqa: PLR0913
+        cls,
+        session: AsyncSession,
+        *,
+        channel_id: int,
+        target_type: OverwriteTarget,
+        target_id: int,
+        allow: int,
+        deny: int,
+    ) -> None:
+        stmt = insert(cls).values(
+            channel_id=channel_id,
+            target_type=target_type,
+            target_id=target_id,
+            allow=allow,
+            deny=deny,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.channel_id, cls.target_type, cls.target_id],
+            set_={"allow": stmt.excluded.allow, "deny": stmt.excluded.deny},
+        )
+        await session.execute(stmt)
+
+    @classmethod
+    async def remove(
+        cls,
+        session: AsyncSession,
+        channel_id: int,
+        target_type: OverwriteTarget,
+        target_id: int,
+    ) -> None:
+        stmt = delete(cls).where(
+            cls.channel_id == channel_id,
+            cls.target_type == target_type,
+            cls.target_id == target_id,
+        )
+        await session.execute(stmt)
@@ -0,0 +1,31 @@
+from datetime import datetime  # noqa: TC003
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ReadState(Base):
+    """Last message a user has read in a channel.
+
+    Rows are written in batches by the read-state store rather than per
+    request; see ``surr.app.core.read_state``.
+    """
+
+    __tablename__ = "read_states"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    channel_id: Mapped[int] = mapped_column(
+        ForeignKey("channels.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    last_read_message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        init=False,
+    )
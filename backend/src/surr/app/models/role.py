@@ -0,0 +1,94 @@
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .member_role import MemberRole
+
+
+class Role(Base):
+    """ORM model for guild roles.
+
+    ``permissions`` is a ``Permission`` bitset. Every guild has exactly one
+    default role, @everyone, which applies to all of its members.
+    """
+
+    __tablename__ = "roles"
+    __table_args__ = (
+        Index(
+            "ix_roles_guild_id_default",
+            "guild_id",
+            unique=True,
+            postgresql_where=text("is_default"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(
+        "id",
+        autoincrement=True,
+        nullable=False,
+        unique=True,
+        primary_key=True,
+        init=False,
+    )
+    guild_id: Mapped[int] = mapped_column(
+        ForeignKey("guilds.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    permissions: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    is_default: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    @classmethod
+    async def read_by_id(cls, session: AsyncSession, role_id: int) -> Role | None:
+        stmt = select(cls).where(cls.id == role_id)
+        return await session.scalar(stmt)
+
+    @classmethod
+    async def create(  # noqa: PLR0913
+        cls,
+        session: AsyncSession,
+        *,
+        guild_id: int,
+        name: str,
+        permissions: int,
+        position: int = 0,
+        is_default: bool = False,
+    ) -> Role:
+        role = cls(
+            guild_id=guild_id,
+            name=name,
+            permissions=permissions,
+            position=position,
+            is_default=is_default,
+        )
+        session.add(role)
+        await session.flush()
+
+        new = await cls.read_by_id(session, role.id)
+        if not new:
+            msg = "Role creation failed"
+            raise RuntimeError(msg)
+        return new
+
+    @classmethod
+    async def top_position(
+        cls, session: AsyncSession, guild_id: int, user_id: int
+    ) -> int:
+        # Highest position among the member's roles; @everyone sits at 0.
+        stmt = (
+            select(func.coalesce(func.max(cls.position), 0))
+            .join(MemberRole, MemberRole.role_id == cls.id)
+            .where(MemberRole.guild_id == guild_id, MemberRole.user_id == user_id)
+        )
+        return await session.scalar(stmt) or 0
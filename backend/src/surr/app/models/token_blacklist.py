@@ -23,7 +23,9 @@ class TokenBlacklist(Base):
         init=False,
     )
     token: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
 
     @classmethod
     async def read_by_id(
@@ -1,9 +1,17 @@
-from sqlalchemy import String, select
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Integer, String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy import Row
+
 
 class User(Base):
     """ORM model for users."""
@@ -26,6 +34,21 @@ class User(Base):
         stmt = select(cls).where(cls.id == user_id)
         return await session.scalar(stmt)
 
+    @classmethod
+    async def username_exists(cls, session: AsyncSession, username: str) -> bool:
+        stmt = select(cls.id).where(cls.username == username)
+        return await session.scalar(stmt) is not None
+
+    @classmethod
+    async def read_many_slim(
+        cls, session: AsyncSession, user_ids: Sequence[int]
+    ) -> Sequence[Row[tuple[int, str]]]:
+        # ``(id, username)`` of each existing user in ``user_ids``, in one
+        # ``id = ANY(:ids)`` query whatever the number of ids.
+        ids = bindparam("user_ids", list(user_ids), type_=ARRAY(Integer))
+        stmt = select(cls.id, cls.username).where(cls.id == any_(ids))
+        return (await session.execute(stmt)).all()
+
     @classmethod
     async def create(
         cls, session: AsyncSession, username: str, hashed_password: str
@@ -0,0 +1,68 @@
+from datetime import datetime  # noqa: TC003
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, String, delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class VoicePresence(Base):
+    """A participant currently in a voice room.
+
+    Kept by the voice analytics flush so that head counts and session
+    lengths can be rolled up incrementally; rows are removed when the
+    participant leaves, so the table only ever holds who is connected now.
+    """
+
+    __tablename__ = "voice_presence"
+
+    room: Mapped[str] = mapped_column(String(255), primary_key=True)
+    participant_sid: Mapped[str] = mapped_column(String(255), primary_key=True)
+    identity: Mapped[str] = mapped_column(String(255), nullable=False)
+    joined_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    @classmethod
+    async def read_rooms(
+        cls, session: AsyncSession, rooms: Iterable[str]
+    ) -> dict[str, dict[str, datetime]]:
+        # Join times of everyone in ``rooms``, by room and participant sid.
+        present: dict[str, dict[str, datetime]] = {room: {} for room in rooms}
+        stmt = select(cls.room, cls.participant_sid, cls.joined_at).where(
+            cls.room.in_(list(present))
+        )
+        for room, participant_sid, joined_at in await session.execute(stmt):
+            present[room][participant_sid] = joined_at
+        return present
+
+    @classmethod
+    async def add_many(cls, session: AsyncSession, rows: list[VoicePresence]) -> None:
+        if not rows:
+            return
+        stmt = insert(cls).values(
+            [
+                {
+                    "room": row.room,
+                    "participant_sid": row.participant_sid,
+                    "identity": row.identity,
+                    "joined_at": row.joined_at,
+                }
+                for row in rows
+            ]
+        )
+        await session.execute(stmt.on_conflict_do_nothing())
+
+    @classmethod
+    async def remove_many(
+        cls, session: AsyncSession, keys: list[tuple[str, str]]
+    ) -> None:
+        # ``keys`` are (room, participant sid) pairs.
+        if not keys:
+            return
+        stmt = delete(cls).where(tuple_(cls.room, cls.participant_sid).in_(keys))
+        await session.execute(stmt)
@@ -0,0 +1,190 @@
+from datetime import datetime  # noqa: TC003
+from itertools import batched
+from typing import TYPE_CHECKING, ClassVar, Self
+
+from sqlalchemy import (
+    DateTime,
+    Double,
+    Integer,
+    String,
+    func,
+    literal,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, MappedAsDataclass, mapped_column
+
+from .base import Base
+from .voice_presence import VoicePresence
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+
+    from sqlalchemy import Row
+
+# Rows per upsert statement.
+UPSERT_BATCH_SIZE = 1000
+
+
+class VoiceStats(MappedAsDataclass):
+    """Columns and queries shared by the voice rollup tables.
+
+    Each row covers one room for one bucket. Counters are added to as
+    events are flushed; ``peak_participants`` only ever grows, and
+    ``closing_participants`` is the head count after the last event seen.
+    A bucket without a row had no events and nobody in the room.
+    """
+
+    # ``date_trunc`` field the buckets are aligned to.
+    resolution: ClassVar[str]
+
+    room: Mapped[str] = mapped_column(String(255), primary_key=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    joins: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Sessions that ended in the bucket, and their total length.
+    sessions: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    session_seconds: Mapped[float] = mapped_column(Double, nullable=False, default=0)
+    tracks_published: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    peak_participants: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    closing_participants: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+
+    @classmethod
+    async def upsert(cls, session: AsyncSession, rows: Iterable[Self]) -> None:
+        # Merges ``rows`` into the stored buckets. Sorted so concurrent
+        # writers take row locks in the same order.
+        ordered = sorted(rows, key=lambda row: (row.room, row.bucket))
+        for chunk in batched(ordered, UPSERT_BATCH_SIZE, strict=False):
+            stmt = insert(cls).values(
+                [
+                    {
+                        "room": row.room,
+                        "bucket": row.bucket,
+                        "joins": row.joins,
+                        "sessions": row.sessions,
+                        "session_seconds": row.session_seconds,
+                        "tracks_published": row.tracks_published,
+                        "peak_participants": row.peak_participants,
+                        "closing_participants": row.closing_participants,
+                    }
+                    for row in chunk
+                ]
+            )
+            excluded = stmt.excluded
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[cls.room, cls.bucket],
+                set_={
+                    "joins": cls.joins + excluded.joins,
+                    "sessions": cls.sessions + excluded.sessions,
+                    "session_seconds": cls.session_seconds + excluded.session_seconds,
+                    "tracks_published": cls.tracks_published
+                    + excluded.tracks_published,
+                    "peak_participants": func.greatest(
+                        cls.peak_participants, excluded.peak_participants
+                    ),
+                    "closing_participants": excluded.closing_participants,
+                },
+            )
+            await session.execute(stmt)
+
+    @classmethod
+    async def record_occupancy(cls, session: AsyncSession) -> None:
+        # Counts everyone in a room into the current bucket, so occupied
+        # buckets get a row even when nobody joins or leaves.
+        source = (
+            select(
+                VoicePresence.room,
+                func.date_trunc(cls.resolution, func.now(), "UTC"),
+                func.count(),
+                func.count(),
+                literal(0),
+                literal(0),
+                literal(0),
+                literal(0.0),
+            )
+            .group_by(VoicePresence.room)
+            .order_by(VoicePresence.room)
+        )
+        stmt = insert(cls).from_select(
+            [
+                "room",
+                "bucket",
+                "peak_participants",
+                "closing_participants",
+                "joins",
+                "sessions",
+                "tracks_published",
+                "session_seconds",
+            ],
+            source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.room, cls.bucket],
+            set_={
+                "peak_participants": func.greatest(
+                    cls.peak_participants, stmt.excluded.peak_participants
+                ),
+                "closing_participants": stmt.excluded.closing_participants,
+            },
+        )
+        await session.execute(stmt)
+
+    @classmethod
+    async def read_range(
+        cls,
+        session: AsyncSession,
+        room: str,
+        since: datetime,
+        until: datetime,
+    ) -> list[Self]:
+        stmt = (
+            select(cls)
+            .where(cls.room == room, cls.bucket >= since, cls.bucket < until)
+            .order_by(cls.bucket)
+        )
+        return list(await session.scalars(stmt))
+
+    @classmethod
+    async def by_hour_of_day(
+        cls,
+        session: AsyncSession,
+        since: datetime,
+        rooms: Collection[str],
+    ) -> list[Row[tuple[int, int, float, int]]]:
+        # Hour of day (UTC), peak and average head count, and joins, over
+        # the buckets of ``rooms`` since ``since``.
+        hour = (
+            func.extract("hour", func.timezone("UTC", cls.bucket))
+            .cast(Integer)
+            .label("hour")
+        )
+        stmt = (
+            select(
+                hour,
+                func.max(cls.peak_participants),
+                func.avg(cls.peak_participants).cast(Double),
+                func.sum(cls.joins).cast(Integer),
+            )
+            .where(cls.bucket >= since, cls.room.in_(rooms))
+            # By label, since the expression holds a bound parameter.
+            .group_by(text("hour"))
+            .order_by(hour)
+        )
+        return list(await session.execute(stmt))
+
+
+class VoiceMinuteStats(VoiceStats, Base):
+    """Per-minute voice rollups; see ``VoiceStats``."""
+
+    __tablename__ = "voice_minute_stats"
+    resolution = "minute"
+
+
+class VoiceHourStats(VoiceStats, Base):
+    """Per-hour voice rollups; see ``VoiceStats``."""
+
+    __tablename__ = "voice_hour_stats"
+    resolution = "hour"
@@ -0,0 +1,10 @@
+from typing import Annotated
+
+from pydantic import Field
+
+INT4_MAX = 2**31 - 1
+INT8_MAX = 2**63 - 1
+
+# Users, guilds, channels and roles use int4 keys; anything outside would fail
+# the query with a 500 instead of a 422.
+RowId = Annotated[int, Field(ge=1, le=INT4_MAX)]
@@ -3,3 +3,9 @@ from pydantic import BaseModel, Field
 
 class UserBase(BaseModel):
     username: str = Field(..., min_length=3, max_length=64, pattern=r"^\S+$")
+
+
+class UserRecord(UserBase):
+    """Slim identity record shared by caches and authenticated dependencies."""
+
+    id: int
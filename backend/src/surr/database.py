@@ -1,12 +1,14 @@
 import logging
-from collections.abc import Iterator  # noqa: TC003
+from collections.abc import Callable, Iterator
+from contextlib import AbstractAsyncContextManager
 from typing import Annotated
 
 from fastapi import Depends
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from surr.app.core.config import settings
+from surr.app.core.tracing import instrument_engine
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,7 @@ logger = logging.getLogger(__name__)
 engine = create_async_engine(
     settings.POSTGRES_ASYNC_URI, echo=False, pool_pre_ping=True
 )
+instrument_engine(engine.sync_engine)
 
 
 AsyncSessionLocal = async_sessionmaker(bind=engine, autoflush=False)
@@ -28,3 +31,7 @@ def get_session() -> Iterator[async_sessionmaker]:
 
 
 SessionFactory = Annotated[async_sessionmaker, Depends(get_session)]
+
+# What background components accept instead: anything that opens a session
+# the way ``async_sessionmaker`` does, such as a test's shared session.
+type SessionOpener = Callable[[], AbstractAsyncContextManager[AsyncSession]]
@@ -6,8 +6,25 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from surr.app.api.main import router as api_router
+from surr.app.core.admission import (
+    DEFAULT_ADMISSION_ROUTES,
+    AdmissionControlMiddleware,
+    default_admission_policies,
+)
 from surr.app.core.config import settings
-from surr.app.core.rate_limiter import delete_expired_rate_limits
+from surr.app.core.jobs import run_job_worker
+from surr.app.core.livekit import livekit_client
+from surr.app.core.metrics import metrics_endpoint
+from surr.app.core.pubsub import pg_listener
+from surr.app.core.read_state import (
+    flush_pending_read_states,
+    flush_read_states,
+)
+from surr.app.core.tracing import TracingMiddleware, tracer
+from surr.app.core.voice_analytics import (
+    flush_pending_voice_events,
+    flush_voice_events,
+)
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
@@ -15,18 +32,39 @@ if TYPE_CHECKING:
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
-    task = asyncio.create_task(delete_expired_rate_limits())
+    tasks = [
+        asyncio.create_task(pg_listener.run()),
+        asyncio.create_task(flush_read_states()),
+        asyncio.create_task(flush_voice_events()),
+    ]
+    if settings.JOB_WORKER_IN_PROCESS:
+        tasks.append(asyncio.create_task(run_job_worker()))
 
     yield
 
-    task.cancel()
-    with suppress(asyncio.CancelledError):
-        await task
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+
+    # Markers acknowledged since the last flush would otherwise be lost.
+    await flush_pending_read_states()
+    await flush_pending_voice_events()
+    await livekit_client.aclose()
+    await tracer.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
 
 
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(
+        AdmissionControlMiddleware,  # ty:ignore[invalid-argument-type]
+        routes=DEFAULT_ADMISSION_ROUTES,
+        policies=default_admission_policies(),
+    )
+
 app.add_middleware(
     CORSMiddleware,  # ty:ignore[invalid-argument-type]
     allow_origins=settings.CORS_ORIGINS,
@@ -35,5 +73,9 @@ app.add_middleware(
     allow_headers=settings.CORS_METHODS,
 )
 
+# Outermost, so admission queueing time is part of the request span.
+app.add_middleware(TracingMiddleware)  # ty:ignore[invalid-argument-type]
+
 
 app.include_router(api_router, prefix="/api")
+app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
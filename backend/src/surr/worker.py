@@ -0,0 +1,80 @@
+"""
+Standalone job worker, installed as ``surr-worker``.
+
+Runs the same job worker the API starts in-process, for deployments that
+set ``JOB_WORKER_IN_PROCESS=false`` and scale workers separately.
+"""
+
+import asyncio
+import logging
+import signal
+from contextlib import suppress
+
+# Modules defining jobs, imported for their registrations.
+import surr.app.core.rate_limiter  # noqa: F401
+import surr.app.core.voice_analytics  # noqa: F401
+from surr.app.core.config import settings
+from surr.app.core.jobs import run_job_worker
+from surr.app.core.metrics import registry
+from surr.app.core.pubsub import pg_listener
+from surr.app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+async def handle_metrics_request(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    # Answers any request with the metrics, so the worker can be scraped
+    # like the API's ``/metrics``.
+    try:
+        await reader.readuntil(b"\r\n\r\n")
+        body = registry.render().encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/plain; version=0.0.4\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+            b"Connection: close\r\n\r\n" + body
+        )
+        await writer.drain()
+    except asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    server = None
+    if settings.JOB_WORKER_METRICS_PORT is not None:
+        server = await asyncio.start_server(
+            handle_metrics_request, port=settings.JOB_WORKER_METRICS_PORT
+        )
+
+    tasks = [
+        asyncio.create_task(pg_listener.run()),
+        asyncio.create_task(run_job_worker()),
+    ]
+    logger.info("Job worker started")
+
+    await stop.wait()
+
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    await tracer.shutdown()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve())
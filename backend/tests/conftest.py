@@ -11,7 +11,9 @@ from sqlalchemy.ext.asyncio import (
 )
 from testcontainers.postgres import PostgresContainer
 
+from surr.app.core.security import TokenType, create_token, get_password_hash
 from surr.app.models.base import Base
+from surr.app.models.user import User
 from surr.database import get_session
 from surr.main import app
 
@@ -72,3 +74,13 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient]:
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def auth_headers(db_session: AsyncSession) -> dict[str, str]:
+    db_session.add(
+        User(username="tester", hashed_password=get_password_hash("password123"))
+    )
+    await db_session.flush()
+    token = create_token(data={"sub": "tester"}, token_type=TokenType.ACCESS)
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from surr.app.core.admission import (
+    AdmissionControlMiddleware,
+    AdmissionPolicy,
+    ConcurrencyGate,
+)
+
+
+def build_app(policy: AdmissionPolicy, release: asyncio.Event) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow() -> dict[str, str]:
+        await release.wait()
+        return {"status": "ok"}
+
+    @app.get("/fast")
+    async def fast() -> dict[str, str]:
+        return {"status": "ok"}
+
+    app.add_middleware(
+        AdmissionControlMiddleware,  # ty:ignore[invalid-argument-type]
+        routes=[("/slow", "slow")],
+        policies={"slow": policy},
+    )
+    return app
+
+
+@pytest.mark.asyncio
+async def test_sheds_when_queue_is_full() -> None:
+    release = asyncio.Event()
+    app = build_app(
+        AdmissionPolicy(max_concurrency=1, max_queue=0, queue_timeout=1, retry_after=3),
+        release,
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        first = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+
+        shed = await client.get("/slow")
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "3"
+
+        # Routes outside the limited class are never held back.
+        assert (await client.get("/fast")).status_code == 200
+
+        release.set()
+        assert (await first).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_queued_request_is_shed_after_deadline() -> None:
+    release = asyncio.Event()
+    app = build_app(
+        AdmissionPolicy(max_concurrency=1, max_queue=4, queue_timeout=0.05),
+        release,
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        first = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+
+        assert (await client.get("/slow")).status_code == 503
+
+        release.set()
+        assert (await first).status_code == 200
+        assert (await client.get("/slow")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_adaptive_gate_tightens_on_high_latency() -> None:
+    gate = ConcurrencyGate(
+        "adaptive",
+        AdmissionPolicy(
+            max_concurrency=10, max_queue=0, queue_timeout=1, target_latency=0.1
+        ),
+    )
+
+    assert await gate.acquire() is None
+    gate.release(1.0)
+    assert gate.limit == 9
+
+    # Further slow completions inside the cooldown do not collapse the limit.
+    for _ in range(50):
+        assert await gate.acquire() is None
+        gate.release(1.0)
+    assert gate.limit == 9
+    assert gate.in_flight == 0
@@ -0,0 +1,122 @@
+import hashlib
+from typing import TYPE_CHECKING
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from surr.app.api.v1.attachments import use_cases
+from surr.app.core.security import TokenType, create_token, get_password_hash
+from surr.app.core.storage import BlobStorage
+from surr.app.exceptions.attachment import AttachmentTooLargeError
+from surr.app.models.user import User
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+
+async def chunked(data: bytes, size: int = 1000) -> AsyncIterator[bytes]:  # noqa: RUF029
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.fixture
+def storage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> BlobStorage:
+    storage = BlobStorage(tmp_path)
+    monkeypatch.setattr(use_cases, "blob_storage", storage)
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_storage_deduplicates_identical_content(storage: BlobStorage) -> None:
+    data = b"x" * 5000
+
+    first = await storage.store(chunked(data), max_size=10_000)
+    second = await storage.store(chunked(data), max_size=10_000)
+
+    assert first.sha256 == hashlib.sha256(data).hexdigest()
+    assert first.size == len(data)
+    assert first.created
+    assert not second.created
+    assert storage.path_for(first.sha256).read_bytes() == data
+    assert list(storage.tmp.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_storage_rejects_oversized_upload(storage: BlobStorage) -> None:
+    with pytest.raises(AttachmentTooLargeError):
+        await storage.store(chunked(b"x" * 5000), max_size=4000)
+
+    assert list(storage.tmp.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_upload_and_download_attachment(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    storage: BlobStorage,
+    auth_headers: dict[str, str],
+) -> None:
+    data = bytes(range(256)) * 64
+
+    response = await client.post(
+        "/api/attachments",
+        params={"filename": "../../cat.png"},
+        content=data,
+        headers={**auth_headers, "Content-Type": "image/png"},
+    )
+    assert response.status_code == 201
+    attachment = response.json()
+    assert attachment["filename"] == "cat.png"
+    assert attachment["size"] == len(data)
+    assert storage.path_for(attachment["sha256"]).exists()
+
+    url = f"/api/attachments/{attachment['id']}"
+    response = await client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.content == data
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["content-disposition"].startswith("inline")
+
+    etag = response.headers["etag"]
+    response = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = await client.get(url, headers={**auth_headers, "Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == data[10:20]
+
+    # Media types are compared case-insensitively, so SVG is never inline.
+    response = await client.post(
+        "/api/attachments",
+        params={"filename": "cat.svg"},
+        content=b"<svg onload='alert(1)'/>",
+        headers={**auth_headers, "Content-Type": "image/SVG+xml; charset=utf-8"},
+    )
+    assert response.json()["content_type"] == "image/svg+xml"
+    response = await client.get(
+        f"/api/attachments/{response.json()['id']}", headers=auth_headers
+    )
+    assert response.headers["content-disposition"].startswith("attachment")
+
+    # Other users cannot fetch it by guessing the id.
+    db_session.add(
+        User(username="other", hashed_password=get_password_hash("password123"))
+    )
+    await db_session.flush()
+    token = create_token(data={"sub": "other"}, token_type=TokenType.ACCESS)
+    response = await client.get(url, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_upload_requires_authentication(
+    client: AsyncClient, storage: BlobStorage
+) -> None:
+    response = await client.post(
+        "/api/attachments", params={"filename": "a.txt"}, content=b"hello"
+    )
+
+    assert response.status_code == 401
+    assert not storage.objects.exists()
@@ -0,0 +1,80 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from surr.app.core.security import TokenType, create_token, get_password_hash
+from surr.app.core.user_cache import UserCache, token_digest
+from surr.app.models.user import User
+from surr.app.schema.user import UserRecord
+
+
+@pytest.mark.asyncio
+async def test_me_returns_current_user(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    user = User(username="meuser", hashed_password=get_password_hash("password123"))
+    db_session.add(user)
+    await db_session.flush()
+
+    token = create_token(data={"sub": "meuser"}, token_type=TokenType.ACCESS)
+    response = await client.get(
+        "/api/auth/me", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"id": user.id, "username": "meuser"}
+
+
+@pytest.mark.asyncio
+async def test_me_rejects_refresh_token(client: AsyncClient) -> None:
+    token = create_token(data={"sub": "meuser"}, token_type=TokenType.REFRESH)
+    response = await client.get(
+        "/api/auth/me", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_me_rejects_token_after_logout(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    db_session.add(
+        User(username="leaver", hashed_password=get_password_hash("password123"))
+    )
+    await db_session.flush()
+
+    token = create_token(data={"sub": "leaver"}, token_type=TokenType.ACCESS)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+    assert (await client.post("/api/auth/logout", headers=headers)).status_code == 200
+    assert (await client.get("/api/auth/me", headers=headers)).status_code == 401
+
+
+def test_user_cache_invalidation() -> None:
+    cache = UserCache(maxsize=10, ttl=60)
+    record = UserRecord(id=1, username="alice")
+
+    # Nothing is cached while the LISTEN connection is down.
+    cache.store("token", record, cache.generation)
+    assert cache.get("token") is None
+
+    cache.enabled = True
+    cache.store("token", record, cache.generation)
+    assert cache.get("token") == record
+
+    cache.store_records([record], cache.generation)
+    cache.handle_notification("user:alice:1")
+    assert cache.get("token") is None
+    assert cache.records.get(1) is None
+
+    cache.store("token", record, cache.generation)
+    cache.handle_notification(f"token:{token_digest('token')}")
+    assert cache.get("token") is None
+
+    # A result read before an invalidation is not stored afterwards.
+    stale_generation = cache.generation
+    cache.handle_notification("user:bob:2")
+    cache.store("token", record, stale_generation)
+    assert cache.get("token") is None
@@ -0,0 +1,78 @@
+import pytest
+from httpx import AsyncClient
+
+from surr.app.core.http_cache import CachePolicy, etag_matches, make_etag
+
+
+def test_if_none_match_uses_weak_comparison() -> None:
+    etag = make_etag("messages", 1, 0, 42, 50)
+    assert etag == make_etag("messages", 1, 0, 42, 50)
+    assert etag != make_etag("messages", 1, 0, 43, 50)
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_cache_control_header() -> None:
+    assert CachePolicy().header == "private, no-cache, max-age=0"
+    assert CachePolicy(max_age=60, private=False, no_cache=False).header == (
+        "public, max-age=60"
+    )
+
+
+@pytest.mark.asyncio
+async def test_unchanged_pages_are_not_modified(
+    client: AsyncClient, auth_headers: dict[str, str]
+) -> None:
+    response = await client.post(
+        "/api/guilds", json={"name": "guild"}, headers=auth_headers
+    )
+    guild_id = response.json()["id"]
+    response = await client.post(
+        f"/api/guilds/{guild_id}/channels",
+        json={"name": "general"},
+        headers=auth_headers,
+    )
+    channel_id = response.json()["id"]
+    messages = f"/api/channels/{channel_id}/messages"
+    response = await client.post(
+        messages, json={"content": "first"}, headers=auth_headers
+    )
+    first_id = response.json()["id"]
+
+    async def revalidate(url: str, etag: str) -> int:
+        response = await client.get(
+            url, headers={**auth_headers, "If-None-Match": etag}
+        )
+        return response.status_code
+
+    response = await client.get(messages, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, no-cache, max-age=0"
+    etag = response.headers["etag"]
+    assert await revalidate(messages, etag) == 304
+
+    # New messages change the latest page but not older ones.
+    response = await client.get(
+        messages, params={"before": first_id + 1}, headers=auth_headers
+    )
+    older_etag = response.headers["etag"]
+    await client.post(messages, json={"content": "second"}, headers=auth_headers)
+    assert await revalidate(messages, etag) == 200
+    assert await revalidate(f"{messages}?before={first_id + 1}", older_etag) == 304
+
+    # Edits change every page.
+    await client.patch(
+        f"{messages}/{first_id}", json={"content": "edited"}, headers=auth_headers
+    )
+    assert await revalidate(f"{messages}?before={first_id + 1}", older_etag) == 200
+
+    channels = f"/api/guilds/{guild_id}/channels"
+    response = await client.get(channels, headers=auth_headers)
+    etag = response.headers["etag"]
+    assert await revalidate(channels, etag) == 304
+    await client.post(channels, json={"name": "random"}, headers=auth_headers)
+    assert await revalidate(channels, etag) == 200
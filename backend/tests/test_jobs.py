@@ -0,0 +1,125 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from surr.app.core.jobs import (
+    JOBS_CHANNEL,
+    JOBS_FAILED,
+    JobQueue,
+    JobWorker,
+    job_queue,
+    retry_delay,
+)
+from surr.app.core.pubsub import pg_listener
+from surr.app.models.job import Job
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+
+@pytest.fixture
+def session_factory(db_session: AsyncSession):  # noqa: ANN201
+    @asynccontextmanager
+    async def factory() -> AsyncGenerator[AsyncSession]:  # noqa: RUF029
+        yield db_session
+
+    return factory
+
+
+def test_retry_delay_backs_off_exponentially_with_jitter() -> None:
+    for attempts, ceiling in ((1, 2), (2, 4), (3, 8), (10, 60)):
+        delay = retry_delay(attempts, base=2, maximum=60)
+        assert ceiling / 2 <= delay <= ceiling
+
+
+def test_job_kinds_are_registered_once() -> None:
+    queue = JobQueue()
+
+    @queue.job("send")
+    async def send(_: async_sessionmaker, __: dict[str, Any]) -> None: ...
+
+    with pytest.raises(ValueError, match="already registered"):
+        queue.periodic("send", interval=60)(send)
+
+
+def test_notifications_wake_workers_started_after_listening() -> None:
+    # The channel must be known before the listener connects.
+    assert job_queue.wake_workers in pg_listener._handlers[JOBS_CHANNEL]  # noqa: SLF001
+
+    queue = JobQueue()
+    worker = JobWorker(
+        queue,
+        None,  # ty:ignore[invalid-argument-type]
+        concurrency=1,
+        batch_size=1,
+        lease=30,
+        poll_interval=60,
+        retry_base=1,
+        retry_max=1,
+    )
+    queue.workers.add(worker)
+    queue.wake_workers("greet")
+    assert worker._wake.is_set()  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_retries_and_reschedules_jobs(
+    db_session: AsyncSession, session_factory: async_sessionmaker
+) -> None:
+    queue = JobQueue()
+    runs: list[str] = []
+
+    @queue.job("greet")
+    async def greet(_: async_sessionmaker, payload: dict[str, Any]) -> None:  # noqa: RUF029
+        runs.append(payload["name"])
+
+    @queue.job("flaky", max_attempts=2)
+    async def flaky(_: async_sessionmaker, __: dict[str, Any]) -> None:  # noqa: RUF029
+        runs.append("flaky")
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    @queue.periodic("tick", interval=3600)
+    async def tick(_: async_sessionmaker, __: dict[str, Any]) -> None:  # noqa: RUF029
+        runs.append("tick")
+
+    with pytest.raises(ValueError, match="Unknown job kind"):
+        await queue.enqueue(db_session, "missing")
+
+    await queue.enqueue(db_session, "greet", {"name": "ada"})
+    assert await queue.enqueue(db_session, "greet", {"name": "bob"}, key="bob")
+    assert await queue.enqueue(db_session, "greet", {"name": "bob"}, key="bob") is None
+    await queue.enqueue(db_session, "flaky")
+    await db_session.commit()
+    await queue.schedule_periodic(session_factory)
+    await queue.schedule_periodic(session_factory)
+
+    dead_before = JOBS_FAILED.value(kind="flaky", outcome="dead")
+    worker = JobWorker(
+        queue,
+        session_factory,
+        concurrency=1,
+        batch_size=1,
+        lease=60,
+        poll_interval=0.01,
+        retry_base=0,
+        retry_max=0,
+    )
+    while await worker.poll():
+        await asyncio.gather(*worker.active)
+
+    assert sorted(runs) == ["ada", "bob", "flaky", "flaky", "tick"]
+    assert JOBS_FAILED.value(kind="flaky", outcome="dead") == dead_before + 1
+
+    # Finished jobs are gone; the dead job and the periodic one remain.
+    jobs = {job.kind: job for job in await db_session.scalars(select(Job))}
+    assert set(jobs) == {"flaky", "tick"}
+    assert jobs["flaky"].failed_at is not None
+    assert jobs["flaky"].attempts == 2
+    assert "boom" in (jobs["flaky"].last_error or "")
+    assert jobs["tick"].failed_at is None
+    assert jobs["tick"].attempts == 0
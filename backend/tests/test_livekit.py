@@ -0,0 +1,240 @@
+import asyncio
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import httpx
+import jwt
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from surr.app.core.livekit import (
+    LiveKitClient,
+    channel_room,
+    get_livekit_client,
+    http_base_url,
+    room_channel_id,
+)
+from surr.app.core.permissions import Permission
+from surr.app.core.security import TokenType, create_token, get_password_hash
+from surr.app.exceptions.livekit import LiveKitError
+from surr.app.models.role import Role
+from surr.app.models.user import User
+from surr.main import app
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+API_KEY = "testkey"
+API_SECRET = "testsecret-testsecret-testsecret"
+
+
+class FakeLiveKit:
+    """In-process stand-in for the LiveKit Twirp server API."""
+
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.tokens: set[str] = set()
+        self.participants = {"lobby": [{"sid": "PA_1", "identity": "alice"}]}
+        self.app = Starlette(
+            routes=[
+                Route(
+                    "/twirp/livekit.{service}/{method}", self.handle, methods=["POST"]
+                )
+            ]
+        )
+
+    async def handle(self, request: Request) -> JSONResponse:
+        method = request.path_params["method"]
+        self.calls[method] += 1
+
+        token = request.headers["authorization"].removeprefix("Bearer ")
+        claims = jwt.decode(token, API_SECRET, algorithms=["HS256"])
+        assert claims["iss"] == API_KEY
+        self.tokens.add(token)
+
+        body = await request.json()
+        # Yield so concurrent callers overlap with the in-flight request.
+        await asyncio.sleep(0.01)
+
+        if method == "ListRooms":
+            return JSONResponse(
+                {
+                    "rooms": [
+                        {"sid": "RM_1", "name": name, "num_participants": len(people)}
+                        for name, people in self.participants.items()
+                    ]
+                }
+            )
+        if method == "ListParticipants":
+            if body["room"] not in self.participants:
+                return JSONResponse(
+                    {"code": "not_found", "msg": "room not found"}, status_code=404
+                )
+            return JSONResponse({"participants": self.participants[body["room"]]})
+        if method == "RemoveParticipant":
+            self.participants[body["room"]] = [
+                participant
+                for participant in self.participants[body["room"]]
+                if participant["identity"] != body["identity"]
+            ]
+            return JSONResponse({})
+        return JSONResponse({"code": "unimplemented", "msg": method}, status_code=501)
+
+
+@pytest.fixture
+def fake() -> FakeLiveKit:
+    return FakeLiveKit()
+
+
+@pytest.fixture
+async def livekit(fake: FakeLiveKit) -> AsyncGenerator[LiveKitClient]:
+    client = LiveKitClient(
+        "ws://livekit:7880",
+        API_KEY,
+        API_SECRET,
+        listing_ttl=60,
+        transport=httpx.ASGITransport(app=fake.app),
+    )
+    yield client
+    await client.aclose()
+
+
+def test_http_base_url() -> None:
+    assert http_base_url("127.0.0.1:7880") == "http://127.0.0.1:7880"
+    assert http_base_url("wss://voice.example.com") == "https://voice.example.com"
+    assert http_base_url("http://livekit:7880") == "http://livekit:7880"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_listings_are_coalesced(
+    livekit: LiveKitClient, fake: FakeLiveKit
+) -> None:
+    results = await asyncio.gather(
+        *(livekit.list_participants("lobby") for _ in range(100))
+    )
+
+    assert fake.calls["ListParticipants"] == 1
+    assert all(result == [{"sid": "PA_1", "identity": "alice"}] for result in results)
+
+    # Served from the cache until it expires.
+    await livekit.list_participants("lobby")
+    assert fake.calls["ListParticipants"] == 1
+
+
+@pytest.mark.asyncio
+async def test_admin_tokens_are_reused(
+    livekit: LiveKitClient, fake: FakeLiveKit
+) -> None:
+    await livekit.list_rooms()
+    await livekit.list_rooms(names=["lobby"])
+
+    assert fake.calls["ListRooms"] == 2
+    assert len(fake.tokens) == 1
+
+
+@pytest.mark.asyncio
+async def test_mutation_invalidates_listings(
+    livekit: LiveKitClient, fake: FakeLiveKit
+) -> None:
+    assert len(await livekit.list_participants("lobby")) == 1
+    assert (await livekit.list_rooms())[0]["num_participants"] == 1
+
+    await livekit.remove_participant("lobby", "alice")
+
+    assert await livekit.list_participants("lobby") == []
+    assert (await livekit.list_rooms())[0]["num_participants"] == 0
+    assert fake.calls["ListParticipants"] == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_raised_and_not_cached(
+    livekit: LiveKitClient, fake: FakeLiveKit
+) -> None:
+    for _ in range(2):
+        with pytest.raises(LiveKitError) as exc_info:
+            await livekit.list_participants("missing")
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.code == "not_found"
+
+    assert fake.calls["ListParticipants"] == 2
+
+
+def test_rooms_map_to_channels() -> None:
+    assert room_channel_id("channel-42") == 42
+    assert room_channel_id("channel-2147483647") == 2**31 - 1
+    for room in (
+        "lobby",
+        "channel-0",
+        "channel-042",
+        "channel-2147483648",
+        "channel-1\n",
+    ):
+        assert room_channel_id(room) is None
+
+
+@pytest.mark.asyncio
+async def test_rooms_are_listed_only_for_visible_channels(
+    client: httpx.AsyncClient,
+    db_session: AsyncSession,
+    livekit: LiveKitClient,
+    fake: FakeLiveKit,
+) -> None:
+    headers = {}
+    for username in ("owner", "member"):
+        db_session.add(
+            User(username=username, hashed_password=get_password_hash("password123"))
+        )
+        token = create_token(data={"sub": username}, token_type=TokenType.ACCESS)
+        headers[username] = {"Authorization": f"Bearer {token}"}
+    await db_session.flush()
+    member_id = await db_session.scalar(
+        select(User.id).where(User.username == "member")
+    )
+
+    response = await client.post(
+        "/api/guilds", json={"name": "guild"}, headers=headers["owner"]
+    )
+    guild_id = response.json()["id"]
+    await client.put(
+        f"/api/guilds/{guild_id}/members/{member_id}", headers=headers["owner"]
+    )
+    rooms = []
+    for name in ("general", "private"):
+        response = await client.post(
+            f"/api/guilds/{guild_id}/channels",
+            json={"name": name},
+            headers=headers["owner"],
+        )
+        rooms.append(channel_room(response.json()["id"]))
+    general, private = rooms
+    everyone_id = await db_session.scalar(
+        select(Role.id).where(Role.guild_id == guild_id, Role.is_default)
+    )
+    response = await client.put(
+        f"/api/channels/{room_channel_id(private)}/overwrites/role/{everyone_id}",
+        json={"deny": Permission.VIEW_CHANNEL},
+        headers=headers["owner"],
+    )
+    assert response.status_code == 204
+
+    fake.participants = {
+        room: [{"sid": "PA_1", "identity": "alice"}]
+        for room in ("lobby", general, private)
+    }
+    app.dependency_overrides[get_livekit_client] = lambda: livekit
+
+    response = await client.get("/api/voice/rooms", headers=headers["member"])
+    assert [room["name"] for room in response.json()] == [general]
+    response = await client.get("/api/voice/rooms", headers=headers["owner"])
+    assert {room["name"] for room in response.json()} == {general, private}
+
+    for room, status_code in ((general, 200), (private, 404), ("lobby", 404)):
+        response = await client.get(
+            f"/api/voice/rooms/{room}/participants", headers=headers["member"]
+        )
+        assert response.status_code == status_code
@@ -0,0 +1,283 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from surr.app.core.permission_cache import PermissionCache
+from surr.app.core.permissions import (
+    ALL_PERMISSIONS,
+    ChannelOverwrites,
+    GuildPermissions,
+    MemberRoles,
+    Permission,
+    channel_permissions,
+)
+from surr.app.core.security import TokenType, create_token, get_password_hash
+from surr.app.models.channel import Channel
+from surr.app.models.role import Role
+from surr.app.models.user import User
+
+EVERYONE = 1
+MODERATOR = 2
+ADMIN = 3
+
+BASE = (
+    Permission.VIEW_CHANNEL | Permission.SEND_MESSAGES | Permission.READ_MESSAGE_HISTORY
+)
+
+
+@pytest.fixture
+def guild() -> GuildPermissions:
+    return GuildPermissions(
+        owner_id=100,
+        everyone_role_id=EVERYONE,
+        roles={
+            EVERYONE: BASE,
+            MODERATOR: Permission.MANAGE_MESSAGES,
+            ADMIN: Permission.ADMINISTRATOR,
+        },
+    )
+
+
+def test_overwrites_apply_everyone_then_roles_then_member(
+    guild: GuildPermissions,
+) -> None:
+    channel = ChannelOverwrites(
+        guild_id=1,
+        roles={
+            EVERYONE: (0, Permission.SEND_MESSAGES),
+            MODERATOR: (Permission.SEND_MESSAGES, 0),
+        },
+        members={7: (0, Permission.READ_MESSAGE_HISTORY)},
+    )
+    member = MemberRoles(frozenset())
+    moderator = MemberRoles(frozenset({MODERATOR}))
+
+    assert channel_permissions(guild, channel, 5, member) == (
+        Permission.VIEW_CHANNEL | Permission.READ_MESSAGE_HISTORY
+    )
+    assert channel_permissions(guild, channel, 5, moderator) == (
+        BASE | Permission.MANAGE_MESSAGES
+    )
+    assert channel_permissions(guild, channel, 7, moderator) == (
+        Permission.VIEW_CHANNEL | Permission.SEND_MESSAGES | Permission.MANAGE_MESSAGES
+    )
+
+
+def test_hidden_channels_grant_nothing(guild: GuildPermissions) -> None:
+    channel = ChannelOverwrites(
+        guild_id=1, roles={EVERYONE: (0, Permission.VIEW_CHANNEL)}
+    )
+
+    assert channel_permissions(guild, channel, 5, MemberRoles(frozenset())) == 0
+    assert channel_permissions(guild, channel, 5, MemberRoles(None)) == 0
+    # Owners and administrators bypass overwrites entirely.
+    assert channel_permissions(guild, channel, 100, MemberRoles(frozenset())) == (
+        ALL_PERMISSIONS
+    )
+    assert channel_permissions(guild, channel, 5, MemberRoles(frozenset({ADMIN}))) == (
+        ALL_PERMISSIONS
+    )
+
+
+def test_overwrites_can_grant_what_roles_do_not(guild: GuildPermissions) -> None:
+    guild.roles[EVERYONE] = 0
+    channel = ChannelOverwrites(
+        guild_id=1, members={5: (Permission.VIEW_CHANNEL | Permission.SEND_MESSAGES, 0)}
+    )
+
+    assert channel_permissions(guild, channel, 5, MemberRoles(frozenset())) == (
+        Permission.VIEW_CHANNEL | Permission.SEND_MESSAGES
+    )
+    assert channel_permissions(guild, channel, 6, MemberRoles(frozenset())) == 0
+    # Overwrites never make a non-member a member.
+    assert channel_permissions(guild, channel, 5, MemberRoles(None)) == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_recomputes_only_bitsets_whose_inputs_changed(
+    guild: GuildPermissions,
+) -> None:
+    cache = PermissionCache(maxsize=100, ttl=60)
+    cache.enabled = True
+    guild.stamp = 1
+    cache.guilds.set(1, guild)
+    cache.members.set((1, 5), MemberRoles(frozenset(), stamp=2))
+    cache.channels.set(10, ChannelOverwrites(guild_id=1, stamp=3))
+    cache.channels.set(
+        11,
+        ChannelOverwrites(
+            guild_id=1, roles={EVERYONE: (0, Permission.VIEW_CHANNEL)}, stamp=4
+        ),
+    )
+
+    # Fully warm, so no session factory is needed.
+    resolved = await cache.resolve_many(None, 5, [10, 11])  # ty:ignore[invalid-argument-type]
+    assert resolved == {10: BASE, 11: Permission(0)}
+    assert cache.resolved.get((5, 11)) == (Permission(0), (1, 2, 4))
+
+    cache.handle_notification("member:1:5")
+    assert cache.members.get((1, 5)) is None
+    assert cache.guilds.get(1) is guild
+
+    # A reloaded input has a new stamp, which retires the old bitsets.
+    cache.members.set((1, 5), MemberRoles(frozenset({ADMIN}), stamp=5))
+    resolved = await cache.resolve_many(None, 5, [10, 11])  # ty:ignore[invalid-argument-type]
+    assert resolved == {10: ALL_PERMISSIONS, 11: ALL_PERMISSIONS}
+
+    cache.set_listening(False)
+    assert cache.guilds.get(1) is None
+    assert not cache.enabled
+
+
+@pytest.fixture
+async def users(db_session: AsyncSession) -> dict[str, dict[str, str]]:
+    headers = {}
+    for username in ("owner", "member"):
+        db_session.add(
+            User(username=username, hashed_password=get_password_hash("password123"))
+        )
+        token = create_token(data={"sub": username}, token_type=TokenType.ACCESS)
+        headers[username] = {"Authorization": f"Bearer {token}"}
+    await db_session.flush()
+    return headers
+
+
+@pytest.mark.asyncio
+async def test_visible_channels_match_sql_filter(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    users: dict[str, dict[str, str]],
+) -> None:
+    owner, member = users["owner"], users["member"]
+    member_id = await db_session.scalar(
+        select(User.id).where(User.username == "member")
+    )
+    assert member_id is not None
+
+    response = await client.post("/api/guilds", json={"name": "guild"}, headers=owner)
+    guild_id = response.json()["id"]
+    everyone_id = await db_session.scalar(
+        select(Role.id).where(Role.guild_id == guild_id, Role.is_default)
+    )
+
+    channel_ids = []
+    for name in ("general", "staff", "private"):
+        response = await client.post(
+            f"/api/guilds/{guild_id}/channels", json={"name": name}, headers=owner
+        )
+        channel_ids.append(response.json()["id"])
+    general, staff, private = channel_ids
+
+    # Non-members see nothing.
+    response = await client.get(f"/api/guilds/{guild_id}/channels", headers=member)
+    assert response.status_code == 404
+
+    response = await client.put(
+        f"/api/guilds/{guild_id}/members/{member_id}", headers=owner
+    )
+    assert response.status_code == 204
+
+    response = await client.post(
+        f"/api/guilds/{guild_id}/roles", json={"name": "staff"}, headers=owner
+    )
+    staff_role_id = response.json()["id"]
+    overwrites = {
+        (staff, f"role/{everyone_id}"): {"deny": Permission.VIEW_CHANNEL},
+        (staff, f"role/{staff_role_id}"): {"allow": Permission.VIEW_CHANNEL},
+        (private, f"member/{member_id}"): {"deny": Permission.VIEW_CHANNEL},
+    }
+    for (channel_id, target), data in overwrites.items():
+        response = await client.put(
+            f"/api/channels/{channel_id}/overwrites/{target}", json=data, headers=owner
+        )
+        assert response.status_code == 204
+
+    async def visible() -> list[int]:
+        response = await client.get(f"/api/guilds/{guild_id}/channels", headers=member)
+        ids = [channel["id"] for channel in response.json()]
+        assert ids == sorted(await db_session.scalars(Channel.visible_ids(member_id)))
+        return ids
+
+    assert await visible() == [general]
+
+    response = await client.put(
+        f"/api/guilds/{guild_id}/members/{member_id}/roles/{staff_role_id}",
+        headers=owner,
+    )
+    assert response.status_code == 204
+    assert await visible() == [general, staff]
+
+    # Hidden channels look missing; visible ones refuse what is not granted.
+    response = await client.get(f"/api/channels/{private}/messages", headers=member)
+    assert response.status_code == 404
+    response = await client.put(
+        f"/api/channels/{general}/overwrites/member/{member_id}",
+        json={"allow": Permission.MANAGE_ROLES},
+        headers=member,
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_roles_are_managed_only_below_the_actors_highest_role(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    users: dict[str, dict[str, str]],
+) -> None:
+    owner, member = users["owner"], users["member"]
+    member_id = await db_session.scalar(
+        select(User.id).where(User.username == "member")
+    )
+    response = await client.post("/api/guilds", json={"name": "guild"}, headers=owner)
+    guild_id = response.json()["id"]
+    await client.put(f"/api/guilds/{guild_id}/members/{member_id}", headers=owner)
+
+    response = await client.post(
+        f"/api/guilds/{guild_id}/roles",
+        json={"name": "manager", "permissions": Permission.MANAGE_ROLES, "position": 2},
+        headers=owner,
+    )
+    manager_id = response.json()["id"]
+    response = await client.put(
+        f"/api/guilds/{guild_id}/members/{member_id}/roles/{manager_id}",
+        headers=owner,
+    )
+    assert response.status_code == 204
+
+    roles = f"/api/guilds/{guild_id}/roles"
+    response = await client.post(
+        roles, json={"name": "peer", "position": 2}, headers=member
+    )
+    assert response.status_code == 403
+    response = await client.post(
+        roles, json={"name": "helper", "position": 1}, headers=member
+    )
+    assert response.status_code == 201
+    helper_id = response.json()["id"]
+
+    response = await client.patch(
+        f"{roles}/{manager_id}", json={"name": "boss"}, headers=member
+    )
+    assert response.status_code == 403
+    response = await client.patch(
+        f"{roles}/{helper_id}", json={"position": 3}, headers=member
+    )
+    assert response.status_code == 403
+
+    # An explicit null leaves the column alone rather than failing.
+    response = await client.patch(
+        f"{roles}/{helper_id}", json={"name": None, "position": None}, headers=member
+    )
+    assert response.status_code == 200
+    assert (response.json()["name"], response.json()["position"]) == ("helper", 1)
+
+    # Positions and ids are int4.
+    response = await client.post(
+        roles, json={"name": "top", "position": 2**31}, headers=owner
+    )
+    assert response.status_code == 422
+    response = await client.patch(
+        f"{roles}/{2**31}", json={"name": "boss"}, headers=owner
+    )
+    assert response.status_code == 422
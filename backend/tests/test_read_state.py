@@ -0,0 +1,165 @@
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from surr.app.api.v1.channels import use_cases
+from surr.app.core.read_state import MAX_FLUSH_ATTEMPTS, ChannelHead, ReadStateStore
+from surr.app.models.read_state import ReadState
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch) -> ReadStateStore:
+    store = ReadStateStore(maxsize=100, ttl=60, unread_cap=3)
+    store.enabled = True
+    monkeypatch.setattr(use_cases, "read_state_store", store)
+    return store
+
+
+@pytest.fixture
+def session_factory(db_session: AsyncSession):  # noqa: ANN201
+    @asynccontextmanager
+    async def factory() -> AsyncGenerator[AsyncSession]:  # noqa: RUF029
+        yield db_session
+
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_unread_counts_are_served_from_memory(store: ReadStateStore) -> None:
+    store.heads.set(1, ChannelHead(ids=[10, 11, 12]))
+    store.markers.set(7, {})
+
+    # Warm caches never reach the session factory.
+    states = await store.unread_counts(None, 7, [1])  # ty:ignore[invalid-argument-type]
+    assert states[1].unread == 3
+    assert not states[1].truncated
+
+    store.mark_read(7, 1, 11)
+    store.mark_read(7, 1, 10)
+    assert store.pending == {(7, 1): 11}
+
+    states = await store.unread_counts(None, 7, [1])  # ty:ignore[invalid-argument-type]
+    assert states[1].last_read_message_id == 11
+    assert states[1].unread == 1
+
+    # Heads keep the newest ``unread_cap`` ids; older ones are only counted.
+    store.handle_notification("message:1:13;message:1:14;read:8:1:12")
+    assert store.heads.get(1) == ChannelHead(ids=[12, 13, 14], complete=False)
+
+    store.markers.set(9, {})
+    states = await store.unread_counts(None, 9, [1])  # ty:ignore[invalid-argument-type]
+    assert states[1].unread == 3
+    assert states[1].truncated
+
+
+@pytest.mark.asyncio
+async def test_read_markers_are_flushed_in_batches(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    session_factory: async_sessionmaker,
+    store: ReadStateStore,
+    auth_headers: dict[str, str],
+) -> None:
+    response = await client.post(
+        "/api/guilds", json={"name": "guild"}, headers=auth_headers
+    )
+    guild_id = response.json()["id"]
+    response = await client.post(
+        f"/api/guilds/{guild_id}/channels",
+        json={"name": "general"},
+        headers=auth_headers,
+    )
+    channel_id = response.json()["id"]
+
+    message_ids = []
+    for content in ("one", "two", "three"):
+        response = await client.post(
+            f"/api/channels/{channel_id}/messages",
+            json={"content": content},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        message_ids.append(response.json()["id"])
+
+    # Posting marks the author's own messages read.
+    store.pending.clear()
+    for message_id in message_ids[:2]:
+        response = await client.put(
+            f"/api/channels/{channel_id}/read",
+            json={"last_read_message_id": message_id},
+            headers=auth_headers,
+        )
+        assert response.status_code == 204
+
+    response = await client.get(
+        "/api/channels/unread",
+        params={"channel_ids": [channel_id, 999_999]},
+        headers=auth_headers,
+    )
+    assert response.json() == [
+        {
+            "channel_id": channel_id,
+            "last_read_message_id": message_ids[1],
+            "unread": 1,
+            "truncated": False,
+        }
+    ]
+
+    assert await store.flush(session_factory) == 1
+    assert store.pending == {}
+    read_state = await db_session.scalar(select(ReadState))
+    assert read_state is not None
+    assert read_state.last_read_message_id == message_ids[1]
+
+    # Markers never move backwards.
+    store.mark_read(read_state.user_id, channel_id, message_ids[0])
+    await store.flush(session_factory)
+    await db_session.refresh(read_state)
+    assert read_state.last_read_message_id == message_ids[1]
+
+    # Markers for messages that are not in the channel are refused.
+    response = await client.put(
+        f"/api/channels/{channel_id}/read",
+        json={"last_read_message_id": message_ids[-1] + 1000},
+        headers=auth_headers,
+    )
+    assert response.status_code == 404
+    response = await client.put(
+        f"/api/channels/{channel_id}/read",
+        json={"last_read_message_id": 2**63},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+
+    # A marker the database rejects is retried, then dropped, without
+    # holding back the others.
+    store.mark_read(read_state.user_id, channel_id, message_ids[2])
+    store.mark_read(read_state.user_id + 1, channel_id, 2**63)
+    assert await store.flush(session_factory) == 1
+    for _ in range(MAX_FLUSH_ATTEMPTS - 1):
+        assert list(store.pending.values()) == [2**63]
+        assert await store.flush(session_factory) == 0
+    assert store.pending == {}
+    await db_session.refresh(read_state)
+    assert read_state.last_read_message_id == message_ids[2]
+
+    # Channel ids are int4.
+    response = await client.get(
+        "/api/channels/unread",
+        params={"channel_ids": [channel_id, 2**31]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+    response = await client.put(
+        f"/api/channels/{2**31}/read",
+        json={"last_read_message_id": message_ids[1]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
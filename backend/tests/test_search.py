@@ -0,0 +1,95 @@
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from surr.app.api.v1.search.use_cases import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_rank_exactly() -> None:
+    rank = 0.1 + 0.2
+    assert decode_cursor(encode_cursor(rank, 42)) == (rank, 42)
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not a cursor")
+    assert exc_info.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(encode_cursor(rank, 2**63))
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_paginates_and_follows_edits(
+    client: AsyncClient, auth_headers: dict[str, str]
+) -> None:
+    response = await client.post(
+        "/api/guilds", json={"name": "guild"}, headers=auth_headers
+    )
+    guild_id = response.json()["id"]
+    response = await client.post(
+        f"/api/guilds/{guild_id}/channels",
+        json={"name": "general"},
+        headers=auth_headers,
+    )
+    channel_id = response.json()["id"]
+    url = f"/api/channels/{channel_id}/messages"
+
+    contents = ["deploying the servers", "server deploy failed", "lunch?"]
+    message_ids = []
+    for content in contents * 2:
+        response = await client.post(
+            url, json={"content": content}, headers=auth_headers
+        )
+        message_ids.append(response.json()["id"])
+
+    found = []
+    cursor = None
+    while True:
+        params = {"q": "deploy server", "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(
+            "/api/search/messages", params=params, headers=auth_headers
+        )
+        assert response.status_code == 200
+        page = response.json()
+        found.extend(hit["id"] for hit in page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # Stemming matches both spellings; every hit is returned exactly once.
+    assert sorted(found) == sorted(
+        message_id
+        for message_id, content in zip(message_ids, contents * 2, strict=True)
+        if content != "lunch?"
+    )
+
+    response = await client.patch(
+        f"{url}/{message_ids[0]}", json={"content": "lunch plans"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["edited_at"] is not None
+
+    # The edit is reflected by the index without any rebuild.
+    response = await client.get(
+        "/api/search/messages",
+        params={"q": "plans", "channel_id": channel_id},
+        headers=auth_headers,
+    )
+    assert [hit["id"] for hit in response.json()["results"]] == [message_ids[0]]
+
+    response = await client.get(
+        "/api/search/messages",
+        params={"q": "deploy", "channel_id": channel_id},
+        headers=auth_headers,
+    )
+    assert message_ids[0] not in {hit["id"] for hit in response.json()["results"]}
+
+    # Channel ids are int4.
+    response = await client.get(
+        "/api/search/messages",
+        params={"q": "deploy", "channel_id": 2**31},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
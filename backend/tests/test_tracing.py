@@ -0,0 +1,120 @@
+import asyncio
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from surr.app.core.tracing import (
+    JsonlSpanExporter,
+    Span,
+    Tracer,
+    TracingMiddleware,
+    span,
+    start_span,
+    traced,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+
+class MemoryExporter:
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+
+    async def shutdown(self) -> None:
+        pass
+
+
+@traced("work")
+async def do_work() -> int:
+    with span("inner", size=3):
+        await asyncio.sleep(0)
+    return 3
+
+
+def build_app(tracer: Tracer) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int) -> dict[str, int]:
+        return {"id": item_id, "size": await do_work()}
+
+    app.add_middleware(TracingMiddleware, tracer=tracer)  # ty:ignore[invalid-argument-type]
+    return app
+
+
+@pytest.mark.asyncio
+async def test_sampled_request_exports_span_tree() -> None:
+    exporter = MemoryExporter()
+    app = build_app(Tracer(sample_rate=1.0, exporter=exporter))
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get("/items/7")
+
+    assert response.status_code == 200
+    spans = {exported.name: exported for exported in exporter.spans}
+    root = spans["GET /items/{item_id}"]
+    assert root.parent_id is None
+    assert root.attributes["http.status_code"] == 200
+    assert spans["work"].parent_id == root.span_id
+    assert spans["inner"].parent_id == spans["work"].span_id
+    assert spans["inner"].attributes == {"size": 3}
+    assert len({exported.trace.trace_id for exported in exporter.spans}) == 1
+
+
+@pytest.mark.asyncio
+async def test_traceparent_is_continued() -> None:
+    exporter = MemoryExporter()
+    app = build_app(Tracer(sample_rate=0.000001, exporter=exporter))
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        await client.get(
+            "/items/1",
+            headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"},
+        )
+
+    assert exporter.spans
+    assert all(exported.trace.trace_id == trace_id for exported in exporter.spans)
+
+
+@pytest.mark.asyncio
+async def test_unsampled_request_records_nothing() -> None:
+    exporter = MemoryExporter()
+    app = build_app(Tracer(sample_rate=0.0, exporter=exporter))
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        assert (await client.get("/items/1")).status_code == 200
+
+    assert exporter.spans == []
+    assert start_span("orphan") is None
+    with span("orphan") as orphan:
+        assert orphan is None
+
+
+@pytest.mark.asyncio
+async def test_jsonl_exporter_writes_in_the_background(tmp_path: Path) -> None:
+    exporter = JsonlSpanExporter(tmp_path / "traces.jsonl")
+    root = Tracer.start_trace("request")
+    root.child("query", {}).end()
+    root.end()
+
+    exporter.export(root.trace.spans)
+    exporter.export(root.trace.spans)
+    await exporter.shutdown()
+
+    lines = (tmp_path / "traces.jsonl").read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["query", "request"] * 2
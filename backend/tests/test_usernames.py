@@ -0,0 +1,76 @@
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import pytest
+from httpx import AsyncClient, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from surr.app.api.v1.auth import use_cases
+from surr.app.core.usernames import BloomFilter, UsernameFilter
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    names = [f"user{index}" for index in range(1000)]
+    for name in names:
+        bloom.add(name)
+
+    assert all(name in bloom for name in names)
+    false_positives = sum(f"other{index}" in bloom for index in range(10_000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_filter_answers_misses_without_the_database() -> None:
+    usernames = UsernameFilter(capacity=100, error_rate=0.001)
+    usernames.bloom = BloomFilter(capacity=100, error_rate=0.001)
+    usernames.add("Alice")
+
+    # Normalized, so names differing only in case go to the database.
+    assert usernames.might_exist("ALICE")
+    assert not await usernames.is_taken(None, "bob")  # ty:ignore[invalid-argument-type]
+
+
+@pytest.mark.asyncio
+async def test_taken_usernames_are_rejected_before_hashing(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    usernames = UsernameFilter(capacity=100, error_rate=0.001)
+    monkeypatch.setattr(use_cases, "username_filter", usernames)
+
+    @asynccontextmanager
+    async def factory() -> AsyncGenerator[AsyncSession]:  # noqa: RUF029
+        yield db_session
+
+    async def check(username: str) -> Response:
+        # The test shares one session across requests; end the transaction
+        # the last lookup began, as a request's own session would.
+        await db_session.commit()
+        return await client.get(
+            "/api/auth/username-available", params={"username": username}
+        )
+
+    await usernames.load(factory)  # ty:ignore[invalid-argument-type]
+    await db_session.commit()
+
+    payload = {"username": "taken", "password": "securepassword123"}
+    assert (await client.post("/api/auth/signup", json=payload)).status_code == 201
+
+    def fail(_: str) -> str:
+        msg = "hashed a password for a taken username"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(use_cases, "get_password_hash", fail)
+    response = await client.post("/api/auth/signup", json=payload)
+    assert response.status_code == 409
+
+    for username, available in (("taken", False), ("Taken", True), ("free", True)):
+        response = await check(username)
+        assert response.json() == {"username": username, "available": available}
+
+    # Checks are limited per address, so names cannot be enumerated.
+    statuses = [(await check("probe")).status_code for _ in range(30)]
+    assert 429 in statuses
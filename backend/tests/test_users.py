@@ -0,0 +1,89 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from surr.app.core.security import TokenType, create_token, get_password_hash
+from surr.app.core.user_cache import UserCache
+from surr.app.core.user_loader import UserLoader
+from surr.app.models.user import User
+from surr.app.schema.user import UserRecord
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+
+@pytest.fixture
+async def users(db_session: AsyncSession) -> list[User]:
+    users = [
+        User(username=name, hashed_password=get_password_hash("password123"))
+        for name in ("ann", "ben", "cat")
+    ]
+    db_session.add_all(users)
+    await db_session.flush()
+    return users
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_query(
+    db_session: AsyncSession, users: list[User]
+) -> None:
+    opened = 0
+
+    @asynccontextmanager
+    async def factory() -> AsyncGenerator[AsyncSession]:  # noqa: RUF029
+        nonlocal opened
+        opened += 1
+        yield db_session
+
+    cache = UserCache(maxsize=10, ttl=60)
+    cache.enabled = True
+    loader = UserLoader(cache, window=0.01, max_batch=100)
+    ann, ben, cat = users
+
+    results = await asyncio.gather(
+        loader.load(factory, ann.id),
+        loader.load_many(factory, [ben.id, ann.id, 999_999]),
+        loader.load(factory, cat.id),
+    )
+    assert opened == 1
+    assert results[0] == UserRecord(id=ann.id, username="ann")
+    assert set(results[1]) == {ann.id, ben.id}
+    assert results[2] == UserRecord(id=cat.id, username="cat")
+
+    # Resolved records are served from the cache until invalidated.
+    assert await loader.load(factory, ben.id) == UserRecord(id=ben.id, username="ben")
+    assert opened == 1
+    cache.handle_notification(f"user:ben:{ben.id}")
+    await loader.load(factory, ben.id)
+    assert opened == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint_keeps_request_order(
+    client: AsyncClient, users: list[User]
+) -> None:
+    token = create_token(data={"sub": "ann"}, token_type=TokenType.ACCESS)
+    ann, _, cat = users
+
+    response = await client.get(
+        "/api/users/batch",
+        params={"ids": [cat.id, 999_999, ann.id, cat.id]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": cat.id, "username": "cat"},
+        {"id": ann.id, "username": "ann"},
+    ]
+
+    # One out-of-range id is refused before it can reach the shared query.
+    response = await client.get(
+        "/api/users/batch",
+        params={"ids": [ann.id, 2**31]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 422
@@ -0,0 +1,222 @@
+import base64
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import jwt
+import pytest
+from httpx import AsyncClient
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from surr.app.api.v1.livekit import use_cases
+from surr.app.api.v1.livekit.schema import MAX_TIMESTAMP, WebhookEvent
+from surr.app.core.config import settings
+from surr.app.core.livekit import channel_room, verify_webhook
+from surr.app.core.voice_analytics import (
+    MAX_FLUSH_ATTEMPTS,
+    VoiceAnalytics,
+    VoiceEvent,
+    VoiceEventKind,
+    VoiceRollup,
+    replay,
+)
+from surr.app.models.voice_stats import VoiceHourStats, VoiceMinuteStats
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+START = datetime(2026, 1, 5, 20, 0, tzinfo=UTC)
+
+
+def sign(body: bytes, api_key: str, api_secret: str) -> str:
+    digest = base64.b64encode(hashlib.sha256(body).digest()).decode()
+    claims = {"iss": api_key, "exp": int(time.time()) + 60, "sha256": digest}
+    return jwt.encode(claims, api_secret, algorithm="HS256")
+
+
+def test_webhooks_must_be_signed_for_their_body() -> None:
+    body = b'{"event": "room_started"}'
+    token = sign(body, "key", "secret-secret-secret-secret-secret")
+
+    assert verify_webhook(body, token, "key", "secret-secret-secret-secret-secret")
+    assert not verify_webhook(b"{}", token, "key", "secret-secret-secret-secret-secret")
+    assert not verify_webhook(
+        body, token, "other", "secret-secret-secret-secret-secret"
+    )
+    assert not verify_webhook(body, None, "key", "secret-secret-secret-secret-secret")
+
+
+def test_replay_rolls_events_into_buckets() -> None:
+    def event(kind: VoiceEventKind, seconds: int, sid: str = "") -> VoiceEvent:
+        at = START + timedelta(seconds=seconds)
+        return VoiceEvent(id="", kind=kind, room="lobby", at=at, participant_sid=sid)
+
+    room: dict[str, datetime] = {}
+    rollup = VoiceRollup()
+    for voice_event in (
+        event(VoiceEventKind.PARTICIPANT_JOINED, 5, "PA_1"),
+        event(VoiceEventKind.PARTICIPANT_JOINED, 10, "PA_2"),
+        event(VoiceEventKind.TRACK_PUBLISHED, 12, "PA_1"),
+        event(VoiceEventKind.PARTICIPANT_LEFT, 65, "PA_1"),
+        # Redelivered, so ignored.
+        event(VoiceEventKind.PARTICIPANT_LEFT, 66, "PA_1"),
+        event(VoiceEventKind.ROOM_FINISHED, 130),
+    ):
+        replay(voice_event, room, rollup, {})
+
+    first, second, third = rollup.rows[VoiceMinuteStats].values()
+    assert (first.joins, first.tracks_published, first.peak_participants) == (2, 1, 2)
+    assert first.closing_participants == 2
+    # A minute starts with everyone still connected from the last one.
+    assert (second.sessions, second.session_seconds) == (1, 60)
+    assert (second.peak_participants, second.closing_participants) == (2, 1)
+    assert (third.sessions, third.session_seconds) == (1, 120)
+    assert room == {}
+
+    (hour,) = rollup.rows[VoiceHourStats].values()
+    assert (hour.joins, hour.sessions, hour.session_seconds) == (2, 2, 180)
+    assert (hour.peak_participants, hour.closing_participants) == (2, 0)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"room": {"name": "x" * 256}},
+        {"room": {"name": "lobby"}, "participant": {"sid": "x" * 256}},
+        {"createdAt": str(MAX_TIMESTAMP + 1)},
+        {"createdAt": "-1"},
+    ],
+)
+def test_webhook_events_must_fit_the_rollup_tables(payload: dict[str, Any]) -> None:
+    with pytest.raises(ValidationError):
+        WebhookEvent.model_validate({"event": "participant_joined", **payload})
+
+
+@pytest.mark.asyncio
+async def test_failing_events_are_dropped_after_repeated_flushes() -> None:
+    @asynccontextmanager
+    async def factory() -> AsyncGenerator[AsyncSession]:  # noqa: RUF029
+        msg = "database is down"
+        raise OSError(msg)
+        yield
+
+    analytics = VoiceAnalytics()
+    analytics.record(
+        VoiceEvent(id="EV_1", kind=VoiceEventKind.ROOM_FINISHED, room="lobby", at=START)
+    )
+    for _ in range(MAX_FLUSH_ATTEMPTS - 1):
+        with pytest.raises(OSError, match="down"):
+            await analytics.flush(factory)
+        assert len(analytics.pending) == 1
+
+    with pytest.raises(OSError, match="down"):
+        await analytics.flush(factory)
+    assert analytics.pending == []
+    assert await analytics.flush(factory) == 0
+
+
+@pytest.fixture
+def analytics(monkeypatch: pytest.MonkeyPatch) -> VoiceAnalytics:
+    analytics = VoiceAnalytics()
+    monkeypatch.setattr(use_cases, "voice_analytics", analytics)
+    return analytics
+
+
+@pytest.mark.asyncio
+async def test_webhooks_are_flushed_into_rollups(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    analytics: VoiceAnalytics,
+    auth_headers: dict[str, str],
+) -> None:
+    response = await client.post(
+        "/api/guilds", json={"name": "guild"}, headers=auth_headers
+    )
+    response = await client.post(
+        f"/api/guilds/{response.json()['id']}/channels",
+        json={"name": "voice"},
+        headers=auth_headers,
+    )
+    room = channel_room(response.json()["id"])
+
+    async def send(event_id: str, event: str, seconds: int, sid: str) -> int:
+        payload: dict[str, Any] = {
+            "event": event,
+            "id": event_id,
+            "createdAt": str(int(START.timestamp()) + seconds),
+            "room": {"sid": "RM_1", "name": room},
+            "participant": {"sid": sid, "identity": sid.lower()},
+        }
+        body = json.dumps(payload).encode()
+        token = sign(
+            body,
+            settings.LIVEKIT_API_KEY,
+            settings.LIVEKIT_API_SECRET.get_secret_value(),
+        )
+        response = await client.post(
+            "/api/livekit/webhook",
+            content=body,
+            headers={
+                "Authorization": token,
+                "Content-Type": "application/webhook+json",
+            },
+        )
+        return response.status_code
+
+    @asynccontextmanager
+    async def factory() -> AsyncGenerator[AsyncSession]:  # noqa: RUF029
+        yield db_session
+
+    assert await send("EV_1", "participant_joined", 0, "PA_1") == 204
+    assert await send("EV_2", "participant_joined", 30, "PA_2") == 204
+    assert await analytics.flush(factory) == 2
+
+    # The second flush picks up where the first left off.
+    assert await send("EV_3", "participant_left", 90, "PA_1") == 204
+    assert await send("EV_3", "participant_left", 90, "PA_1") == 204
+    assert await analytics.flush(factory) == 2
+
+    response = await client.post(
+        "/api/livekit/webhook",
+        content=b'{"event": "participant_joined"}',
+        headers={"Authorization": "forged"},
+    )
+    assert response.status_code == 401
+
+    window = {"since": START.isoformat(), "until": START.replace(hour=21).isoformat()}
+    response = await client.get(
+        f"/api/voice/stats/rooms/{room}", params=window, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert [
+        (bucket["joins"], bucket["peak_participants"], bucket["closing_participants"])
+        for bucket in response.json()
+    ] == [(2, 2, 2), (0, 2, 1)]
+    assert response.json()[1]["average_session_seconds"] == 90
+
+    response = await client.get(
+        f"/api/voice/stats/rooms/{room}",
+        params={**window, "resolution": "hour"},
+        headers=auth_headers,
+    )
+    assert response.json()[0]["sessions"] == 1
+
+    # Stats are only served for rooms of channels the user can see.
+    for url in (
+        "/api/voice/stats/rooms/lobby",
+        f"/api/voice/stats/rooms/{channel_room(2**31 - 1)}",
+    ):
+        response = await client.get(url, params=window, headers=auth_headers)
+        assert response.status_code == 404
+    response = await client.get(
+        "/api/voice/stats/peak-hours", params={"room": "lobby"}, headers=auth_headers
+    )
+    assert response.status_code == 404
+    response = await client.get(
+        "/api/voice/stats/peak-hours", params={"days": 90}, headers=auth_headers
+    )
+    assert response.status_code == 200